@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+OrgTable_Index.py
+
+管轄PJ表.tsv を 1 回だけ読み込み、PJコードの接頭辞から引く辞書をまとめて作る。
+
+利用元:
+  SellGeneralAdminCost_Allocation_Cmd_0002.py
+    計上グループ / 計上カンパニー の対応表、本部行の計上グループ / 計上カンパニー
+  make_manhour_to_sheet8_01_0003.py
+    PJコードの接頭辞からカンパニー名を引く索引 (step0006)、請求カンパニー / 請求グループの対応表
+
+キャッシュ:
+  同じ実行の中では、表の更新時刻・サイズ・inode が変わらない限り読み直さない。
+  解析結果は OrgTable_IndexCache フォルダに表ごとに保存し、
+  次の実行では表の内容ハッシュとこのモジュールの内容ハッシュが同じなら解析を省く。
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import os
+import pickle
+import re
+from typing import Dict, List, Optional, Tuple
+
+ORG_TABLE_CACHE_DIRECTORY_NAME: str = "OrgTable_IndexCache"
+ORG_TABLE_CACHE_VERSION: int = 3
+
+# 絶対パス → ((更新時刻, サイズ, inode), 索引)
+ORG_TABLE_INDEX_CACHE: Dict[str, Tuple[Tuple[int, int, int], "OrgTableIndex"]] = {}
+# このモジュールの内容ハッシュ (保存した索引が同じ版で作られたかの判定に使う)
+ORG_TABLE_MODULE_SHA256: Optional[str] = None
+
+
+def find_org_table_column_index(objHeader: List[str], pszName: str) -> int:
+    for iIndex, pszValue in enumerate(objHeader):
+        if pszValue == pszName:
+            return iIndex
+    return -1
+
+
+def find_org_table_value_column_index(objHeader: List[str], objCandidates: List[str]) -> int:
+    for pszColumn in objCandidates:
+        iIndex: int = find_org_table_column_index(objHeader, pszColumn)
+        if iIndex >= 0:
+            return iIndex
+    return -1
+
+
+def match_org_table_prefix(pszProjectCode: str) -> Optional[str]:
+    # P00000_ / A000_ の形に揃えた接頭辞 ("_" が無いコードにも "_" を付ける)
+    objMatch = re.match(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectCode)
+    if objMatch is None:
+        objMatch = re.match(r"^(P\d{5}|[A-OQ-Z]\d{3})", pszProjectCode)
+    if objMatch is None:
+        return None
+    pszPrefix: str = objMatch.group(1)
+    if not pszPrefix.endswith("_"):
+        pszPrefix += "_"
+    return pszPrefix
+
+
+def read_org_table_bytes(pszOrgTablePath: str) -> bytes:
+    with open(pszOrgTablePath, "rb") as objFile:
+        return objFile.read()
+
+
+def read_org_table_lines(objData: bytes) -> List[List[str]]:
+    # 計上グループ / 計上カンパニー 用。行をタブで分けるだけで、引用符は特別扱いしない。
+    # 空行は [""] とする。UTF-8 で読めない場合だけ cp932 で読む。
+    pszText: str
+    try:
+        pszText = objData.decode("utf-8")
+    except UnicodeDecodeError:
+        pszText = objData.decode("cp932")
+    objRows: List[List[str]] = []
+    for pszLine in io.StringIO(pszText, newline=""):
+        pszLineText: str = pszLine.rstrip("\n").rstrip("\r")
+        objRows.append(pszLineText.split("\t") if pszLineText != "" else [""])
+    return objRows
+
+
+def read_org_table_rows(objData: bytes) -> List[List[str]]:
+    # 請求カンパニー / 請求グループ と step0006 の索引用。csv の既定の引用符の扱いで読む。
+    objEncodingCandidateList: List[str] = ["utf-8-sig", "cp932"]
+    objLastDecodeError: Exception | None = None
+    pszText: str = ""
+
+    for pszEncoding in objEncodingCandidateList:
+        try:
+            pszText = objData.decode(pszEncoding)
+            objLastDecodeError = None
+            break
+        except UnicodeDecodeError as objError:
+            objLastDecodeError = objError
+
+    if objLastDecodeError is not None:
+        raise objLastDecodeError
+    objOrgTableReader = csv.reader(io.StringIO(pszText, newline=""), delimiter="\t")
+    return [list(objRow) for objRow in objOrgTableReader]
+
+
+class OrgTableIndex:
+    # 管轄PJ表の 1 回分の解析結果。辞書はすべて読み取り専用として扱う。
+    def __init__(self, objData: bytes) -> None:
+        objLines: List[List[str]] = read_org_table_lines(objData)
+        self.bEmpty: bool = not objLines
+
+        # 見出し (PJコード / 計上グループ名 / 計上カンパニー名) から列を決める対応表
+        self.objGroupMap: Dict[str, str] = {}
+        self.objCompanyMap: Dict[str, str] = {}
+        self.pszHeadquartersGroup: Optional[str] = None
+        self.pszHeadquartersCompany: str = ""
+        if objLines:
+            self.build_header_maps(objLines)
+
+        objRows: List[List[str]] = read_org_table_rows(objData)
+
+        # 列の位置 (B列: PJコード, C列: 請求カンパニー, D列: 請求グループ) で決める対応表
+        self.objBillingCompanyMap: Dict[str, str] = {}
+        self.objBillingGroupMap: Dict[str, str] = {}
+        self.build_billing_maps(objRows)
+
+        # 先頭の空でない行を見出しとして、以降の行の (B列: PJコード, C列: カンパニー名) から作る索引。
+        # PJコードの各接頭辞 → その接頭辞で始まる最初の行のカンパニー名 (PJコードが空の行は除く)
+        self.iCompanyMappingColumnCount: int = 0
+        self.objCompanyPrefixMap: Dict[str, str] = {}
+        self.build_company_prefix_map(objRows)
+
+    def build_header_maps(self, objRows: List[List[str]]) -> None:
+        objHeader: List[str] = objRows[0]
+        iCodeIndex: int = find_org_table_column_index(objHeader, "PJコード")
+        iGroupIndex: int = find_org_table_value_column_index(objHeader, ["計上グループ名", "計上グループ"])
+        iCompanyIndex: int = find_org_table_value_column_index(objHeader, ["計上カンパニー名", "計上カンパニー"])
+
+        iStartIndex: int = 0
+        iHeadquartersCompanyIndex: int = iCompanyIndex
+        if iCodeIndex >= 0:
+            if iGroupIndex < 0:
+                iGroupIndex = iCodeIndex + 2
+            if iCompanyIndex < 0:
+                iCompanyIndex = iCodeIndex + 2
+            iHeadquartersCompanyIndex = iCompanyIndex
+            iStartIndex = 1
+        else:
+            iCodeIndex = 2
+            iGroupIndex = 4
+            iCompanyIndex = 4
+            iHeadquartersCompanyIndex = 3
+
+        bHeadquartersCompanyFound: bool = False
+        for objRow in objRows[iStartIndex:]:
+            if iCodeIndex >= len(objRow):
+                continue
+            pszProjectCode: str = objRow[iCodeIndex].strip()
+            if pszProjectCode == "本部":
+                if self.pszHeadquartersGroup is None and iGroupIndex < len(objRow):
+                    self.pszHeadquartersGroup = objRow[iGroupIndex].strip()
+                if not bHeadquartersCompanyFound and iHeadquartersCompanyIndex < len(objRow):
+                    self.pszHeadquartersCompany = objRow[iHeadquartersCompanyIndex].strip()
+                    bHeadquartersCompanyFound = True
+            if not pszProjectCode:
+                continue
+            pszPrefix: Optional[str] = match_org_table_prefix(pszProjectCode)
+            if pszPrefix is None:
+                continue
+            if iGroupIndex < len(objRow) and pszPrefix not in self.objGroupMap:
+                self.objGroupMap[pszPrefix] = objRow[iGroupIndex].strip()
+            if iCompanyIndex < len(objRow) and pszPrefix not in self.objCompanyMap:
+                self.objCompanyMap[pszPrefix] = objRow[iCompanyIndex].strip()
+
+    def build_billing_maps(self, objRows: List[List[str]]) -> None:
+        for objRow in objRows:
+            if len(objRow) < 3:
+                continue
+            pszProjectCodeOrg: str = str(objRow[1]).strip()
+            if not pszProjectCodeOrg:
+                continue
+            pszBillingCompany: str = str(objRow[2]).strip()
+            if pszBillingCompany:
+                objMatch = re.match(r"^(P\d{5}|[A-OQ-Z]\d{3})", pszProjectCodeOrg)
+                if objMatch is not None and objMatch.group(1) not in self.objBillingCompanyMap:
+                    self.objBillingCompanyMap[objMatch.group(1)] = pszBillingCompany
+            if len(objRow) < 4:
+                continue
+            pszBillingGroup: str = str(objRow[3]).strip()
+            if pszBillingGroup:
+                objMatch = re.match(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectCodeOrg)
+                if objMatch is not None and objMatch.group(1) not in self.objBillingGroupMap:
+                    self.objBillingGroupMap[objMatch.group(1)] = pszBillingGroup
+
+    def build_company_prefix_map(self, objRows: List[List[str]]) -> None:
+        # 空行は読み飛ばし、見出しより短い行は足りない列を空文字として扱う
+        objNonEmptyRows: List[List[str]] = [objRow for objRow in objRows if objRow]
+        if not objNonEmptyRows:
+            return
+        self.iCompanyMappingColumnCount = len(objNonEmptyRows[0])
+        for objRow in objNonEmptyRows[1:]:
+            pszProjectCode: str = objRow[1] if len(objRow) > 1 else ""
+            pszCompanyName: str = objRow[2] if len(objRow) > 2 else ""
+            if pszProjectCode == "":
+                continue
+            for iLength in range(len(pszProjectCode) + 1):
+                pszPrefix: str = pszProjectCode[:iLength]
+                if pszPrefix not in self.objCompanyPrefixMap:
+                    self.objCompanyPrefixMap[pszPrefix] = pszCompanyName
+
+
+def get_org_table_cache_path(pszOrgTablePath: str) -> str:
+    pszKey: str = os.path.normcase(os.path.abspath(pszOrgTablePath))
+    pszName: str = hashlib.sha1(pszKey.encode("utf-8")).hexdigest() + ".pickle"
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        ORG_TABLE_CACHE_DIRECTORY_NAME,
+        pszName,
+    )
+
+
+def compute_org_table_sha256(pszOrgTablePath: str) -> str:
+    objHash = hashlib.sha256()
+    with open(pszOrgTablePath, "rb") as objFile:
+        for objChunk in iter(lambda: objFile.read(1024 * 1024), b""):
+            objHash.update(objChunk)
+    return objHash.hexdigest()
+
+
+def get_org_table_module_sha256() -> str:
+    global ORG_TABLE_MODULE_SHA256
+    if ORG_TABLE_MODULE_SHA256 is None:
+        ORG_TABLE_MODULE_SHA256 = compute_org_table_sha256(os.path.abspath(__file__))
+    return ORG_TABLE_MODULE_SHA256
+
+
+def load_org_table_index_from_disk(pszOrgTablePath: str, objStat: os.stat_result) -> OrgTableIndex:
+    # 更新時刻・サイズが保存時と同じなら読み直さず、違う場合は内容ハッシュが同じかどうかで判断する。
+    # 保存した索引は、このモジュールの内容が保存時と同じ場合だけ使う。
+    # 壊れたファイルや別の版のファイルは、読み込みで何が起きても解析し直す。
+    pszCachePath: str = get_org_table_cache_path(pszOrgTablePath)
+    pszModuleHash: str = get_org_table_module_sha256()
+    objCached: Optional[Dict[str, object]] = None
+    try:
+        with open(pszCachePath, "rb") as objFile:
+            objCached = pickle.load(objFile)
+    except Exception:
+        objCached = None
+    if (
+        not isinstance(objCached, dict)
+        or objCached.get("version") != ORG_TABLE_CACHE_VERSION
+        or objCached.get("module") != pszModuleHash
+        or not isinstance(objCached.get("index"), OrgTableIndex)
+    ):
+        objCached = None
+
+    objSignature: Tuple[int, int] = (objStat.st_mtime_ns, objStat.st_size)
+    if objCached is not None and objCached.get("signature") == objSignature:
+        return objCached["index"]
+
+    pszHash: str = compute_org_table_sha256(pszOrgTablePath)
+    objIndex: OrgTableIndex
+    if objCached is not None and objCached.get("hash") == pszHash:
+        objIndex = objCached["index"]
+    else:
+        objIndex = OrgTableIndex(read_org_table_bytes(pszOrgTablePath))
+
+    # 保存できない場合 (読み取り専用の場所など) は次の実行でも解析する
+    pszTemporaryPath: str = "{0}.{1}.tmp".format(pszCachePath, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(pszCachePath), exist_ok=True)
+        with open(pszTemporaryPath, "wb") as objFile:
+            pickle.dump(
+                {
+                    "version": ORG_TABLE_CACHE_VERSION,
+                    "module": pszModuleHash,
+                    "signature": objSignature,
+                    "hash": pszHash,
+                    "index": objIndex,
+                },
+                objFile,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(pszTemporaryPath, pszCachePath)
+    except (OSError, pickle.PicklingError):
+        try:
+            os.remove(pszTemporaryPath)
+        except OSError:
+            pass
+    return objIndex
+
+
+def get_org_table_index(pszOrgTablePath: str) -> Optional[OrgTableIndex]:
+    # 表が無い場合は None を返す。読み込めない場合は例外 (UnicodeDecodeError など) をそのまま送出する。
+    if not os.path.isfile(pszOrgTablePath):
+        return None
+    objStat = os.stat(pszOrgTablePath)
+    objStatKey: Tuple[int, int, int] = (objStat.st_mtime_ns, objStat.st_size, objStat.st_ino)
+    pszKey: str = os.path.normcase(os.path.abspath(pszOrgTablePath))
+    objEntry = ORG_TABLE_INDEX_CACHE.get(pszKey)
+    if objEntry is not None and objEntry[0] == objStatKey:
+        return objEntry[1]
+
+    objIndex: OrgTableIndex = load_org_table_index_from_disk(pszOrgTablePath, objStat)
+    ORG_TABLE_INDEX_CACHE[pszKey] = (objStatKey, objIndex)
+    return objIndex
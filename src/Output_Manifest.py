@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Output_Manifest.py
+
+--output-manifest の引数の解釈と、作成したファイルの一覧 (JSON Lines) の書き出し。
+
+利用元:
+  PL_CsvToTsv_Cmd_0002.py
+  make_manhour_to_sheet8_01_0003.py
+  SellGeneralAdminCost_Allocation_Cmd_0002.py
+
+形式:
+  1 行 1 ファイルの JSON で、呼び出し元 (PjSummary_CpManagementCtrl_DnD.py) が出力の振り分けに使う。
+    path:  ファイルの絶対パス
+    kind:  ファイル名の年月より前の部分 (年月を含まない場合は拡張子を除いたファイル名)
+    month: ファイル名の年月 ("YYYY-MM")。期間の場合は None
+    range: 期間の場合は [開始, 終了] ("YYYY-MM")。それ以外は None
+    size:  ファイルサイズ (バイト)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+OUTPUT_MANIFEST_YEAR_MONTH_PATTERN: re.Pattern[str] = re.compile(
+    r"(\d{4})年(\d{1,2})月(?:[-_](\d{4})年(\d{1,2})月)?"
+)
+
+
+def add_output_manifest_argument(objParser: argparse.ArgumentParser) -> None:
+    objParser.add_argument(
+        "--output-manifest",
+        dest="pszOutputManifestPath",
+        default=None,
+        metavar="PATH",
+        help="Write the created files to this path as JSON Lines",
+    )
+
+
+def validate_output_manifest_argument(
+    objParser: argparse.ArgumentParser,
+    pszOutputManifestPath: Optional[str],
+) -> None:
+    # --output-manifest= のように空のパスを渡された場合も、値が無い場合と同じ使い方のエラーにする
+    if pszOutputManifestPath == "":
+        objParser.error("argument --output-manifest: expected one argument")
+
+
+def parse_output_manifest_argument(
+    objArguments: List[str],
+    pszProgramName: Optional[str] = None,
+) -> Tuple[Optional[str], List[str]]:
+    # 引数を自前で解釈するスクリプト用。--output-manifest だけを取り出し、残りの引数を並び順どおりに返す。
+    objParser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog=pszProgramName,
+        add_help=False,
+        allow_abbrev=False,
+    )
+    add_output_manifest_argument(objParser)
+    objArgs, objRemainingArguments = objParser.parse_known_args(objArguments)
+    validate_output_manifest_argument(objParser, objArgs.pszOutputManifestPath)
+    return objArgs.pszOutputManifestPath, objRemainingArguments
+
+
+def build_output_manifest_entry(pszPath: str, iSize: int) -> Dict[str, object]:
+    pszBaseName: str = os.path.basename(pszPath)
+    objMatch = OUTPUT_MANIFEST_YEAR_MONTH_PATTERN.search(pszBaseName)
+    if objMatch is None:
+        return {
+            "path": pszPath,
+            "kind": os.path.splitext(pszBaseName)[0],
+            "month": None,
+            "range": None,
+            "size": iSize,
+        }
+    pszStartMonth: str = f"{int(objMatch.group(1)):04d}-{int(objMatch.group(2)):02d}"
+    objRange: Optional[List[str]] = None
+    if objMatch.group(3) is not None:
+        objRange = [pszStartMonth, f"{int(objMatch.group(3)):04d}-{int(objMatch.group(4)):02d}"]
+    return {
+        "path": pszPath,
+        "kind": pszBaseName[: objMatch.start()].rstrip("_"),
+        "month": pszStartMonth if objRange is None else None,
+        "range": objRange,
+        "size": iSize,
+    }
+
+
+def write_output_manifest(pszManifestPath: str, objPaths: Iterable[str]) -> None:
+    # 書き出し時点で存在しないファイルは載せない
+    with open(pszManifestPath, "w", encoding="utf-8", newline="") as objFile:
+        for pszPath in objPaths:
+            try:
+                iSize: int = os.stat(pszPath).st_size
+            except OSError:
+                continue
+            objEntry: Dict[str, object] = build_output_manifest_entry(os.path.abspath(pszPath), iSize)
+            objFile.write(json.dumps(objEntry, ensure_ascii=False) + "\n")
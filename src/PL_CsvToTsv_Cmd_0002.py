@@ -5,6 +5,17 @@ import shutil
 import sys
 from typing import Dict, List, Optional, Tuple
 
+from Output_Manifest import parse_output_manifest_argument, write_output_manifest
+
+
+# この実行で作成したファイル (正規化したパス → 絶対パス)。--output-manifest の出力に使う。
+OUTPUT_MANIFEST_PATHS: Dict[str, str] = {}
+
+
+def record_output_file(pszPath: str) -> None:
+    pszAbsolutePath: str = os.path.abspath(str(pszPath))
+    OUTPUT_MANIFEST_PATHS[os.path.normcase(pszAbsolutePath)] = pszAbsolutePath
+
 
 def get_target_year_month_from_filename(pszInputFilePath: str) -> Tuple[int, int]:
     pszBaseName: str = os.path.basename(pszInputFilePath)
@@ -55,6 +66,7 @@ def write_tsv_rows(pszOutputFilePath: str, objRows: List[List[str]]) -> None:
         objWriter: csv.writer = csv.writer(objFile, delimiter="\t", lineterminator="\n")
         for objRow in objRows:
             objWriter.writerow(objRow)
+    record_output_file(pszOutputFilePath)
 
 
 def read_tsv_rows(pszInputFilePath: str) -> List[List[str]]:
@@ -301,6 +313,7 @@ def write_project_name_validation_error_file(
             objErrorFile.write(
                 f"行:{iRowNumber} 列:{iColumnNumber} 値:{pszValue}\n"
             )
+    record_output_file(pszErrorFilePath)
 
 
 def find_row_index_with_subject_tab(objRows: List[List[str]], iStartIndex: int) -> int | None:
@@ -345,6 +358,7 @@ def write_first_row_tabs_to_newlines(pszInputFilePath: str, pszOutputFilePath: s
     pszConverted: str = pszFirstLine.replace("\t", "\n")
     with open(pszOutputFilePath, mode="w", encoding="utf-8", newline="") as objOutputFile:
         objOutputFile.write(pszConverted)
+    record_output_file(pszOutputFilePath)
 
 
 def insert_company_expense_columns(objRows: List[List[str]]) -> None:
@@ -406,8 +420,11 @@ def insert_allocated_sga_row(objRows: List[List[str]]) -> None:
 
 
 def main() -> int:
-    if len(sys.argv) < 2:
-        print("usage: python src/PL_CsvToTsv_Cmd.py <csv_file> [<csv_file> ...]")
+    pszOutputManifestPath: Optional[str]
+    objInputFilePaths: List[str]
+    pszOutputManifestPath, objInputFilePaths = parse_output_manifest_argument(sys.argv[1:])
+    if not objInputFilePaths:
+        print("usage: python src/PL_CsvToTsv_Cmd.py [--output-manifest <jsonl_file>] <csv_file> [<csv_file> ...]")
         return 1
 
     iExitCode: int = 0
@@ -415,7 +432,7 @@ def main() -> int:
     objCostReportProjectNameVerticalFilePaths: List[str] = []
     objProfitLossProjectNameVerticalFilePaths: List[str] = []
     objProfitLossVerticalFilePaths: List[str] = []
-    for pszInputFilePath in sys.argv[1:]:
+    for pszInputFilePath in objInputFilePaths:
         try:
             append_debug_log("start")
             iFileYear: int
@@ -555,6 +572,7 @@ def main() -> int:
                 pszErrorFilePath = f"{pszBaseName}_error.txt"
             with open(pszErrorFilePath, mode="w", encoding="utf-8", newline="") as objErrorFile:
                 objErrorFile.write(str(objException))
+            record_output_file(pszErrorFilePath)
 
     create_union_subject_vertical_tsvs(objCostReportVerticalFilePaths)
     create_union_subject_vertical_tsvs(objProfitLossVerticalFilePaths)
@@ -575,6 +593,8 @@ def main() -> int:
         bWriteHorizontal=True,
     )
     create_drag_and_drop_manhour_and_pl_folder()
+    if pszOutputManifestPath is not None:
+        write_output_manifest(pszOutputManifestPath, OUTPUT_MANIFEST_PATHS.values())
     return iExitCode
 
 
@@ -684,6 +704,7 @@ def create_drag_and_drop_manhour_and_pl_folder() -> None:
         ]
         with open(pszOutputPath, "w", encoding="utf-8", newline="") as objFile:
             objFile.write("\n".join(objLines) + "\n")
+        record_output_file(pszOutputPath)
 
     objMonthFiles: Dict[Tuple[int, int], Dict[str, List[str] | str]] = {}
     for pszFileName in os.listdir(pszScriptDirectory):
@@ -739,6 +760,7 @@ def create_drag_and_drop_manhour_and_pl_folder() -> None:
     for pszSourcePath in objSelectedSourcePaths:
         pszDestinationPath: str = os.path.join(pszOutputDirectory, os.path.basename(pszSourcePath))
         shutil.copy2(pszSourcePath, pszDestinationPath)
+        record_output_file(pszDestinationPath)
 
     if hasattr(os, "startfile"):
         os.startfile(pszOutputDirectory)
@@ -24,6 +24,7 @@ SellGeneralAdminCost_Allocation_Cmd_0002.py を実行するGUI。
 from __future__ import annotations
 
 import ctypes
+import json
 import os
 import re
 import shutil
@@ -1064,7 +1065,44 @@ def build_unique_temp_path(pszDirectory: str, pszFileName: str) -> str:
     return os.path.join(pszDirectory, pszFileName)
 
 
-def move_output_files_to_temp(pszStdOut: str) -> List[str]:
+def create_output_manifest_path() -> str:
+    # 子プロセスの --output-manifest に渡すパス。
+    # 子プロセスが書き出したかどうかをファイルの有無で判定するため、作成したファイルは消しておく。
+    iFileHandle, pszManifestPath = tempfile.mkstemp(prefix="output_manifest_", suffix=".jsonl")
+    os.close(iFileHandle)
+    os.remove(pszManifestPath)
+    return pszManifestPath
+
+
+def read_output_manifest(pszManifestPath: str) -> Optional[List[Dict[str, object]]]:
+    # 子プロセスが書き出した出力一覧 (1 行 1 ファイルの JSON Lines) を読み、ファイルは削除する。
+    # 各要素は path / kind / month / range / size を持つ。書き出されていない場合は None。
+    objEntries: Optional[List[Dict[str, object]]] = None
+    try:
+        with open(pszManifestPath, "r", encoding="utf-8") as objFile:
+            objEntries = [json.loads(pszLine) for pszLine in objFile if pszLine.strip() != ""]
+    except (OSError, ValueError):
+        objEntries = None
+    try:
+        os.remove(pszManifestPath)
+    except OSError:
+        pass
+    return objEntries
+
+
+def select_output_manifest_paths(
+    objEntries: List[Dict[str, object]],
+    pszDirectory: str,
+) -> List[str]:
+    pszDirectoryKey: str = os.path.normcase(os.path.abspath(pszDirectory))
+    return [
+        str(objEntry["path"])
+        for objEntry in objEntries
+        if os.path.normcase(os.path.dirname(str(objEntry["path"]))) == pszDirectoryKey
+    ]
+
+
+def move_output_files_to_temp(objEntries: List[Dict[str, object]]) -> List[str]:
     pszTempDirectory: str = get_temp_output_directory()
     pszCmdDirectory: str = os.path.dirname(__file__)
     objMoved: List[str] = []
@@ -1075,12 +1113,10 @@ def move_output_files_to_temp(pszStdOut: str) -> List[str]:
     objIncomeStatementPatterns: List[re.Pattern[str]] = [
         re.compile(r"^累計_損益計算書_.*\.tsv$"),
     ]
-    for pszLine in pszStdOut.splitlines():
-        pszLineText: str = pszLine.strip()
-        if not pszLineText.startswith("Output:"):
-            continue
-        pszOutputPath: str = pszLineText.replace("Output:", "", 1).strip()
-        if pszOutputPath == "" or not os.path.isfile(pszOutputPath):
+    # objEntries は子プロセスの出力一覧 (実行終了時点で存在するファイルのみ)
+    for objEntry in objEntries:
+        pszOutputPath: str = str(objEntry.get("path") or "")
+        if pszOutputPath == "":
             continue
         pszBaseName: str = os.path.basename(pszOutputPath)
         pszTargetDirectory: str = pszTempDirectory
@@ -1091,7 +1127,10 @@ def move_output_files_to_temp(pszStdOut: str) -> List[str]:
             pszTargetDirectory = os.path.join(pszTempDirectory, "損益計算書系")
             os.makedirs(pszTargetDirectory, exist_ok=True)
         pszTargetPath: str = build_unique_temp_path(pszTargetDirectory, pszBaseName)
-        shutil.move(pszOutputPath, pszTargetPath)
+        try:
+            shutil.move(pszOutputPath, pszTargetPath)
+        except FileNotFoundError:
+            continue
         objMoved.append(pszTargetPath)
         pszBaseName = os.path.basename(pszTargetPath)
         if pszBaseName.startswith("累計_製造原価報告書_"):
@@ -1134,7 +1173,10 @@ def parse_year_month_from_pl_csv(pszFilePath: str) -> Optional[Tuple[int, int]]:
     return iYear, iMonth
 
 
-def move_pl_outputs_to_temp(pszCsvPath: str) -> None:
+def move_pl_outputs_to_temp(
+    pszCsvPath: str,
+    objEntries: Optional[List[Dict[str, object]]] = None,
+) -> None:
     objYearMonth = parse_year_month_from_pl_csv(pszCsvPath)
     if objYearMonth is None:
         return
@@ -1147,18 +1189,24 @@ def move_pl_outputs_to_temp(pszCsvPath: str) -> None:
     pszSourceDirectory: str = os.path.dirname(pszCsvPath)
     pszTempDirectory: str = get_temp_output_directory()
     pszCmdDirectory: str = os.path.dirname(__file__)
-    try:
-        objEntries: List[str] = os.listdir(pszSourceDirectory)
-    except OSError:
-        return
-    for pszEntry in objEntries:
+    objSourcePaths: List[str]
+    if objEntries is not None:
+        # 子プロセスの出力一覧がある場合は、フォルダを読み直さずにその中から選ぶ
+        objSourcePaths = select_output_manifest_paths(objEntries, pszSourceDirectory)
+    else:
+        try:
+            objSourcePaths = [
+                os.path.join(pszSourceDirectory, pszEntry) for pszEntry in os.listdir(pszSourceDirectory)
+            ]
+        except OSError:
+            return
+        objSourcePaths = [pszSourcePath for pszSourcePath in objSourcePaths if os.path.isfile(pszSourcePath)]
+    for pszSourcePath in objSourcePaths:
+        pszEntry: str = os.path.basename(pszSourcePath)
         if not pszEntry.endswith(".tsv"):
             continue
         if not any(pszEntry.startswith(pszPrefix) for pszPrefix in objPrefixes):
             continue
-        pszSourcePath: str = os.path.join(pszSourceDirectory, pszEntry)
-        if not os.path.isfile(pszSourcePath):
-            continue
         pszTargetPath: str = build_unique_temp_path(pszTempDirectory, pszEntry)
         shutil.move(pszSourcePath, pszTargetPath)
         if pszEntry.startswith("損益計算書_") and pszEntry.endswith("_A∪B_プロジェクト名_C∪D_vertical.tsv"):
@@ -1172,7 +1220,10 @@ def move_pl_outputs_to_temp(pszCsvPath: str) -> None:
             shutil.copy2(pszTargetPath, pszCopyPath)
 
 
-def move_manhour_outputs_to_temp(pszCsvPath: str) -> None:
+def move_manhour_outputs_to_temp(
+    pszCsvPath: str,
+    objEntries: Optional[List[Dict[str, object]]] = None,
+) -> None:
     objYearMonth = parse_year_month_from_pl_csv(pszCsvPath)
     if objYearMonth is None:
         return
@@ -1182,18 +1233,24 @@ def move_manhour_outputs_to_temp(pszCsvPath: str) -> None:
     pszSourceDirectory: str = os.path.dirname(pszCsvPath)
     pszTempDirectory: str = get_manhour_temp_output_directory()
     pszCmdDirectory: str = os.path.dirname(__file__)
-    try:
-        objEntries: List[str] = os.listdir(pszSourceDirectory)
-    except OSError:
-        return
-    for pszEntry in objEntries:
+    objSourcePaths: List[str]
+    if objEntries is not None:
+        # 子プロセスの出力一覧がある場合は、フォルダを読み直さずにその中から選ぶ
+        objSourcePaths = select_output_manifest_paths(objEntries, pszSourceDirectory)
+    else:
+        try:
+            objSourcePaths = [
+                os.path.join(pszSourceDirectory, pszEntry) for pszEntry in os.listdir(pszSourceDirectory)
+            ]
+        except OSError:
+            return
+        objSourcePaths = [pszSourcePath for pszSourcePath in objSourcePaths if os.path.isfile(pszSourcePath)]
+    for pszSourcePath in objSourcePaths:
+        pszEntry: str = os.path.basename(pszSourcePath)
         if not pszEntry.endswith(".tsv"):
             continue
         if not pszEntry.startswith(pszPrefix):
             continue
-        pszSourcePath: str = os.path.join(pszSourceDirectory, pszEntry)
-        if not os.path.isfile(pszSourcePath):
-            continue
         pszTargetPath: str = build_unique_temp_path(pszTempDirectory, pszEntry)
         shutil.move(pszSourcePath, pszTargetPath)
         if pszEntry.startswith("工数_") and pszEntry.endswith("_step0014_各プロジェクトの計上カンパニー名_工数_カンパニーの工数.tsv"):
@@ -1381,14 +1438,16 @@ def run_allocation_with_pairs(
     pszRangePath: Optional[str] = write_selected_range_file(objPairs)
     objArgs: List[str] = build_cmd_args(objPairs)
     pszScriptPath: str = os.path.join(os.path.dirname(__file__), "SellGeneralAdminCost_Allocation_Cmd_0002.py")
-    objCommand: List[str] = [sys.executable, pszScriptPath]
+    pszManifestPath: str = create_output_manifest_path()
+    objCommand: List[str] = [sys.executable, pszScriptPath, "--output-manifest", pszManifestPath]
     objCommand.extend(objArgs)
 
+    # 出力ファイルは --output-manifest の一覧から受け取るため、標準出力は取り込まずそのまま流す
     try:
         objResult = subprocess.run(
             objCommand,
             check=False,
-            capture_output=True,
+            stderr=subprocess.PIPE,
             text=True,
         )
     except Exception as exc:  # noqa: BLE001
@@ -1398,6 +1457,7 @@ def run_allocation_with_pairs(
         )
         show_error_message_box(pszErrorMessage, "SellGeneralAdminCost_Allocation_DnD")
         return 1
+    objEntries: Optional[List[Dict[str, object]]] = read_output_manifest(pszManifestPath)
 
     if objResult.returncode != 0:
         pszStdErr: str = objResult.stderr
@@ -1414,16 +1474,13 @@ def run_allocation_with_pairs(
         show_error_message_box(pszErrorMessage, "SellGeneralAdminCost_Allocation_DnD")
         return objResult.returncode
 
-    pszStdOut: str = objResult.stdout
-    objMoved = move_output_files_to_temp(pszStdOut)
+    objMoved = move_output_files_to_temp(objEntries or [])
     if objMoved:
         set_last_output_directory(os.path.dirname(objMoved[0]))
-    if pszStdOut.strip() != "":
-        print(pszStdOut)
-    pszStdOut = "成功しました！"
+    pszMessage: str = "成功しました！"
     if pszRangePath is not None:
-        pszStdOut += "\n\n採用範囲を記録しました: " + pszRangePath
-    show_message_box(pszStdOut, "SellGeneralAdminCost_Allocation_DnD")
+        pszMessage += "\n\n採用範囲を記録しました: " + pszRangePath
+    show_message_box(pszMessage, "SellGeneralAdminCost_Allocation_DnD")
     return 0
 
 
@@ -1438,7 +1495,8 @@ def run_pl_csv_to_tsv(
         show_error_message_box(pszErrorMessage, "SellGeneralAdminCost_Allocation_DnD")
         return 1
 
-    objCommand: List[str] = [sys.executable, pszScriptPath] + objCsvFiles
+    pszManifestPath: str = create_output_manifest_path()
+    objCommand: List[str] = [sys.executable, pszScriptPath, "--output-manifest", pszManifestPath] + objCsvFiles
     append_error_log("Running: " + " ".join(objCommand))
     try:
         objResult = subprocess.run(
@@ -1454,6 +1512,7 @@ def run_pl_csv_to_tsv(
         )
         show_error_message_box(pszErrorMessage, "SellGeneralAdminCost_Allocation_DnD")
         return 1
+    objEntries: Optional[List[Dict[str, object]]] = read_output_manifest(pszManifestPath)
 
     if objResult.returncode != 0:
         pszStdErr: str = objResult.stderr
@@ -1473,10 +1532,9 @@ def run_pl_csv_to_tsv(
     pszStdOut: str = objResult.stdout.strip()
     if pszStdOut != "":
         print(pszStdOut)
-        move_output_files_to_temp(pszStdOut)
 
     for pszCsvPath in objCsvFiles:
-        move_pl_outputs_to_temp(pszCsvPath)
+        move_pl_outputs_to_temp(pszCsvPath, objEntries)
 
     pszMessage: str = "PL_CsvToTsv_Cmd_0002.py finished successfully."
     if pszStdOut != "":
@@ -1503,12 +1561,13 @@ def run_manhour_csv_to_sheet(
 
     objMessages: List[str] = []
     for pszCsvPath in objCsvFiles:
-        objCommand: List[str] = [sys.executable, pszScriptPath, pszCsvPath]
+        pszManifestPath: str = create_output_manifest_path()
+        objCommand: List[str] = [sys.executable, pszScriptPath, "--output-manifest", pszManifestPath, pszCsvPath]
         try:
             objResult = subprocess.run(
                 objCommand,
                 check=False,
-                capture_output=True,
+                stderr=subprocess.PIPE,
                 text=True,
             )
         except Exception as exc:  # noqa: BLE001
@@ -1519,6 +1578,7 @@ def run_manhour_csv_to_sheet(
             append_error_log(pszErrorMessage)
             show_error_message_box(pszErrorMessage, "SellGeneralAdminCost_Allocation_DnD")
             return 1
+        objEntries: Optional[List[Dict[str, object]]] = read_output_manifest(pszManifestPath)
 
         if objResult.returncode != 0:
             pszStdErr: str = objResult.stderr
@@ -1536,11 +1596,7 @@ def run_manhour_csv_to_sheet(
             show_error_message_box(pszErrorMessage, "SellGeneralAdminCost_Allocation_DnD")
             return objResult.returncode
 
-        pszStdOut: str = objResult.stdout.strip()
-        if pszStdOut != "":
-            print(pszStdOut)
-            move_output_files_to_temp(pszStdOut)
-        move_manhour_outputs_to_temp(pszCsvPath)
+        move_manhour_outputs_to_temp(pszCsvPath, objEntries)
 
     pszMessage: str = "make_manhour_to_sheet8_01_0003.py finished successfully."
     show_message_box(pszMessage, "SellGeneralAdminCost_Allocation_DnD")
@@ -1565,12 +1621,13 @@ def run_step10_tsv_only(
 
     iExitCode: int = 0
     for pszStep10Path in objStep10Files:
-        objCommand: List[str] = [sys.executable, pszScriptPath, pszStep10Path]
+        pszManifestPath: str = create_output_manifest_path()
+        objCommand: List[str] = [sys.executable, pszScriptPath, "--output-manifest", pszManifestPath, pszStep10Path]
         try:
             objResult = subprocess.run(
                 objCommand,
                 check=False,
-                capture_output=True,
+                stderr=subprocess.PIPE,
                 text=True,
             )
         except Exception as exc:  # noqa: BLE001
@@ -1582,6 +1639,7 @@ def run_step10_tsv_only(
             show_error_message_box(pszErrorMessage, "SellGeneralAdminCost_Allocation_DnD")
             iExitCode = 1
             continue
+        objEntries: Optional[List[Dict[str, object]]] = read_output_manifest(pszManifestPath)
 
         if objResult.returncode != 0:
             pszStdErr: str = objResult.stderr
@@ -1600,11 +1658,7 @@ def run_step10_tsv_only(
             iExitCode = 1
             continue
 
-        pszStdOut: str = objResult.stdout.strip()
-        if pszStdOut != "":
-            print(pszStdOut)
-            move_output_files_to_temp(pszStdOut)
-        move_manhour_outputs_to_temp(pszStep10Path)
+        move_manhour_outputs_to_temp(pszStep10Path, objEntries)
 
     if iExitCode == 0:
         pszMessage: str = "Manhour TSV only flow finished successfully."
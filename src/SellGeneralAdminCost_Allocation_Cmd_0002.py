@@ -26,13 +26,26 @@ import shutil
 import re
 import sys
 import csv
+import hashlib
+import io
+import json
+import pickle
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from functools import lru_cache
 from copy import copy
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 from openpyxl import load_workbook
 from openpyxl.styles import Border, Side
 
+from OrgTable_Index import OrgTableIndex, get_org_table_index
+from Output_Manifest import parse_output_manifest_argument, write_output_manifest
+
 
 def print_usage() -> None:
     pszUsage: str = (
@@ -41,7 +54,13 @@ def print_usage() -> None:
         "   or: python SellGeneralAdminCost_Allocation_Cmd.py "
         "<manhour_tsv_path> <pl_tsv_path> <manhour_tsv_path> <pl_tsv_path> ...\n"
         "   or: python SellGeneralAdminCost_Allocation_Cmd.py "
-        "<manhour_tsv_path> ... <pl_tsv_path> ..."
+        "<manhour_tsv_path> ... <pl_tsv_path> ...\n"
+        "Options:\n"
+        "   --no-persist-intermediates  step0001〜step0009 の中間TSVを書き出さない\n"
+        "   --persist-intermediates     中間TSVを書き出す (既定)\n"
+        "   --jobs N                    月ごとの処理を N プロセスで並列実行する (既定: 1)\n"
+        "   --incremental               入力が前回と同じ月は前回の販管費配賦の出力を再利用する\n"
+        "   --output-manifest PATH      出力ファイルの一覧を JSON Lines で PATH に書き出す"
     )
     print(pszUsage)
 
@@ -206,29 +225,89 @@ def build_output_path_with_step(pszInputPlPath: str, pszStepMarker: str) -> str:
     return pszOutputPath
 
 
+# プロジェクト名 (1 列目) の分類。同じ名前が各ステップ・各月で何度も現れるため、結果を名前ごとに保持する。
+PROJECT_NAME_COMPANY_PATTERN: re.Pattern[str] = re.compile(r"^C\d{3}_")
+PROJECT_NAME_COMPANY_CODE_PATTERN: re.Pattern[str] = re.compile(r"^C(\d{3})(?:_|$)")
+PROJECT_NAME_ORG_PREFIX_PATTERN: re.Pattern[str] = re.compile(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)")
+PROJECT_CODE_PATTERNS: Dict[Tuple[str, int], re.Pattern[str]] = {}
+
+
+@lru_cache(maxsize=65536)
+def classify_project_name(pszProjectName: str) -> Tuple[Optional[str], str, Optional[str], Optional[str]]:
+    # 戻り値: (プロジェクトキー, 種別, カンパニーコード, 管轄PJ表の接頭辞)
+    # プロジェクトキー: extract_project_key の結果
+    # 種別: "company" (C000_ で始まる) / "summary" (合計で始まる) / "project" (キーあり) / "other"
+    # カンパニーコード: 前後の空白を除いた名前が C000_ または C000 のときの "C000"
+    # 管轄PJ表の接頭辞: P00000_ / A000_ などの先頭部分
+    pszText: str = pszProjectName.strip()
+    pszKey: Optional[str] = None
+    if pszText != "" and PROJECT_NAME_COMPANY_PATTERN.match(pszText) is None:
+        iUnderscoreIndex: int = pszText.find("_")
+        if iUnderscoreIndex <= 0:
+            pszKey = pszText.split(" ", 1)[0]
+        else:
+            pszKey = pszText[:iUnderscoreIndex]
+        if pszKey == "" or pszKey[0] not in ("A", "C", "J", "P"):
+            pszKey = None
+        else:
+            pszKey = sys.intern(pszKey)
+
+    pszKind: str = "other"
+    if PROJECT_NAME_COMPANY_PATTERN.match(pszProjectName) is not None:
+        pszKind = "company"
+    elif pszProjectName.startswith("合計"):
+        pszKind = "summary"
+    elif pszKey is not None:
+        pszKind = "project"
+
+    objCompanyMatch = PROJECT_NAME_COMPANY_CODE_PATTERN.match(pszText)
+    pszCompanyCode: Optional[str] = None
+    if objCompanyMatch is not None:
+        pszCompanyCode = sys.intern("C" + objCompanyMatch.group(1))
+
+    objPrefixMatch = PROJECT_NAME_ORG_PREFIX_PATTERN.match(pszProjectName)
+    pszOrgPrefix: Optional[str] = None
+    if objPrefixMatch is not None:
+        pszOrgPrefix = sys.intern(objPrefixMatch.group(1))
+    return (pszKey, pszKind, pszCompanyCode, pszOrgPrefix)
+
+
+def classify_project_names(
+    objProjectNames: List[str],
+) -> List[Tuple[Optional[str], str, Optional[str], Optional[str]]]:
+    # 1 列分の名前をまとめて分類する (同じ名前は 1 回だけ分類する)
+    objClasses: Dict[str, Tuple[Optional[str], str, Optional[str], Optional[str]]] = {}
+    for pszProjectName in objProjectNames:
+        if pszProjectName not in objClasses:
+            objClasses[pszProjectName] = classify_project_name(pszProjectName)
+    return [objClasses[pszProjectName] for pszProjectName in objProjectNames]
+
+
 def extract_project_key(pszProjectName: str) -> Optional[str]:
-    pszText: str = (pszProjectName or "").strip()
-    if pszText == "":
-        return None
-    if re.match(r"^C\d{3}_", pszText):
-        return None
+    return classify_project_name(pszProjectName or "")[0]
 
-    iUnderscoreIndex: int = pszText.find("_")
-    if iUnderscoreIndex <= 0:
-        pszKey = pszText.split(" ", 1)[0]
-    else:
-        pszKey = pszText[:iUnderscoreIndex]
-    if pszKey == "":
-        return None
 
-    cPrefix: str = pszKey[0]
-    if cPrefix in ("A", "C", "J", "P"):
-        return pszKey
-    return None
+class ManhourTable:
+    # 工数TSV (工数_yyyy年mm月_step10_各プロジェクトの工数.tsv) を 1 回の読み込みで解析した結果。
+    # objManhourMap / objCompanyMap はどちらもプロジェクトキー (extract_project_key) で引く。
+    # 同じキーの行が複数ある場合は後の行が優先される。
+    def __init__(self) -> None:
+        self.objManhourMap: Dict[str, List[str]] = {}
+        self.objCompanyMap: Dict[str, str] = {}
 
 
-def load_manhour_map(pszManhourPath: str) -> Dict[str, List[str]]:
-    objManhourMap: Dict[str, List[str]] = {}
+# load_manhour_table のプロセス内キャッシュ。キーはパス、値は (mtime, サイズ, 解析結果)。
+MANHOUR_TABLE_CACHE: Dict[str, Tuple[int, int, ManhourTable]] = {}
+
+
+def load_manhour_table(pszManhourPath: str) -> ManhourTable:
+    pszCacheKey: str = os.path.normcase(os.path.abspath(pszManhourPath))
+    objStat = os.stat(pszManhourPath)
+    objEntry: Optional[Tuple[int, int, ManhourTable]] = MANHOUR_TABLE_CACHE.get(pszCacheKey)
+    if objEntry is not None and objEntry[:2] == (objStat.st_mtime_ns, objStat.st_size):
+        return objEntry[2]
+
+    objTable: ManhourTable = ManhourTable()
     with open(pszManhourPath, "r", encoding="utf-8", newline="") as objInputFile:
         for pszLine in objInputFile:
             pszLineText: str = pszLine.rstrip("\n").rstrip("\r")
@@ -236,36 +315,26 @@ def load_manhour_map(pszManhourPath: str) -> Dict[str, List[str]]:
                 continue
 
             objParts: List[str] = pszLineText.split("\t")
-            pszFirstColumn: str = objParts[0] if objParts else ""
-
-            pszKey: Optional[str] = extract_project_key(pszFirstColumn)
+            pszKey: Optional[str] = extract_project_key(objParts[0])
             if pszKey is None:
                 continue
 
             objManhourValues: List[str] = objParts[-6:] if len(objParts) >= 7 else []
             if len(objManhourValues) < 6:
                 objManhourValues.extend([""] * (6 - len(objManhourValues)))
-            objManhourMap[pszKey] = objManhourValues
+            objTable.objManhourMap[pszKey] = objManhourValues
+            objTable.objCompanyMap[pszKey] = objParts[1] if len(objParts) >= 2 else ""
 
-    return objManhourMap
+    MANHOUR_TABLE_CACHE[pszCacheKey] = (objStat.st_mtime_ns, objStat.st_size, objTable)
+    return objTable
+
+
+def load_manhour_map(pszManhourPath: str) -> Dict[str, List[str]]:
+    return load_manhour_table(pszManhourPath).objManhourMap
 
 
 def load_company_map(pszManhourPath: str) -> Dict[str, str]:
-    objCompanyMap: Dict[str, str] = {}
-    with open(pszManhourPath, "r", encoding="utf-8", newline="") as objInputFile:
-        for pszLine in objInputFile:
-            pszLineText: str = pszLine.rstrip("\n").rstrip("\r")
-            if pszLineText == "":
-                continue
-            objParts: List[str] = pszLineText.split("\t")
-            if not objParts:
-                continue
-            pszKey: Optional[str] = extract_project_key(objParts[0])
-            if pszKey is None:
-                continue
-            pszCompany: str = objParts[1] if len(objParts) >= 2 else ""
-            objCompanyMap[pszKey] = pszCompany
-    return objCompanyMap
+    return load_manhour_table(pszManhourPath).objCompanyMap
 
 
 def parse_number(pszText: str) -> float:
@@ -278,29 +347,39 @@ def parse_number(pszText: str) -> float:
         return 0.0
 
 
-def parse_time_to_seconds(pszTimeText: str) -> float:
+def parse_time_to_int_seconds(pszTimeText: str) -> int:
+    # 工数 (h:mm:ss) を整数秒にする。読めない値は 0 秒とする。
     pszValue: str = (pszTimeText or "").strip()
     if pszValue == "":
-        return 0.0
+        return 0
 
     objParts: List[str] = pszValue.split(":")
     if len(objParts) != 3:
-        return 0.0
+        return 0
     try:
         iHours: int = int(objParts[0])
         iMinutes: int = int(objParts[1])
         iSeconds: int = int(objParts[2])
     except ValueError:
-        return 0.0
+        return 0
 
-    return float(iHours * 3600 + iMinutes * 60 + iSeconds)
+    return iHours * 3600 + iMinutes * 60 + iSeconds
 
 
 def is_time_text_or_blank(pszTimeText: str) -> bool:
+    # 空欄、または ^\d+:\d{2}:\d{2}$ の形か (正規表現を使わずに判定する)
     pszValue: str = (pszTimeText or "").strip()
     if pszValue == "":
         return True
-    return re.match(r"^\d+:\d{2}:\d{2}$", pszValue) is not None
+    objParts: List[str] = pszValue.split(":")
+    return (
+        len(objParts) == 3
+        and objParts[0].isdecimal()
+        and len(objParts[1]) == 2
+        and objParts[1].isdecimal()
+        and len(objParts[2]) == 2
+        and objParts[2].isdecimal()
+    )
 
 
 def format_seconds_as_time_text(fSeconds: float) -> str:
@@ -322,29 +401,258 @@ def format_number(fValue: float) -> str:
     return pszText
 
 
-def find_total_row_index(objRows: List[List[str]]) -> int:
-    for iRowIndex, objRow in enumerate(objRows):
+def normalize_formatted_number(fValue: float) -> float:
+    # format_number で書き出したセルを parse_number で読み直した値と同じ値を返す
+    if abs(fValue - round(fValue)) < 0.0000001:
+        return float(int(round(fValue)))
+    return round(fValue, 6)
+
+
+def normalize_formatted_numbers(objValues: np.ndarray) -> np.ndarray:
+    # normalize_formatted_number の配列版
+    fValues: np.ndarray = np.asarray(objValues, dtype=np.float64)
+    fRounded: np.ndarray = np.rint(fValues)
+    objNearInteger: np.ndarray = np.abs(fValues - fRounded) < 0.0000001
+    fNormalized: np.ndarray = np.where(objNearInteger, fRounded + 0.0, fValues)
+    objFractionIndices: np.ndarray = np.nonzero(~objNearInteger)[0]
+    if objFractionIndices.size > 0:
+        fNormalized[objFractionIndices] = [
+            round(fValue, 6) for fValue in fValues[objFractionIndices].tolist()
+        ]
+    return fNormalized
+
+
+PL_TABLE_MANHOUR_COLUMN_NAMES: Tuple[str, ...] = (
+    "工数",
+    "1Cカンパニー販管費の工数",
+    "2Cカンパニー販管費の工数",
+    "3Cカンパニー販管費の工数",
+    "4Cカンパニー販管費の工数",
+    "事業開発カンパニー販管費の工数",
+)
+
+
+class PlTable:
+    # 損益計算書 (vertical) の行を保持し、数値は列ごとの float 配列、
+    # 工数列は整数秒の配列として読み込み時に一度だけ解析する。
+    # 書き換えたセルは materialize() の時点で一度だけ文字列に整形する。
+    # objRows の各行の長さ (空セルの有無) は元の TSV と同じに保つ。
+
+    def __init__(self, objRows: List[List[str]], bParse: bool = True) -> None:
+        self.objRows: List[List[str]] = objRows
+        self.objColumnIndices: Dict[str, int] = {}
+        self.objLastColumnIndices: Dict[str, int] = {}
+        self.objNumberColumns: List[array] = []
+        self.objSecondsColumns: List[Optional[array]] = []
+        self.objDirtyColumns: List[Dict[int, float]] = []
+        if bParse:
+            self.parse_all_columns()
+
+    def parse_all_columns(self) -> None:
+        iColumnCount: int = max((len(objRow) for objRow in self.objRows), default=0)
+        self.objNumberColumns = []
+        self.objSecondsColumns = []
+        self.objDirtyColumns = []
+        for iColumnIndex in range(iColumnCount):
+            objTexts: List[str] = [
+                objRow[iColumnIndex] if iColumnIndex < len(objRow) else ""
+                for objRow in self.objRows
+            ]
+            self.objNumberColumns.append(array("d", [parse_number(pszText) for pszText in objTexts]))
+            if self.is_manhour_column(iColumnIndex):
+                self.objSecondsColumns.append(
+                    array("q", [parse_time_to_int_seconds(pszText) for pszText in objTexts])
+                )
+            else:
+                self.objSecondsColumns.append(None)
+            self.objDirtyColumns.append({})
+        self.rebuild_column_indices()
+
+    def rebuild_column_indices(self) -> None:
+        # 同じ見出しが複数ある場合、objColumnIndices は最初の列、objLastColumnIndices は最後の列を持つ
+        self.objColumnIndices = {}
+        self.objLastColumnIndices = {}
+        objHeader: List[str] = self.objRows[0] if self.objRows else []
+        for iColumnIndex, pszColumnName in enumerate(objHeader):
+            if pszColumnName not in self.objColumnIndices:
+                self.objColumnIndices[pszColumnName] = iColumnIndex
+            self.objLastColumnIndices[pszColumnName] = iColumnIndex
+
+    def is_manhour_column(self, iColumnIndex: int) -> bool:
+        objHeader: List[str] = self.objRows[0] if self.objRows else []
+        return iColumnIndex < len(objHeader) and objHeader[iColumnIndex] in PL_TABLE_MANHOUR_COLUMN_NAMES
+
+    def find_column(self, pszColumnName: str) -> int:
+        return self.objColumnIndices.get(pszColumnName, -1)
+
+    def find_last_column(self, pszColumnName: str) -> int:
+        return self.objLastColumnIndices.get(pszColumnName, -1)
+
+    def row_count(self) -> int:
+        return len(self.objRows)
+
+    def row_length(self, iRowIndex: int) -> int:
+        return len(self.objRows[iRowIndex])
+
+    def row_name(self, iRowIndex: int) -> str:
+        objRow: List[str] = self.objRows[iRowIndex]
+        return objRow[0] if objRow else ""
+
+    def ensure_column_count(self, iColumnCount: int) -> None:
+        iRowCount: int = len(self.objRows)
+        while len(self.objNumberColumns) < iColumnCount:
+            self.objNumberColumns.append(array("d", bytes(8 * iRowCount)))
+            self.objSecondsColumns.append(None)
+            self.objDirtyColumns.append({})
+
+    def extend_row(self, iRowIndex: int, iLength: int) -> None:
+        objRow: List[str] = self.objRows[iRowIndex]
+        if len(objRow) < iLength:
+            objRow.extend([""] * (iLength - len(objRow)))
+            self.ensure_column_count(iLength)
+
+    def get_number(self, iRowIndex: int, iColumnIndex: int) -> float:
+        if iColumnIndex >= len(self.objNumberColumns):
+            return 0.0
+        return self.objNumberColumns[iColumnIndex][iRowIndex]
+
+    def get_seconds(self, iRowIndex: int, iColumnIndex: int) -> int:
+        if iColumnIndex >= len(self.objNumberColumns):
+            return 0
+        objSeconds: Optional[array] = self.objSecondsColumns[iColumnIndex]
+        if objSeconds is not None:
+            return objSeconds[iRowIndex]
+        if iRowIndex in self.objDirtyColumns[iColumnIndex]:
+            return 0
+        objRow: List[str] = self.objRows[iRowIndex]
+        if iColumnIndex >= len(objRow):
+            return 0
+        return parse_time_to_int_seconds(objRow[iColumnIndex])
+
+    def row_length_vector(self) -> np.ndarray:
+        return np.fromiter((len(objRow) for objRow in self.objRows), dtype=np.int64, count=len(self.objRows))
+
+    def number_vector(self, iColumnIndex: int) -> np.ndarray:
+        if iColumnIndex >= len(self.objNumberColumns):
+            return np.zeros(len(self.objRows), dtype=np.float64)
+        return np.frombuffer(self.objNumberColumns[iColumnIndex], dtype=np.float64)
+
+    def get_seconds_vector(self, iColumnIndex: int) -> np.ndarray:
+        objSeconds: Optional[array] = (
+            self.objSecondsColumns[iColumnIndex] if iColumnIndex < len(self.objSecondsColumns) else None
+        )
+        if objSeconds is not None:
+            return np.frombuffer(objSeconds, dtype=np.int64).copy()
+        return np.array(
+            [self.get_seconds(iRowIndex, iColumnIndex) for iRowIndex in range(len(self.objRows))],
+            dtype=np.int64,
+        )
+
+    def set_number(self, iRowIndex: int, iColumnIndex: int, fValue: float) -> None:
+        self.extend_row(iRowIndex, iColumnIndex + 1)
+        self.objNumberColumns[iColumnIndex][iRowIndex] = normalize_formatted_number(fValue)
+        objSeconds: Optional[array] = self.objSecondsColumns[iColumnIndex]
+        if objSeconds is not None:
+            objSeconds[iRowIndex] = 0
+        self.objDirtyColumns[iColumnIndex][iRowIndex] = fValue
+
+    def set_numbers(self, objRowIndices: np.ndarray, iColumnIndex: int, objValues: np.ndarray) -> None:
+        objRowIndexList: List[int] = objRowIndices.tolist()
+        for iRowIndex in objRowIndexList:
+            objRow: List[str] = self.objRows[iRowIndex]
+            if len(objRow) <= iColumnIndex:
+                objRow.extend([""] * (iColumnIndex + 1 - len(objRow)))
+        self.ensure_column_count(iColumnIndex + 1)
+        fValues: np.ndarray = np.asarray(objValues, dtype=np.float64)
+        np.frombuffer(self.objNumberColumns[iColumnIndex], dtype=np.float64)[objRowIndices] = (
+            normalize_formatted_numbers(fValues)
+        )
+        objSeconds: Optional[array] = self.objSecondsColumns[iColumnIndex]
+        if objSeconds is not None:
+            np.frombuffer(objSeconds, dtype=np.int64)[objRowIndices] = 0
+        self.objDirtyColumns[iColumnIndex].update(zip(objRowIndexList, fValues.tolist()))
+
+    def insert_columns(self, iInsertIndex: int, objColumnNames: List[str]) -> None:
+        iInsertCount: int = len(objColumnNames)
+        self.ensure_column_count(iInsertIndex)
+        for iRowIndex, objRow in enumerate(self.objRows):
+            if iRowIndex == 0:
+                objRow[iInsertIndex:iInsertIndex] = objColumnNames
+            else:
+                objRow[iInsertIndex:iInsertIndex] = [""] * iInsertCount
+        iRowCount: int = len(self.objRows)
+        self.objNumberColumns[iInsertIndex:iInsertIndex] = [
+            array("d", bytes(8 * iRowCount)) for _ in range(iInsertCount)
+        ]
+        self.objSecondsColumns[iInsertIndex:iInsertIndex] = [
+            array("q", bytes(8 * iRowCount)) if pszColumnName in PL_TABLE_MANHOUR_COLUMN_NAMES else None
+            for pszColumnName in objColumnNames
+        ]
+        self.objDirtyColumns[iInsertIndex:iInsertIndex] = [{} for _ in range(iInsertCount)]
+        self.rebuild_column_indices()
+
+    def materialize(self) -> List[List[str]]:
+        for iColumnIndex, objDirtyCells in enumerate(self.objDirtyColumns):
+            if not objDirtyCells:
+                continue
+            for iRowIndex, fValue in objDirtyCells.items():
+                self.objRows[iRowIndex][iColumnIndex] = format_number(fValue)
+            objDirtyCells.clear()
+        return self.objRows
+
+    def copy(self) -> "PlTable":
+        self.materialize()
+        objTable: PlTable = PlTable([list(objRow) for objRow in self.objRows], False)
+        objTable.objColumnIndices = dict(self.objColumnIndices)
+        objTable.objLastColumnIndices = dict(self.objLastColumnIndices)
+        objTable.objNumberColumns = [array("d", objNumbers) for objNumbers in self.objNumberColumns]
+        objTable.objSecondsColumns = [
+            array("q", objSeconds) if objSeconds is not None else None
+            for objSeconds in self.objSecondsColumns
+        ]
+        objTable.objDirtyColumns = [{} for _ in self.objNumberColumns]
+        return objTable
+
+
+def find_total_row_index(
+    objRows: List[List[str]],
+    iStartRowIndex: int = 1,
+    iEndRowIndex: Optional[int] = None,
+) -> int:
+    # iStartRowIndex〜iEndRowIndex は複数月を積み上げた表での 1 か月分の範囲
+    if iEndRowIndex is None:
+        iEndRowIndex = len(objRows)
+    if objRows and (objRows[0][0] if objRows[0] else "") == "合計":
+        return 0
+    for iRowIndex in range(iStartRowIndex, iEndRowIndex):
+        objRow: List[str] = objRows[iRowIndex]
         pszFirstColumn: str = objRow[0] if objRow else ""
         if pszFirstColumn == "合計":
             return iRowIndex
-    return 1
+    return iStartRowIndex
 
 
-def collect_allocation_target_row_indices(objRows: List[List[str]]) -> List[int]:
-    objCompanyPattern = re.compile(r"^C\d{3}(?:_|$)")
+def collect_allocation_target_row_indices(
+    objRows: List[List[str]],
+    iStartRowIndex: int = 1,
+    iEndRowIndex: Optional[int] = None,
+) -> List[int]:
+    if iEndRowIndex is None:
+        iEndRowIndex = len(objRows)
 
     iLastCompanyRowIndex: int = -1
-    for iRowIndex in range(1, len(objRows)):
-        objRow = objRows[iRowIndex]
-        pszFirstColumn: str = (objRow[0] if objRow else "").strip()
-        if objCompanyPattern.match(pszFirstColumn):
-            iLastCompanyRowIndex = iRowIndex
+    objClasses = classify_project_names(
+        [objRow[0] if objRow else "" for objRow in objRows[iStartRowIndex:iEndRowIndex]]
+    )
+    for iOffset, objClass in enumerate(objClasses):
+        if objClass[2] is not None:
+            iLastCompanyRowIndex = iStartRowIndex + iOffset
 
     if iLastCompanyRowIndex < 0:
         return []
 
     objTargetRowIndices: List[int] = []
-    for iRowIndex in range(iLastCompanyRowIndex + 1, len(objRows)):
+    for iRowIndex in range(iLastCompanyRowIndex + 1, iEndRowIndex):
         objRow = objRows[iRowIndex]
         pszFirstColumn: str = (objRow[0] if objRow else "").strip()
         if pszFirstColumn == "":
@@ -353,102 +661,200 @@ def collect_allocation_target_row_indices(objRows: List[List[str]]) -> List[int]
     return objTargetRowIndices
 
 
-def calculate_allocation(
-    objRows: List[List[str]],
+def allocate_by_manhour_seconds(
+    objPoolAmounts: np.ndarray,
+    objSecondsMatrix: np.ndarray,
+    objRowIndices: np.ndarray,
+    objTotalSeconds: np.ndarray,
+    objHamiltonFlags: List[bool],
+) -> np.ndarray:
+    # 配賦元 (P) × 対象行 (R) の工数秒から、配賦額を整数で一括計算する。
+    # 工数が 0 以下のセルはその配賦元の対象外とし、配賦額は 0 とする。
+    # Hamilton (最大剰余) 方式の同順位は「剰余 → 工数秒 → 行番号の小さい方」の順で優先する。
+    fPoolAmounts: np.ndarray = np.asarray(objPoolAmounts, dtype=np.float64)
+    fSeconds: np.ndarray = np.asarray(objSecondsMatrix, dtype=np.float64)
+    objTargetMask: np.ndarray = fSeconds > 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fRawValues: np.ndarray = fPoolAmounts[:, None] * fSeconds / np.asarray(objTotalSeconds, dtype=np.float64)[:, None]
+    fRawValues = np.where(objTargetMask, fRawValues, 0.0)
+
+    fBaseValues: np.ndarray = np.floor(fRawValues)
+    fRemainders: np.ndarray = fRawValues - fBaseValues
+    objAllocations: np.ndarray = fBaseValues.astype(np.int64)
+
+    objTargetTotals: np.ndarray = np.array(
+        [int(round(float(fAmount))) for fAmount in fPoolAmounts],
+        dtype=np.int64,
+    )
+    objRemains: np.ndarray = objTargetTotals - objAllocations.sum(axis=1)
+
+    objPoolIndices: np.ndarray
+    objColumnIndices: np.ndarray
+    objPoolIndices, objColumnIndices = np.nonzero(objTargetMask)
+    objOrder: np.ndarray = np.lexsort(
+        (
+            np.asarray(objRowIndices)[objColumnIndices],
+            -fSeconds[objPoolIndices, objColumnIndices],
+            -fRemainders[objPoolIndices, objColumnIndices],
+            objPoolIndices,
+        )
+    )
+    objSortedPools: np.ndarray = objPoolIndices[objOrder]
+    objSortedColumns: np.ndarray = objColumnIndices[objOrder]
+    objCounts: np.ndarray = objTargetMask.sum(axis=1)
+    objStarts: np.ndarray = np.cumsum(objCounts) - objCounts
+    objRanks: np.ndarray = np.arange(objSortedPools.size) - objStarts[objSortedPools]
+    objRemainsSorted: np.ndarray = objRemains[objSortedPools]
+    objDeltas: np.ndarray = np.where(objRemainsSorted > 0, objRanks < objRemainsSorted, 0).astype(np.int64)
+    objDeltas -= np.where(
+        objRemainsSorted < 0,
+        objRanks >= objCounts[objSortedPools] + objRemainsSorted,
+        0,
+    ).astype(np.int64)
+    objAllocations[objSortedPools, objSortedColumns] += objDeltas
+
+    objHamiltonMask: np.ndarray = np.asarray(objHamiltonFlags, dtype=bool)
+    if not objHamiltonMask.all():
+        objRoundedValues: np.ndarray = np.rint(fRawValues).astype(np.int64)
+        objAllocations = np.where(objHamiltonMask[:, None], objAllocations, objRoundedValues)
+    return objAllocations
+
+
+def calculate_allocation_pool_amount(
+    objTable: PlTable,
     iSellGeneralAdminCostColumnIndex: int,
-    iAllocationColumnIndex: int,
-    iManhourColumnIndex: int,
-    objDeductionCodes: Optional[List[str]] = None,
-    bUseHamiltonRounding: bool = True,
-) -> None:
-    iRowIndexTotal: int = find_total_row_index(objRows)
+    objDeductionCodes: Optional[List[str]],
+    iStartRowIndex: int = 1,
+    iEndRowIndex: Optional[int] = None,
+) -> float:
+    objRows: List[List[str]] = objTable.objRows
+    if iEndRowIndex is None:
+        iEndRowIndex = len(objRows)
+    iRowIndexTotal: int = find_total_row_index(objRows, iStartRowIndex, iEndRowIndex)
 
     fSellGeneralAdminCostTotal: float = 0.0
-    if iRowIndexTotal < len(objRows) and iSellGeneralAdminCostColumnIndex >= 0:
-        objRowTotal: List[str] = objRows[iRowIndexTotal]
-        if iSellGeneralAdminCostColumnIndex < len(objRowTotal):
-            fSellGeneralAdminCostTotal = parse_number(objRowTotal[iSellGeneralAdminCostColumnIndex])
+    if (iRowIndexTotal == 0 or iRowIndexTotal < iEndRowIndex) and iSellGeneralAdminCostColumnIndex >= 0:
+        if iSellGeneralAdminCostColumnIndex < objTable.row_length(iRowIndexTotal):
+            fSellGeneralAdminCostTotal = objTable.get_number(iRowIndexTotal, iSellGeneralAdminCostColumnIndex)
 
     objDeductionSet = set(objDeductionCodes or [])
     fDeductionSum: float = 0.0
     if objDeductionSet:
-        objCompanyPattern = re.compile(r"^C(\d{3})(?:_|$)")
-        for iRowIndex in range(1, len(objRows)):
+        objClasses = classify_project_names(
+            [objRow[0] if objRow else "" for objRow in objRows[iStartRowIndex:iEndRowIndex]]
+        )
+        for iOffset, objClass in enumerate(objClasses):
+            iRowIndex: int = iStartRowIndex + iOffset
             objRow: List[str] = objRows[iRowIndex]
-            pszFirstColumn: str = (objRow[0] if objRow else "").strip()
-            objMatch = objCompanyPattern.match(pszFirstColumn)
-            if objMatch is None:
-                continue
-            pszCode: str = f"C{objMatch.group(1)}"
-            if pszCode not in objDeductionSet:
+            pszCode: Optional[str] = objClass[2]
+            if pszCode is None or pszCode not in objDeductionSet:
                 continue
             if iSellGeneralAdminCostColumnIndex < len(objRow):
-                fDeductionSum += parse_number(objRow[iSellGeneralAdminCostColumnIndex])
+                fDeductionSum += objTable.get_number(iRowIndex, iSellGeneralAdminCostColumnIndex)
 
-    fSellGeneralAdminCostAllocation: float = fSellGeneralAdminCostTotal - fDeductionSum
+    return fSellGeneralAdminCostTotal - fDeductionSum
 
-    objTargetRowIndices: List[int] = collect_allocation_target_row_indices(objRows)
-    if not objTargetRowIndices:
-        return
 
-    objFilteredTargetRowIndices: List[int] = []
-    objManhourSeconds: List[float] = []
-    fTotalManhours: float = 0.0
-    for iRowIndex in objTargetRowIndices:
-        objRow: List[str] = objRows[iRowIndex]
-        fManhourSeconds: float = 0.0
-        if iManhourColumnIndex < len(objRow):
-            fManhourSeconds = parse_time_to_seconds(objRow[iManhourColumnIndex])
-        if fManhourSeconds <= 0.0:
-            continue
-        objFilteredTargetRowIndices.append(iRowIndex)
-        objManhourSeconds.append(fManhourSeconds)
-        fTotalManhours += fManhourSeconds
+def calculate_allocations(
+    objTable: PlTable,
+    iSellGeneralAdminCostColumnIndex: int,
+    iManhourColumnIndex: int,
+    objVariants: List[Tuple[Optional[List[str]], bool]],
+    objSegments: Optional[List[Tuple[int, int]]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # objVariants: (控除するカンパニーコード, Hamilton 方式で丸めるか) の組
+    # objSegments: 複数月を積み上げた表での各月の行範囲 (省略時は表全体で 1 か月)
+    # 戻り値: (配賦先の行番号, 組ごとの配賦額)。配賦しない月の行は含まれない。
+    if objSegments is None:
+        objSegments = [(1, objTable.row_count())]
+
+    objRowIndexList: List[int] = []
+    objSecondsList: List[int] = []
+    objPoolAmounts: List[float] = []
+    objPoolTotalSeconds: List[float] = []
+    objPoolRanges: List[Tuple[int, int]] = []
+    for iStartRowIndex, iEndRowIndex in objSegments:
+        objTargetRowIndices: List[int] = collect_allocation_target_row_indices(
+            objTable.objRows,
+            iStartRowIndex,
+            iEndRowIndex,
+        )
+        iOffset: int = len(objRowIndexList)
+        for iRowIndex in objTargetRowIndices:
+            iManhourSeconds: int = 0
+            if iManhourColumnIndex < objTable.row_length(iRowIndex):
+                iManhourSeconds = objTable.get_seconds(iRowIndex, iManhourColumnIndex)
+            if iManhourSeconds <= 0:
+                continue
+            objRowIndexList.append(iRowIndex)
+            objSecondsList.append(iManhourSeconds)
 
-    if fTotalManhours <= 0.0:
-        return
+        fTotalManhours: float = float(sum(objSecondsList[iOffset:]))
+        if fTotalManhours <= 0.0:
+            del objRowIndexList[iOffset:]
+            del objSecondsList[iOffset:]
+            continue
 
-    objAllocations: List[int] = []
-    if bUseHamiltonRounding:
-        iTargetTotal: int = int(round(fSellGeneralAdminCostAllocation))
-        objRawValues: List[float] = [
-            fSellGeneralAdminCostAllocation * fManhourSeconds / fTotalManhours
-            for fManhourSeconds in objManhourSeconds
-        ]
-        objBaseValues: List[int] = [int(fRawValue // 1) for fRawValue in objRawValues]
-        iRemain: int = iTargetTotal - sum(objBaseValues)
-
-        objRankIndices: List[int] = list(range(len(objFilteredTargetRowIndices)))
-        objRankIndices.sort(
-            key=lambda iIndex: (
-                objRawValues[iIndex] - objBaseValues[iIndex],
-                objManhourSeconds[iIndex],
-                -objFilteredTargetRowIndices[iIndex],
-            ),
-            reverse=True,
-        )
+        for objDeductionCodes, _ in objVariants:
+            objPoolAmounts.append(
+                calculate_allocation_pool_amount(
+                    objTable,
+                    iSellGeneralAdminCostColumnIndex,
+                    objDeductionCodes,
+                    iStartRowIndex,
+                    iEndRowIndex,
+                )
+            )
+            objPoolTotalSeconds.append(fTotalManhours)
+            objPoolRanges.append((iOffset, len(objRowIndexList)))
+
+    iVariantCount: int = len(objVariants)
+    objRowIndices: np.ndarray = np.array(objRowIndexList, dtype=np.int64)
+    if not objPoolRanges:
+        return objRowIndices, np.zeros((iVariantCount, 0), dtype=np.int64)
+
+    objSeconds: np.ndarray = np.array(objSecondsList, dtype=np.float64)
+    objSecondsMatrix: np.ndarray = np.zeros((len(objPoolRanges), objSeconds.size), dtype=np.float64)
+    for iPool, (iBegin, iEnd) in enumerate(objPoolRanges):
+        objSecondsMatrix[iPool, iBegin:iEnd] = objSeconds[iBegin:iEnd]
+
+    objPoolAllocations: np.ndarray = allocate_by_manhour_seconds(
+        np.array(objPoolAmounts, dtype=np.float64),
+        objSecondsMatrix,
+        objRowIndices,
+        np.array(objPoolTotalSeconds, dtype=np.float64),
+        [bUseHamiltonRounding for _, bUseHamiltonRounding in objVariants] * (len(objPoolRanges) // iVariantCount),
+    )
+    objAllocations: np.ndarray = np.zeros((iVariantCount, objSeconds.size), dtype=np.int64)
+    for iPool, (iBegin, iEnd) in enumerate(objPoolRanges):
+        objAllocations[iPool % iVariantCount, iBegin:iEnd] = objPoolAllocations[iPool, iBegin:iEnd]
+    return objRowIndices, objAllocations
+
+
+def write_allocation_column(
+    objTable: PlTable,
+    iAllocationColumnIndex: int,
+    objRowIndices: np.ndarray,
+    objAllocations: np.ndarray,
+) -> None:
+    objTable.set_numbers(objRowIndices, iAllocationColumnIndex, objAllocations.astype(np.float64))
 
-        if iRemain > 0:
-            for iIndex in objRankIndices[:iRemain]:
-                objBaseValues[iIndex] += 1
-        elif iRemain < 0:
-            objRankIndicesAsc: List[int] = list(reversed(objRankIndices))
-            for iIndex in objRankIndicesAsc[:(-iRemain)]:
-                objBaseValues[iIndex] -= 1
-        objAllocations = objBaseValues
-    else:
-        objAllocations = [
-            int(round(fSellGeneralAdminCostAllocation * fManhourSeconds / fTotalManhours))
-            for fManhourSeconds in objManhourSeconds
-        ]
 
-    for iTargetIndex, iRowIndex in enumerate(objFilteredTargetRowIndices):
-        objRow = objRows[iRowIndex]
-        if iAllocationColumnIndex >= len(objRow):
-            iAppendCount: int = iAllocationColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iAllocationColumnIndex] = format_number(float(objAllocations[iTargetIndex]))
-        objRows[iRowIndex] = objRow
+def calculate_allocation(
+    objTable: PlTable,
+    iSellGeneralAdminCostColumnIndex: int,
+    iAllocationColumnIndex: int,
+    iManhourColumnIndex: int,
+    objDeductionCodes: Optional[List[str]] = None,
+    bUseHamiltonRounding: bool = True,
+) -> None:
+    objRowIndices, objAllocations = calculate_allocations(
+        objTable,
+        iSellGeneralAdminCostColumnIndex,
+        iManhourColumnIndex,
+        [(objDeductionCodes, bUseHamiltonRounding)],
+    )
+    write_allocation_column(objTable, iAllocationColumnIndex, objRowIndices, objAllocations[0])
 
 
 def load_tsv_rows(pszInputPath: str) -> List[List[str]]:
@@ -460,23 +866,12 @@ def load_tsv_rows(pszInputPath: str) -> List[List[str]]:
     return objRows
 
 
-def resolve_step0002_column_indices(objRows: List[List[str]]) -> Tuple[int, int, int]:
-    iSellGeneralAdminCostColumnIndex: int = -1
-    iAllocationColumnIndex: int = -1
-    iManhourColumnIndex: int = -1
-    if objRows:
-        objHeaderRow: List[str] = objRows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "販売費及び一般管理費計":
-                iSellGeneralAdminCostColumnIndex = iColumnIndex
-            elif pszColumnName == "配賦販管費":
-                iAllocationColumnIndex = iColumnIndex
-            elif pszColumnName == "工数":
-                iManhourColumnIndex = iColumnIndex
+def resolve_step0002_column_indices(objTable: PlTable) -> Tuple[int, int, int]:
+    # 見出しが重複している場合は最後の列を使う
     return (
-        iSellGeneralAdminCostColumnIndex,
-        iAllocationColumnIndex,
-        iManhourColumnIndex,
+        objTable.find_last_column("販売費及び一般管理費計"),
+        objTable.find_last_column("配賦販管費"),
+        objTable.find_last_column("工数"),
     )
 
 
@@ -486,16 +881,11 @@ def write_tsv_rows(pszOutputPath: str, objRows: List[List[str]]) -> None:
             objOutputFile.write("\t".join(objRow) + "\n")
 
 
-def zero_sell_general_admin_cost_for_step0002_targets(objRows: List[List[str]]) -> None:
-    if not objRows:
+def zero_sell_general_admin_cost_for_step0002_targets(objTable: PlTable) -> None:
+    if objTable.row_count() == 0:
         return
 
-    iSellGeneralAdminCostColumnIndex: int = -1
-    objHeaderRow: List[str] = objRows[0]
-    for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-        if pszColumnName == "販売費及び一般管理費計":
-            iSellGeneralAdminCostColumnIndex = iColumnIndex
-            break
+    iSellGeneralAdminCostColumnIndex: int = objTable.find_column("販売費及び一般管理費計")
     if iSellGeneralAdminCostColumnIndex < 0:
         return
 
@@ -504,27 +894,18 @@ def zero_sell_general_admin_cost_for_step0002_targets(objRows: List[List[str]])
         "C006_社長室カンパニー販管費",
         "C007_本部カンパニー販管費",
     }
-    for iRowIndex in range(1, len(objRows)):
-        objRow: List[str] = objRows[iRowIndex]
-        pszFirstColumn: str = (objRow[0] if objRow else "").strip()
+    for iRowIndex in range(1, objTable.row_count()):
+        pszFirstColumn: str = objTable.row_name(iRowIndex).strip()
         if pszFirstColumn not in objTargetNames:
             continue
-        if iSellGeneralAdminCostColumnIndex >= len(objRow):
-            iAppendCount: int = iSellGeneralAdminCostColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iSellGeneralAdminCostColumnIndex] = "0"
+        objTable.set_number(iRowIndex, iSellGeneralAdminCostColumnIndex, 0.0)
 
 
-def zero_sell_general_admin_cost_for_step0006_targets(objRows: List[List[str]]) -> None:
-    if not objRows:
+def zero_sell_general_admin_cost_for_step0006_targets(objTable: PlTable) -> None:
+    if objTable.row_count() == 0:
         return
 
-    iSellGeneralAdminCostColumnIndex: int = -1
-    objHeaderRow: List[str] = objRows[0]
-    for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-        if pszColumnName == "販売費及び一般管理費計":
-            iSellGeneralAdminCostColumnIndex = iColumnIndex
-            break
+    iSellGeneralAdminCostColumnIndex: int = objTable.find_column("販売費及び一般管理費計")
     if iSellGeneralAdminCostColumnIndex < 0:
         return
 
@@ -536,15 +917,11 @@ def zero_sell_general_admin_cost_for_step0006_targets(objRows: List[List[str]])
         "C004_4Cカンパニー販管費",
         "C005_事業開発カンパニー販管費",
     }
-    for iRowIndex in range(1, len(objRows)):
-        objRow: List[str] = objRows[iRowIndex]
-        pszFirstColumn: str = (objRow[0] if objRow else "").strip()
+    for iRowIndex in range(1, objTable.row_count()):
+        pszFirstColumn: str = objTable.row_name(iRowIndex).strip()
         if pszFirstColumn not in objTargetNames:
             continue
-        if iSellGeneralAdminCostColumnIndex >= len(objRow):
-            iAppendCount: int = iSellGeneralAdminCostColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iSellGeneralAdminCostColumnIndex] = "0"
+        objTable.set_number(iRowIndex, iSellGeneralAdminCostColumnIndex, 0.0)
 
 
 def build_step0002_variant_path(pszOutputStep0002Path: str, pszSuffix: str) -> str:
@@ -559,33 +936,55 @@ def generate_step0002_variant_from_step0001(
     pszSuffix: str,
     objDeductionCodes: Optional[List[str]],
     bUseHamiltonRounding: bool,
+    objStep0001Table: Optional[PlTable] = None,
+    objAllocation: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> None:
+    # objAllocation: calculate_allocations で計算済みの (配賦先の行番号, 配賦額)
     pszVariantPath: str = build_step0002_variant_path(pszOutputStep0002Path, pszSuffix)
-    objRows: List[List[str]] = load_tsv_rows(pszOutputStep0001Path)
-    zero_sell_general_admin_cost_for_step0002_targets(objRows)
+    if objStep0001Table is None:
+        objStep0001Table = PlTable(load_tsv_rows(pszOutputStep0001Path))
+    write_tsv_rows(
+        pszVariantPath,
+        build_step0002_variant_rows(objStep0001Table, objDeductionCodes, bUseHamiltonRounding, objAllocation),
+    )
+
+
+def build_step0002_variant_rows(
+    objStep0001Table: PlTable,
+    objDeductionCodes: Optional[List[str]],
+    bUseHamiltonRounding: bool,
+    objAllocation: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> List[List[str]]:
+    objTable: PlTable = objStep0001Table.copy()
+    zero_sell_general_admin_cost_for_step0002_targets(objTable)
 
     (
         iSellGeneralAdminCostColumnIndex,
         iAllocationColumnIndex,
         iManhourColumnIndex,
-    ) = resolve_step0002_column_indices(objRows)
+    ) = resolve_step0002_column_indices(objTable)
 
     if iSellGeneralAdminCostColumnIndex >= 0 and iAllocationColumnIndex >= 0 and iManhourColumnIndex >= 0:
-        calculate_allocation(
-            objRows,
-            iSellGeneralAdminCostColumnIndex,
-            iAllocationColumnIndex,
-            iManhourColumnIndex,
-            objDeductionCodes,
-            bUseHamiltonRounding,
-        )
+        if objAllocation is not None:
+            write_allocation_column(objTable, iAllocationColumnIndex, objAllocation[0], objAllocation[1])
+        else:
+            calculate_allocation(
+                objTable,
+                iSellGeneralAdminCostColumnIndex,
+                iAllocationColumnIndex,
+                iManhourColumnIndex,
+                objDeductionCodes,
+                bUseHamiltonRounding,
+            )
 
-    write_tsv_rows(pszVariantPath, objRows)
+    return objTable.materialize()
 
 
 def generate_step0002_old_output(
     pszOutputStep0001Path: str,
     pszOutputStep0002Path: str,
+    objStep0001Table: Optional[PlTable] = None,
+    objAllocation: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> None:
     generate_step0002_variant_from_step0001(
         pszOutputStep0001Path,
@@ -593,12 +992,16 @@ def generate_step0002_old_output(
         "_old",
         ["C001", "C002", "C003", "C004", "C005"],
         False,
+        objStep0001Table,
+        objAllocation,
     )
 
 
 def generate_step0002_total_output(
     pszOutputStep0001Path: str,
     pszOutputStep0002Path: str,
+    objStep0001Table: Optional[PlTable] = None,
+    objAllocation: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> None:
     generate_step0002_variant_from_step0001(
         pszOutputStep0001Path,
@@ -606,12 +1009,16 @@ def generate_step0002_total_output(
         "_合計",
         [],
         True,
+        objStep0001Table,
+        objAllocation,
     )
 
 
 def generate_step0002_msd3_09_output(
     pszOutputStep0001Path: str,
     pszOutputStep0002Path: str,
+    objStep0001Table: Optional[PlTable] = None,
+    objAllocation: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> None:
     generate_step0002_variant_from_step0001(
         pszOutputStep0001Path,
@@ -619,12 +1026,16 @@ def generate_step0002_msd3_09_output(
         "_MSD3_09",
         ["C001", "C002", "C003", "C004", "C005"],
         True,
+        objStep0001Table,
+        objAllocation,
     )
 
 
 def generate_step0002_msd3_12_output(
     pszOutputStep0001Path: str,
     pszOutputStep0002Path: str,
+    objStep0001Table: Optional[PlTable] = None,
+    objAllocation: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> None:
     generate_step0002_variant_from_step0001(
         pszOutputStep0001Path,
@@ -632,11 +1043,34 @@ def generate_step0002_msd3_12_output(
         "_MSD3_12",
         ["C001", "C002", "C003", "C004", "C005", "C006", "C007"],
         True,
+        objStep0001Table,
+        objAllocation,
     )
 
 
+def recalculate_operating_profit_row(
+    objTable: PlTable,
+    iRowIndex: int,
+    iGrossProfitColumnIndex: int,
+    iOperatingProfitColumnIndex: int,
+    objExcludeSet: set[int],
+) -> None:
+    iRowLength: int = objTable.row_length(iRowIndex)
+    if iGrossProfitColumnIndex >= iRowLength:
+        return
+
+    fGrossProfit: float = objTable.get_number(iRowIndex, iGrossProfitColumnIndex)
+    fDeductionSum: float = 0.0
+    for iColumnIndex in range(iGrossProfitColumnIndex + 1, min(iOperatingProfitColumnIndex, iRowLength)):
+        if iColumnIndex in objExcludeSet:
+            continue
+        fDeductionSum += objTable.get_number(iRowIndex, iColumnIndex)
+
+    objTable.set_number(iRowIndex, iOperatingProfitColumnIndex, fGrossProfit - fDeductionSum)
+
+
 def recalculate_operating_profit(
-    objRows: List[List[str]],
+    objTable: PlTable,
     iGrossProfitColumnIndex: int,
     iOperatingProfitColumnIndex: int,
     objExcludeColumns: Optional[List[int]] = None,
@@ -647,87 +1081,115 @@ def recalculate_operating_profit(
         return
     objExcludeSet = set(objExcludeColumns or [])
 
-    for iRowIndex in range(1, len(objRows)):
-        objRow: List[str] = objRows[iRowIndex]
-        if iGrossProfitColumnIndex >= len(objRow):
-            continue
+    for iRowIndex in range(1, objTable.row_count()):
+        recalculate_operating_profit_row(
+            objTable,
+            iRowIndex,
+            iGrossProfitColumnIndex,
+            iOperatingProfitColumnIndex,
+            objExcludeSet,
+        )
 
-        fGrossProfit: float = parse_number(objRow[iGrossProfitColumnIndex])
-        fDeductionSum: float = 0.0
-        for iColumnIndex in range(iGrossProfitColumnIndex + 1, iOperatingProfitColumnIndex):
-            if iColumnIndex in objExcludeSet:
-                continue
-            if iColumnIndex >= len(objRow):
-                continue
-            fDeductionSum += parse_number(objRow[iColumnIndex])
 
-        fOperatingProfit: float = fGrossProfit - fDeductionSum
-        if iOperatingProfitColumnIndex >= len(objRow):
-            iAppendCount: int = iOperatingProfitColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iOperatingProfitColumnIndex] = format_number(fOperatingProfit)
-        objRows[iRowIndex] = objRow
+def recalculate_ordinary_profit_row(
+    objTable: PlTable,
+    iRowIndex: int,
+    iOperatingProfitColumnIndex: int,
+    iNonOperatingIncomeColumnIndex: int,
+    iNonOperatingExpenseColumnIndex: int,
+    iOrdinaryProfitColumnIndex: int,
+) -> None:
+    iRowLength: int = objTable.row_length(iRowIndex)
+    if iOperatingProfitColumnIndex >= iRowLength:
+        return
 
+    fNonOperatingIncome: float = 0.0
+    for iColumnIndex in range(iOperatingProfitColumnIndex + 1, min(iNonOperatingIncomeColumnIndex, iRowLength)):
+        fNonOperatingIncome += objTable.get_number(iRowIndex, iColumnIndex)
 
-def recalculate_ordinary_profit(
-    objRows: List[List[str]],
+    fNonOperatingExpense: float = 0.0
+    for iColumnIndex in range(iNonOperatingIncomeColumnIndex + 1, min(iNonOperatingExpenseColumnIndex, iRowLength)):
+        fNonOperatingExpense += objTable.get_number(iRowIndex, iColumnIndex)
+
+    objTable.set_number(iRowIndex, iNonOperatingIncomeColumnIndex, fNonOperatingIncome)
+    objTable.set_number(iRowIndex, iNonOperatingExpenseColumnIndex, fNonOperatingExpense)
+
+    fOperatingProfit: float = objTable.get_number(iRowIndex, iOperatingProfitColumnIndex)
+    fOrdinaryProfit: float = fOperatingProfit + fNonOperatingIncome - fNonOperatingExpense
+    objTable.set_number(iRowIndex, iOrdinaryProfitColumnIndex, fOrdinaryProfit)
+
+
+def is_valid_ordinary_profit_columns(
     iOperatingProfitColumnIndex: int,
     iNonOperatingIncomeColumnIndex: int,
     iNonOperatingExpenseColumnIndex: int,
     iOrdinaryProfitColumnIndex: int,
-) -> None:
+) -> bool:
     if (
         iOperatingProfitColumnIndex < 0
         or iNonOperatingIncomeColumnIndex < 0
         or iNonOperatingExpenseColumnIndex < 0
         or iOrdinaryProfitColumnIndex < 0
     ):
-        return
-    if iOperatingProfitColumnIndex >= iNonOperatingIncomeColumnIndex:
-        return
-    if iNonOperatingIncomeColumnIndex >= iNonOperatingExpenseColumnIndex:
-        return
-    if iNonOperatingExpenseColumnIndex >= iOrdinaryProfitColumnIndex:
+        return False
+    return (
+        iOperatingProfitColumnIndex < iNonOperatingIncomeColumnIndex < iNonOperatingExpenseColumnIndex
+        < iOrdinaryProfitColumnIndex
+    )
+
+
+def recalculate_ordinary_profit(
+    objTable: PlTable,
+    iOperatingProfitColumnIndex: int,
+    iNonOperatingIncomeColumnIndex: int,
+    iNonOperatingExpenseColumnIndex: int,
+    iOrdinaryProfitColumnIndex: int,
+) -> None:
+    if not is_valid_ordinary_profit_columns(
+        iOperatingProfitColumnIndex,
+        iNonOperatingIncomeColumnIndex,
+        iNonOperatingExpenseColumnIndex,
+        iOrdinaryProfitColumnIndex,
+    ):
         return
 
-    for iRowIndex in range(1, len(objRows)):
-        objRow: List[str] = objRows[iRowIndex]
-        if iOperatingProfitColumnIndex >= len(objRow):
-            continue
+    for iRowIndex in range(1, objTable.row_count()):
+        recalculate_ordinary_profit_row(
+            objTable,
+            iRowIndex,
+            iOperatingProfitColumnIndex,
+            iNonOperatingIncomeColumnIndex,
+            iNonOperatingExpenseColumnIndex,
+            iOrdinaryProfitColumnIndex,
+        )
 
-        fNonOperatingIncome: float = 0.0
-        for iColumnIndex in range(iOperatingProfitColumnIndex + 1, iNonOperatingIncomeColumnIndex):
-            if iColumnIndex >= len(objRow):
-                continue
-            fNonOperatingIncome += parse_number(objRow[iColumnIndex])
 
-        fNonOperatingExpense: float = 0.0
-        for iColumnIndex in range(iNonOperatingIncomeColumnIndex + 1, iNonOperatingExpenseColumnIndex):
-            if iColumnIndex >= len(objRow):
-                continue
-            fNonOperatingExpense += parse_number(objRow[iColumnIndex])
-
-        if iNonOperatingIncomeColumnIndex >= len(objRow):
-            iAppendCount = iNonOperatingIncomeColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iNonOperatingIncomeColumnIndex] = format_number(fNonOperatingIncome)
-
-        if iNonOperatingExpenseColumnIndex >= len(objRow):
-            iAppendCount = iNonOperatingExpenseColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iNonOperatingExpenseColumnIndex] = format_number(fNonOperatingExpense)
-
-        fOperatingProfit: float = parse_number(objRow[iOperatingProfitColumnIndex])
-        fOrdinaryProfit: float = fOperatingProfit + fNonOperatingIncome - fNonOperatingExpense
-        if iOrdinaryProfitColumnIndex >= len(objRow):
-            iAppendCount = iOrdinaryProfitColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iOrdinaryProfitColumnIndex] = format_number(fOrdinaryProfit)
-        objRows[iRowIndex] = objRow
+def recalculate_pre_tax_profit_row(
+    objTable: PlTable,
+    iRowIndex: int,
+    iOrdinaryProfitColumnIndex: int,
+    iExtraordinaryIncomeColumnIndex: int,
+    iExtraordinaryLossColumnIndex: int,
+    iPreTaxProfitColumnIndex: int,
+) -> None:
+    iRowLength: int = objTable.row_length(iRowIndex)
+    if iOrdinaryProfitColumnIndex >= iRowLength:
+        return
+
+    fOrdinaryProfit: float = objTable.get_number(iRowIndex, iOrdinaryProfitColumnIndex)
+    fExtraordinaryIncome: float = 0.0
+    if iExtraordinaryIncomeColumnIndex < iRowLength:
+        fExtraordinaryIncome = objTable.get_number(iRowIndex, iExtraordinaryIncomeColumnIndex)
+    fExtraordinaryLoss: float = 0.0
+    if iExtraordinaryLossColumnIndex < iRowLength:
+        fExtraordinaryLoss = objTable.get_number(iRowIndex, iExtraordinaryLossColumnIndex)
+
+    fPreTaxProfit: float = fOrdinaryProfit + fExtraordinaryIncome - fExtraordinaryLoss
+    objTable.set_number(iRowIndex, iPreTaxProfitColumnIndex, fPreTaxProfit)
 
 
 def recalculate_pre_tax_profit(
-    objRows: List[List[str]],
+    objTable: PlTable,
     iOrdinaryProfitColumnIndex: int,
     iExtraordinaryIncomeColumnIndex: int,
     iExtraordinaryLossColumnIndex: int,
@@ -741,29 +1203,40 @@ def recalculate_pre_tax_profit(
     ):
         return
 
-    for iRowIndex in range(1, len(objRows)):
-        objRow: List[str] = objRows[iRowIndex]
-        if iOrdinaryProfitColumnIndex >= len(objRow):
-            continue
+    for iRowIndex in range(1, objTable.row_count()):
+        recalculate_pre_tax_profit_row(
+            objTable,
+            iRowIndex,
+            iOrdinaryProfitColumnIndex,
+            iExtraordinaryIncomeColumnIndex,
+            iExtraordinaryLossColumnIndex,
+            iPreTaxProfitColumnIndex,
+        )
 
-        fOrdinaryProfit: float = parse_number(objRow[iOrdinaryProfitColumnIndex])
-        fExtraordinaryIncome: float = 0.0
-        if iExtraordinaryIncomeColumnIndex < len(objRow):
-            fExtraordinaryIncome = parse_number(objRow[iExtraordinaryIncomeColumnIndex])
-        fExtraordinaryLoss: float = 0.0
-        if iExtraordinaryLossColumnIndex < len(objRow):
-            fExtraordinaryLoss = parse_number(objRow[iExtraordinaryLossColumnIndex])
-
-        fPreTaxProfit: float = fOrdinaryProfit + fExtraordinaryIncome - fExtraordinaryLoss
-        if iPreTaxProfitColumnIndex >= len(objRow):
-            iAppendCount: int = iPreTaxProfitColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iPreTaxProfitColumnIndex] = format_number(fPreTaxProfit)
-        objRows[iRowIndex] = objRow
+
+def recalculate_net_profit_row(
+    objTable: PlTable,
+    iRowIndex: int,
+    iCorporateTaxColumnIndex: int,
+    iCorporateTaxTotalColumnIndex: int,
+    iPreTaxProfitColumnIndex: int,
+    iNetProfitColumnIndex: int,
+) -> None:
+    if iCorporateTaxColumnIndex >= objTable.row_length(iRowIndex):
+        return
+
+    fCorporateTax: float = objTable.get_number(iRowIndex, iCorporateTaxColumnIndex)
+    objTable.set_number(iRowIndex, iCorporateTaxTotalColumnIndex, fCorporateTax)
+
+    fPreTaxProfit: float = 0.0
+    if iPreTaxProfitColumnIndex < objTable.row_length(iRowIndex):
+        fPreTaxProfit = objTable.get_number(iRowIndex, iPreTaxProfitColumnIndex)
+
+    objTable.set_number(iRowIndex, iNetProfitColumnIndex, fPreTaxProfit - fCorporateTax)
 
 
 def recalculate_net_profit(
-    objRows: List[List[str]],
+    objTable: PlTable,
     iCorporateTaxColumnIndex: int,
     iCorporateTaxTotalColumnIndex: int,
     iPreTaxProfitColumnIndex: int,
@@ -777,27 +1250,148 @@ def recalculate_net_profit(
     ):
         return
 
-    for iRowIndex in range(1, len(objRows)):
-        objRow: List[str] = objRows[iRowIndex]
-        if iCorporateTaxColumnIndex >= len(objRow):
+    for iRowIndex in range(1, objTable.row_count()):
+        recalculate_net_profit_row(
+            objTable,
+            iRowIndex,
+            iCorporateTaxColumnIndex,
+            iCorporateTaxTotalColumnIndex,
+            iPreTaxProfitColumnIndex,
+            iNetProfitColumnIndex,
+        )
+
+
+def recalculate_profit_cascade(
+    objTable: PlTable,
+    objExcludeColumns: Optional[List[int]],
+    bRecalculateNetProfit: bool,
+    objSnapshotSteps: Optional[List[bool]] = None,
+) -> List[Optional[List[List[str]]]]:
+    # 営業利益 → 経常利益 → 税引前当期純利益 (→ 当期純利益) を 1 行ずつまとめて再計算する。
+    # 各段は同じ行しか参照しないため、段ごとに全行を走査した場合と結果は同じになる。
+    # objSnapshotSteps で True を指定した段は、その段の終了時点の表 (文字列) を戻り値に入れる。
+    if objTable.row_count() == 0:
+        return []
+
+    # 見出しが重複している場合は、各段とも最後の列を使う
+
+    iGrossProfitColumnIndex: int = objTable.find_last_column("売上総利益")
+    iOperatingProfitColumnIndex: int = objTable.find_last_column("営業利益")
+    iNonOperatingIncomeColumnIndex: int = objTable.find_last_column("営業外収益")
+    iNonOperatingExpenseColumnIndex: int = objTable.find_last_column("営業外費用")
+    iOrdinaryProfitColumnIndex: int = objTable.find_last_column("経常利益")
+    iExtraordinaryIncomeColumnIndex: int = objTable.find_last_column("特別利益")
+    iExtraordinaryLossColumnIndex: int = objTable.find_last_column("特別損失")
+    iPreTaxProfitColumnIndex: int = objTable.find_last_column("税引前当期純利益")
+    iCorporateTaxColumnIndex: int = objTable.find_last_column("法人税、住民税及び事業税")
+    iCorporateTaxTotalColumnIndex: int = objTable.find_last_column("法人税等")
+    iNetProfitColumnIndex: int = objTable.find_last_column("当期純利益")
+
+    bOperatingProfit: bool = (
+        iGrossProfitColumnIndex >= 0 and iOperatingProfitColumnIndex > iGrossProfitColumnIndex
+    )
+    bOrdinaryProfit: bool = is_valid_ordinary_profit_columns(
+        iOperatingProfitColumnIndex,
+        iNonOperatingIncomeColumnIndex,
+        iNonOperatingExpenseColumnIndex,
+        iOrdinaryProfitColumnIndex,
+    )
+    bPreTaxProfit: bool = (
+        iOrdinaryProfitColumnIndex >= 0
+        and iExtraordinaryIncomeColumnIndex >= 0
+        and iExtraordinaryLossColumnIndex >= 0
+        and iPreTaxProfitColumnIndex >= 0
+    )
+    bNetProfit: bool = (
+        bRecalculateNetProfit
+        and iCorporateTaxColumnIndex >= 0
+        and iCorporateTaxTotalColumnIndex >= 0
+        and iPreTaxProfitColumnIndex >= 0
+        and iNetProfitColumnIndex >= 0
+    )
+    objExcludeSet: set[int] = set(objExcludeColumns or [])
+
+    # 各段が書き換える列 (スナップショットの整形用)
+    objStepWrittenColumns: List[List[int]] = [
+        [iOperatingProfitColumnIndex] if bOperatingProfit else [],
+        [iNonOperatingIncomeColumnIndex, iNonOperatingExpenseColumnIndex, iOrdinaryProfitColumnIndex]
+        if bOrdinaryProfit
+        else [],
+        [iPreTaxProfitColumnIndex] if bPreTaxProfit else [],
+    ]
+    if bRecalculateNetProfit:
+        objStepWrittenColumns.append([iCorporateTaxTotalColumnIndex, iNetProfitColumnIndex] if bNetProfit else [])
+
+    objSnapshotRows: List[Optional[List[List[str]]]] = []
+    if objSnapshotSteps is not None:
+        objTable.materialize()
+        objSnapshotRows = [
+            [objTable.objRows[0]] if iStep < len(objSnapshotSteps) and objSnapshotSteps[iStep] else None
+            for iStep in range(len(objStepWrittenColumns))
+        ]
+
+    for iRowIndex in range(1, objTable.row_count()):
+        # 各段の終了時点の行の長さ (後段で列が追加されることがある)
+        objRowLengths: List[int] = []
+        if bOperatingProfit:
+            recalculate_operating_profit_row(
+                objTable,
+                iRowIndex,
+                iGrossProfitColumnIndex,
+                iOperatingProfitColumnIndex,
+                objExcludeSet,
+            )
+        objRowLengths.append(objTable.row_length(iRowIndex))
+        if bOrdinaryProfit:
+            recalculate_ordinary_profit_row(
+                objTable,
+                iRowIndex,
+                iOperatingProfitColumnIndex,
+                iNonOperatingIncomeColumnIndex,
+                iNonOperatingExpenseColumnIndex,
+                iOrdinaryProfitColumnIndex,
+            )
+        objRowLengths.append(objTable.row_length(iRowIndex))
+        if bPreTaxProfit:
+            recalculate_pre_tax_profit_row(
+                objTable,
+                iRowIndex,
+                iOrdinaryProfitColumnIndex,
+                iExtraordinaryIncomeColumnIndex,
+                iExtraordinaryLossColumnIndex,
+                iPreTaxProfitColumnIndex,
+            )
+        objRowLengths.append(objTable.row_length(iRowIndex))
+        if bNetProfit:
+            recalculate_net_profit_row(
+                objTable,
+                iRowIndex,
+                iCorporateTaxColumnIndex,
+                iCorporateTaxTotalColumnIndex,
+                iPreTaxProfitColumnIndex,
+                iNetProfitColumnIndex,
+            )
+        objRowLengths.append(objTable.row_length(iRowIndex))
+        if not objSnapshotRows:
             continue
 
-        fCorporateTax: float = parse_number(objRow[iCorporateTaxColumnIndex])
-        if iCorporateTaxTotalColumnIndex >= len(objRow):
-            iAppendCount: int = iCorporateTaxTotalColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iCorporateTaxTotalColumnIndex] = format_number(fCorporateTax)
-
-        fPreTaxProfit: float = 0.0
-        if iPreTaxProfitColumnIndex < len(objRow):
-            fPreTaxProfit = parse_number(objRow[iPreTaxProfitColumnIndex])
-
-        fNetProfit: float = fPreTaxProfit - fCorporateTax
-        if iNetProfitColumnIndex >= len(objRow):
-            iAppendCount = iNetProfitColumnIndex + 1 - len(objRow)
-            objRow.extend([""] * iAppendCount)
-        objRow[iNetProfitColumnIndex] = format_number(fNetProfit)
-        objRows[iRowIndex] = objRow
+        # 表の文字列は段の開始前の状態なので、その段までに書き換えた列だけを整形して重ねる
+        objRow: List[str] = objTable.objRows[iRowIndex]
+        objFormattedCells: Dict[int, str] = {}
+        for iStep, objWrittenColumns in enumerate(objStepWrittenColumns):
+            for iColumnIndex in objWrittenColumns:
+                fValue: Optional[float] = objTable.objDirtyColumns[iColumnIndex].get(iRowIndex)
+                if fValue is not None:
+                    objFormattedCells[iColumnIndex] = format_number(fValue)
+            objRowsForStep: Optional[List[List[str]]] = objSnapshotRows[iStep]
+            if objRowsForStep is None:
+                continue
+            objStepRow: List[str] = objRow[: objRowLengths[iStep]]
+            for iColumnIndex, pszText in objFormattedCells.items():
+                objStepRow[iColumnIndex] = pszText
+            objRowsForStep.append(objStepRow)
+
+    return objSnapshotRows
 
 
 def apply_step0006_second_row_totals(objRows: List[List[str]]) -> List[List[str]]:
@@ -836,11 +1430,16 @@ def apply_step0006_second_row_totals(objRows: List[List[str]]) -> List[List[str]
     return objOutputRows
 
 
-def allocate_company_sg_admin_cost(objRows: List[List[str]]) -> List[List[str]]:
-    if not objRows:
-        return objRows
+def allocate_company_sg_admin_cost(
+    objTable: PlTable,
+    objSegments: Optional[List[Tuple[int, int]]] = None,
+) -> None:
+    # objSegments: 複数月を積み上げた表での各月の行範囲 (省略時は表全体で 1 か月)
+    if objTable.row_count() == 0:
+        return
+    if objSegments is None:
+        objSegments = [(1, objTable.row_count())]
 
-    objHeader: List[str] = objRows[0]
     objCompanyColumns: List[str] = [
         "1Cカンパニー販管費",
         "2Cカンパニー販管費",
@@ -863,96 +1462,75 @@ def allocate_company_sg_admin_cost(objRows: List[List[str]]) -> List[List[str]]:
         "C005_事業開発カンパニー販管費",
     ]
 
-    objCompanyIndices: List[int] = [find_column_index(objHeader, pszName) for pszName in objCompanyColumns]
-    objManhourIndices: List[int] = [find_column_index(objHeader, pszName) for pszName in objCompanyManhourColumns]
-
-    objCompanyTotals: List[float] = [0.0] * len(objCompanyColumns)
-    for iRowIndex, objRow in enumerate(objRows):
-        if iRowIndex == 0:
-            continue
-        pszRowName: str = objRow[0] if objRow else ""
-        if pszRowName in objCompanyRows:
-            iCompany: int = objCompanyRows.index(pszRowName)
-            iCompanyColumn: int = objCompanyIndices[iCompany]
-            if 0 <= iCompanyColumn < len(objRow):
-                objCompanyTotals[iCompany] = parse_number(objRow[iCompanyColumn])
+    objCompanyIndices: List[int] = [objTable.find_column(pszName) for pszName in objCompanyColumns]
+    objManhourIndices: List[int] = [objTable.find_column(pszName) for pszName in objCompanyManhourColumns]
+    iRowCount: int = objTable.row_count()
+
+    objSegmentCompanyTotals: List[List[float]] = []
+    for iStartRowIndex, iEndRowIndex in objSegments:
+        objCompanyTotals: List[float] = [0.0] * len(objCompanyColumns)
+        for iRowIndex in range(iStartRowIndex, iEndRowIndex):
+            pszRowName: str = objTable.row_name(iRowIndex)
+            if pszRowName in objCompanyRows:
+                iCompany: int = objCompanyRows.index(pszRowName)
+                iCompanyColumn: int = objCompanyIndices[iCompany]
+                if 0 <= iCompanyColumn < objTable.row_length(iRowIndex):
+                    objCompanyTotals[iCompany] = objTable.get_number(iRowIndex, iCompanyColumn)
+        objSegmentCompanyTotals.append(objCompanyTotals)
 
     # zero initialize all company cost columns
-    objOutputRows: List[List[str]] = []
-    for iRowIndex, objRow in enumerate(objRows):
-        objNewRow: List[str] = list(objRow)
-        if iRowIndex > 0:
-            for iCompanyColumn in objCompanyIndices:
-                if iCompanyColumn >= 0:
-                    if len(objNewRow) <= iCompanyColumn:
-                        objNewRow.extend([""] * (iCompanyColumn + 1 - len(objNewRow)))
-                    objNewRow[iCompanyColumn] = "0"
-        objOutputRows.append(objNewRow)
-
-    # allocate per company
-    for iCompany, pszCompanyColumn in enumerate(objCompanyColumns):
-        iCompanyColumn: int = objCompanyIndices[iCompany]
+    objRowIndices: np.ndarray = np.arange(1, iRowCount, dtype=np.int64)
+    for iCompanyColumn in objCompanyIndices:
+        if iCompanyColumn >= 0:
+            objTable.set_numbers(objRowIndices, iCompanyColumn, np.zeros(objRowIndices.size))
+
+    # allocate per month and company (全月・全カンパニー分をまとめて計算する)
+    objRowLengths: np.ndarray = objTable.row_length_vector()[1:]
+    objPoolCompanies: List[int] = []
+    objPoolAmounts: List[float] = []
+    objPoolSeconds: List[np.ndarray] = []
+    objPoolTotalSeconds: List[float] = []
+    for iCompany in range(len(objCompanyColumns)):
+        iCompanyColumn = objCompanyIndices[iCompany]
         iManhourColumn: int = objManhourIndices[iCompany]
         if iCompanyColumn < 0 or iManhourColumn < 0:
             continue
 
-        fCompanyTotal: float = objCompanyTotals[iCompany]
-        fTotalSeconds: float = 0.0
-        for iRowIndex, objRow in enumerate(objOutputRows):
-            if iRowIndex == 0 or iManhourColumn >= len(objRow):
-                continue
-            fSeconds: float = parse_time_to_seconds(objRow[iManhourColumn])
-            if fSeconds > 0.0:
-                fTotalSeconds += fSeconds
-
-        if fTotalSeconds <= 0.0:
-            continue
-
-        objTargetRows: List[int] = []
-        objTargetSeconds: List[float] = []
-        for iRowIndex, objRow in enumerate(objOutputRows):
-            if iRowIndex == 0 or iManhourColumn >= len(objRow) or iCompanyColumn >= len(objRow):
+        objAllSeconds: np.ndarray = objTable.get_seconds_vector(iManhourColumn)[1:]
+        objAllSeconds = np.where((objRowLengths > iManhourColumn) & (objAllSeconds > 0), objAllSeconds, 0)
+        objTargetSeconds: np.ndarray = np.where(objRowLengths > iCompanyColumn, objAllSeconds, 0)
+        for iSegment, (iStartRowIndex, iEndRowIndex) in enumerate(objSegments):
+            fTotalSeconds: float = float(objAllSeconds[iStartRowIndex - 1 : iEndRowIndex - 1].sum())
+            if fTotalSeconds <= 0.0:
                 continue
-            fSeconds = parse_time_to_seconds(objRow[iManhourColumn])
-            if fSeconds <= 0.0:
+            objSeconds: np.ndarray = np.zeros(objRowIndices.size, dtype=np.int64)
+            objSeconds[iStartRowIndex - 1 : iEndRowIndex - 1] = objTargetSeconds[iStartRowIndex - 1 : iEndRowIndex - 1]
+            if not objSeconds.any():
                 continue
-            objTargetRows.append(iRowIndex)
-            objTargetSeconds.append(fSeconds)
 
-        if not objTargetRows:
-            continue
-
-        iTargetTotal: int = int(round(fCompanyTotal))
-        objRawValues: List[float] = [
-            fCompanyTotal * fSeconds / fTotalSeconds for fSeconds in objTargetSeconds
-        ]
-        objBaseValues: List[int] = [int(fRawValue // 1) for fRawValue in objRawValues]
-        iRemain: int = iTargetTotal - sum(objBaseValues)
-
-        objRankIndices: List[int] = list(range(len(objTargetRows)))
-        objRankIndices.sort(
-            key=lambda iIndex: (
-                objRawValues[iIndex] - objBaseValues[iIndex],
-                objTargetSeconds[iIndex],
-                -objTargetRows[iIndex],
-            ),
-            reverse=True,
-        )
-
-        if iRemain > 0:
-            for iIndex in objRankIndices[:iRemain]:
-                objBaseValues[iIndex] += 1
-        elif iRemain < 0:
-            objRankIndicesAsc: List[int] = list(reversed(objRankIndices))
-            for iIndex in objRankIndicesAsc[:(-iRemain)]:
-                objBaseValues[iIndex] -= 1
+            objPoolCompanies.append(iCompany)
+            objPoolAmounts.append(objSegmentCompanyTotals[iSegment][iCompany])
+            objPoolSeconds.append(objSeconds)
+            objPoolTotalSeconds.append(fTotalSeconds)
 
-        for iTargetIndex, iRowIndex in enumerate(objTargetRows):
-            objRow = objOutputRows[iRowIndex]
-            objRow[iCompanyColumn] = format_number(float(objBaseValues[iTargetIndex]))
-            objOutputRows[iRowIndex] = objRow
+    if not objPoolCompanies:
+        return
 
-    return objOutputRows
+    objAllocations: np.ndarray = allocate_by_manhour_seconds(
+        np.array(objPoolAmounts, dtype=np.float64),
+        np.vstack(objPoolSeconds),
+        objRowIndices,
+        np.array(objPoolTotalSeconds, dtype=np.float64),
+        [True] * len(objPoolCompanies),
+    )
+    for iPool, iCompany in enumerate(objPoolCompanies):
+        objTargetMask: np.ndarray = objPoolSeconds[iPool] > 0
+        write_allocation_column(
+            objTable,
+            objCompanyIndices[iCompany],
+            objRowIndices[objTargetMask],
+            objAllocations[iPool][objTargetMask],
+        )
 
 
 def _build_pj_summary_group_total_paths() -> Tuple[str, str]:
@@ -992,59 +1570,212 @@ def _build_pj_summary_group_sheet_name(
     return f"{objStart[0]}年{pszSummaryStartMonth}月-{objEnd[0]}年{pszSummaryEndMonth}月"
 
 
-def insert_step0006_rows_into_group_summary_excel(
-    objRows: List[List[str]],
-    objStart: Tuple[int, int],
-    objEnd: Tuple[int, int],
-) -> None:
-    pszTemplatePath, pszOutputPath = _build_pj_summary_group_total_paths()
-    pszSheetName: str = _build_pj_summary_group_sheet_name(objStart, objEnd)
-    if not os.path.isfile(pszTemplatePath):
-        return
-    if os.path.isfile(pszOutputPath):
-        objWorkbook = load_workbook(pszOutputPath)
-    else:
-        objWorkbook = load_workbook(pszTemplatePath)
-    if pszSheetName not in objWorkbook.sheetnames:
-        pszSourceSheetName: str = "Sheet1" if objStart[1] == 4 else "Sheet2"
-        if pszSourceSheetName in objWorkbook.sheetnames:
-            objWorkbook[pszSourceSheetName].title = pszSheetName
-    if pszSheetName not in objWorkbook.sheetnames:
-        return
-    objSheet = objWorkbook[pszSheetName]
+# TEMPLATE_*.xlsx の解析結果 (pickle 化したブック)。キーはパス、値は (ファイルの更新時刻・サイズ, 内容)。
+# 複製できなかったテンプレートは内容を None とし、毎回ファイルから読み込む。
+TEMPLATE_WORKBOOK_CACHE: Dict[str, Tuple[Tuple[int, int], Optional[bytes]]] = {}
 
-    for iRow, objRow in enumerate(objRows, start=1):
-        for iCol, pszValue in enumerate(objRow, start=1):
-            objCellValue = parse_tsv_value_for_excel(pszValue)
-            objSheet.cell(row=iRow, column=iCol, value=objCellValue)
 
-    os.makedirs(os.path.dirname(pszOutputPath), exist_ok=True)
-    objWorkbook.save(pszOutputPath)
-    if EXECUTION_ROOT_DIRECTORY:
-        pszGroupProfitDirectory = os.path.join(
-            EXECUTION_ROOT_DIRECTORY,
-            "グループ別損益",
-        )
-        os.makedirs(pszGroupProfitDirectory, exist_ok=True)
-        shutil.copy2(
-            pszOutputPath,
-            os.path.join(pszGroupProfitDirectory, os.path.basename(pszOutputPath)),
-        )
+def load_template_workbook(pszTemplatePath: str):
+    # テンプレートの XML は 1 プロセスで 1 回だけ解析し、以降は pickle から独立した複製を作って返す
+    pszKey: str = os.path.normcase(os.path.abspath(pszTemplatePath))
+    objStat = os.stat(pszTemplatePath)
+    objSignature: Tuple[int, int] = (objStat.st_mtime_ns, objStat.st_size)
+    objCached = TEMPLATE_WORKBOOK_CACHE.get(pszKey)
+    if objCached is not None and objCached[0] == objSignature:
+        if objCached[1] is None:
+            return load_workbook(pszTemplatePath)
+        return pickle.loads(objCached[1])
+
+    objWorkbook = load_workbook(pszTemplatePath)
+    try:
+        objPickled: Optional[bytes] = pickle.dumps(objWorkbook, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        objPickled = None
+    TEMPLATE_WORKBOOK_CACHE[pszKey] = (objSignature, objPickled)
+    return objWorkbook
+
+
+class ExcelWorkbookSession:
+    # 同じ Excel を期間ごとに何度も更新する場合に、読み込み・保存・コピーをそれぞれ 1 回にまとめる
+    def __init__(self) -> None:
+        self.objWorkbooks: Dict[str, object] = {}
+        self.objCopyFolderNames: Dict[str, Optional[str]] = {}
+
+    def open_workbook(self, pszTemplatePath: str, pszOutputPath: str):
+        objWorkbook = self.objWorkbooks.get(pszOutputPath)
+        if objWorkbook is None:
+            if os.path.isfile(pszOutputPath):
+                objWorkbook = load_workbook(pszOutputPath)
+            else:
+                objWorkbook = load_template_workbook(pszTemplatePath)
+            self.objWorkbooks[pszOutputPath] = objWorkbook
+        return objWorkbook
+
+    def mark_modified(self, pszOutputPath: str, pszCopyFolderName: Optional[str]) -> None:
+        # pszCopyFolderName: 保存後に EXECUTION_ROOT_DIRECTORY 配下へコピーするフォルダ名
+        self.objCopyFolderNames[pszOutputPath] = pszCopyFolderName
+
+    def save(self) -> None:
+        for pszOutputPath, pszCopyFolderName in self.objCopyFolderNames.items():
+            os.makedirs(os.path.dirname(pszOutputPath), exist_ok=True)
+            self.objWorkbooks[pszOutputPath].save(pszOutputPath)
+            record_created_file(pszOutputPath)
+            if EXECUTION_ROOT_DIRECTORY and pszCopyFolderName:
+                pszCopyDirectory: str = os.path.join(EXECUTION_ROOT_DIRECTORY, pszCopyFolderName)
+                os.makedirs(pszCopyDirectory, exist_ok=True)
+                copy_output_file(
+                    pszOutputPath,
+                    os.path.join(pszCopyDirectory, os.path.basename(pszOutputPath)),
+                )
+        self.objWorkbooks.clear()
+        self.objCopyFolderNames.clear()
+
+
+class ExcelExportJob:
+    # Excel 出力 1 件分 (objFunction(*objArguments) の呼び出し)。
+    # objInputTables: プロセスプールに渡す場合に、登録時点で読み込んだ入力TSVの表
+    def __init__(self, objFunction, objArguments: Tuple[object, ...]) -> None:
+        self.objFunction = objFunction
+        self.objArguments: Tuple[object, ...] = objArguments
+        self.objInputTables: Dict[str, List[List[str]]] = {}
+        self.objResult: Optional[object] = None
+
+
+def run_excel_export_job(
+    objJob: ExcelExportJob,
+    pszExecutionRootDirectory: Optional[str],
+    bRecordOutputs: bool,
+) -> Tuple[Optional[object], List[str]]:
+    # プロセスプールのワーカー側で実行する。
+    # 入力TSVは登録時点の表から読み、コピー先の実行フォルダは親プロセスと同じものを使う。
+    # 作成したファイルは親プロセスのマニフェストへ記録するために結果と一緒に返す。
+    global EXECUTION_ROOT_DIRECTORY
+    global DEFERRED_TSV_DIRECTORY
+    EXECUTION_ROOT_DIRECTORY = pszExecutionRootDirectory
+    DEFERRED_TSV_DIRECTORY = None
+    DEFERRED_TSV_PATTERNS.clear()
+    DEFERRED_TSV_ARTIFACTS.clear()
+    DEFERRED_TSV_ARTIFACTS.update(objJob.objInputTables)
+    if bRecordOutputs:
+        begin_run_output_manifest()
+    try:
+        objResult: Optional[object] = objJob.objFunction(*objJob.objArguments)
+    finally:
+        DEFERRED_TSV_ARTIFACTS.clear()
+    return objResult, end_run_output_manifest()
+
+
+class ExcelExportStage:
+    # 互いに独立した Excel 出力を登録しておき、run でまとめてプロセスプールに渡す。
+    # iJobCount が 1 以下の場合は登録した時点でその場で実行する (従来どおりの順序)。
+    def __init__(self, iJobCount: int) -> None:
+        self.iJobCount: int = iJobCount
+        self.objJobs: List[ExcelExportJob] = []
+        self.objJobIndexByOutputKey: Dict[str, int] = {}
+
+    def queue(
+        self,
+        objFunction,
+        objArguments: Tuple[object, ...],
+        objInputPaths: List[str],
+        pszOutputKey: Optional[str] = None,
+    ) -> ExcelExportJob:
+        # objInputPaths: objFunction が読む入力TSV (実行までに上書き・移動されても登録時点の内容を使う)
+        # pszOutputKey: 出力ファイルを表すキー。同じキーの登録は後のものだけを実行する (先の出力は上書きされるため)
+        objJob: ExcelExportJob = ExcelExportJob(objFunction, objArguments)
+        if self.iJobCount <= 1:
+            objJob.objResult = objFunction(*objArguments)
+            return objJob
+        for pszInputPath in objInputPaths:
+            if tsv_file_exists(pszInputPath):
+                objJob.objInputTables[get_tsv_rows_cache_key(pszInputPath)] = read_tsv_rows(pszInputPath)
+        if pszOutputKey is not None and pszOutputKey in self.objJobIndexByOutputKey:
+            self.objJobs[self.objJobIndexByOutputKey[pszOutputKey]] = objJob
+            return objJob
+        if pszOutputKey is not None:
+            self.objJobIndexByOutputKey[pszOutputKey] = len(self.objJobs)
+        self.objJobs.append(objJob)
+        return objJob
+
+    def run(self) -> None:
+        objJobs: List[ExcelExportJob] = self.objJobs
+        self.objJobs = []
+        self.objJobIndexByOutputKey.clear()
+        if not objJobs:
+            return
+        with ProcessPoolExecutor(max_workers=min(self.iJobCount, len(objJobs))) as objExecutor:
+            objFutures = [
+                objExecutor.submit(
+                    run_excel_export_job,
+                    objJob,
+                    EXECUTION_ROOT_DIRECTORY,
+                    RUN_OUTPUT_MANIFEST is not None,
+                )
+                for objJob in objJobs
+            ]
+            for objJob, objFuture in zip(objJobs, objFutures):
+                objCreatedPaths: List[str]
+                objJob.objResult, objCreatedPaths = objFuture.result()
+                for pszCreatedPath in objCreatedPaths:
+                    record_created_file(pszCreatedPath)
 
 
-def insert_step0006_rows_into_company_summary_excel(
+# create_cumulative_reports の実行中に登録された Excel 出力 (create_pj_summary などの奥から登録するため)
+EXCEL_EXPORT_STAGE: Optional[ExcelExportStage] = None
+
+
+def begin_excel_export_stage(iJobCount: int) -> ExcelExportStage:
+    global EXCEL_EXPORT_STAGE
+    EXCEL_EXPORT_STAGE = ExcelExportStage(iJobCount)
+    return EXCEL_EXPORT_STAGE
+
+
+def end_excel_export_stage() -> None:
+    global EXCEL_EXPORT_STAGE
+    EXCEL_EXPORT_STAGE = None
+
+
+def queue_excel_export(
+    objFunction,
+    objArguments: Tuple[object, ...],
+    objInputPaths: List[str],
+    pszOutputKey: Optional[str] = None,
+) -> ExcelExportJob:
+    # 実行中のステージがなければその場で実行する
+    objStage: ExcelExportStage = EXCEL_EXPORT_STAGE or ExcelExportStage(1)
+    return objStage.queue(objFunction, objArguments, objInputPaths, pszOutputKey)
+
+
+# create_cumulative_reports の実行中は PJサマリの合計Excelをここにまとめ、最後に 1 回だけ保存する
+PJ_SUMMARY_TOTAL_WORKBOOK_SESSION: Optional[ExcelWorkbookSession] = None
+
+
+def begin_pj_summary_total_workbook_session() -> None:
+    global PJ_SUMMARY_TOTAL_WORKBOOK_SESSION
+    PJ_SUMMARY_TOTAL_WORKBOOK_SESSION = ExcelWorkbookSession()
+
+
+def end_pj_summary_total_workbook_session() -> None:
+    global PJ_SUMMARY_TOTAL_WORKBOOK_SESSION
+    objSession: Optional[ExcelWorkbookSession] = PJ_SUMMARY_TOTAL_WORKBOOK_SESSION
+    PJ_SUMMARY_TOTAL_WORKBOOK_SESSION = None
+    if objSession is not None:
+        objSession.save()
+
+
+def _insert_step0006_rows_into_summary_excel(
     objRows: List[List[str]],
     objStart: Tuple[int, int],
     objEnd: Tuple[int, int],
+    pszTemplatePath: str,
+    pszOutputPath: str,
+    pszCopyFolderName: str,
 ) -> None:
-    pszTemplatePath, pszOutputPath = _build_pj_summary_company_total_paths()
     pszSheetName: str = _build_pj_summary_group_sheet_name(objStart, objEnd)
     if not os.path.isfile(pszTemplatePath):
         return
-    if os.path.isfile(pszOutputPath):
-        objWorkbook = load_workbook(pszOutputPath)
-    else:
-        objWorkbook = load_workbook(pszTemplatePath)
+    objSession: ExcelWorkbookSession = PJ_SUMMARY_TOTAL_WORKBOOK_SESSION or ExcelWorkbookSession()
+    objWorkbook = objSession.open_workbook(pszTemplatePath, pszOutputPath)
     if pszSheetName not in objWorkbook.sheetnames:
         pszSourceSheetName: str = "Sheet1" if objStart[1] == 4 else "Sheet2"
         if pszSourceSheetName in objWorkbook.sheetnames:
@@ -1053,167 +1784,104 @@ def insert_step0006_rows_into_company_summary_excel(
         return
     objSheet = objWorkbook[pszSheetName]
 
-    for iRow, objRow in enumerate(objRows, start=1):
-        for iCol, pszValue in enumerate(objRow, start=1):
-            objCellValue = parse_tsv_value_for_excel(pszValue)
-            objSheet.cell(row=iRow, column=iCol, value=objCellValue)
-
-    os.makedirs(os.path.dirname(pszOutputPath), exist_ok=True)
-    objWorkbook.save(pszOutputPath)
-    if EXECUTION_ROOT_DIRECTORY:
-        pszCompanyProfitDirectory = os.path.join(
-            EXECUTION_ROOT_DIRECTORY,
-            "カンパニー別損益",
-        )
-        os.makedirs(pszCompanyProfitDirectory, exist_ok=True)
-        shutil.copy2(
-            pszOutputPath,
-            os.path.join(pszCompanyProfitDirectory, os.path.basename(pszOutputPath)),
-        )
+    write_tsv_rows_to_sheet(objSheet, objRows)
 
-def insert_company_sg_admin_cost_columns(objRows: List[List[str]]) -> List[List[str]]:
-    if not objRows:
-        return objRows
+    objSession.mark_modified(pszOutputPath, pszCopyFolderName)
+    if objSession is not PJ_SUMMARY_TOTAL_WORKBOOK_SESSION:
+        objSession.save()
 
-    objHeader: List[str] = objRows[0]
-    iAllocationIndex: int = find_column_index(objHeader, "配賦販管費")
-    iOperatingProfitIndex: int = find_column_index(objHeader, "営業利益")
-    if iAllocationIndex < 0 or iOperatingProfitIndex < 0:
-        return objRows
 
-    iInsertIndex: int = iAllocationIndex + 1
-    objNewColumns: List[str] = [
-        "1Cカンパニー販管費",
-        "2Cカンパニー販管費",
-        "3Cカンパニー販管費",
-        "4Cカンパニー販管費",
-        "事業開発カンパニー販管費",
-    ]
-    objNewHeader: List[str] = (
-        objHeader[:iInsertIndex] + objNewColumns + objHeader[iInsertIndex:]
+def insert_step0006_rows_into_group_summary_excel(
+    objRows: List[List[str]],
+    objStart: Tuple[int, int],
+    objEnd: Tuple[int, int],
+) -> None:
+    pszTemplatePath, pszOutputPath = _build_pj_summary_group_total_paths()
+    _insert_step0006_rows_into_summary_excel(
+        objRows,
+        objStart,
+        objEnd,
+        pszTemplatePath,
+        pszOutputPath,
+        "グループ別損益",
     )
 
-    iGrossProfitIndex: int = find_column_index(objNewHeader, "売上総利益")
-    iSellGeneralAdminTotalIndex: int = find_column_index(objNewHeader, "販売費及び一般管理費計")
-
-    objTargetMap: Dict[str, str] = {
-        "C001_1Cカンパニー販管費": "1Cカンパニー販管費",
-        "C002_2Cカンパニー販管費": "2Cカンパニー販管費",
-        "C003_3Cカンパニー販管費": "3Cカンパニー販管費",
-        "C004_4Cカンパニー販管費": "4Cカンパニー販管費",
-        "C005_事業開発カンパニー販管費": "事業開発カンパニー販管費",
-    }
-    objTargetColumnIndices: Dict[str, int] = {
-        pszColumnName: find_column_index(objNewHeader, pszColumnName)
-        for pszColumnName in objNewColumns
-    }
-
-    objOutputRows: List[List[str]] = [objNewHeader]
-    for objRow in objRows[1:]:
-        objNewRow: List[str] = objRow[:iInsertIndex] + [""] * len(objNewColumns) + objRow[iInsertIndex:]
-
-        pszRowName: str = objNewRow[0] if objNewRow else ""
-        pszTargetColumn: Optional[str] = objTargetMap.get(pszRowName)
-        if (
-            pszTargetColumn is not None
-            and iGrossProfitIndex >= 0
-            and iSellGeneralAdminTotalIndex > iGrossProfitIndex + 1
-        ):
-            fSum: float = 0.0
-            iEndIndex: int = min(iSellGeneralAdminTotalIndex, len(objNewRow))
-            for iColumnIndex in range(iGrossProfitIndex + 1, iEndIndex):
-                fSum += parse_number(objNewRow[iColumnIndex])
-            iTargetIndex: int = objTargetColumnIndices.get(pszTargetColumn, -1)
-            if iTargetIndex >= 0:
-                objNewRow[iTargetIndex] = format_number(fSum)
-
-        if len(objNewRow) < len(objNewHeader):
-            objNewRow.extend([""] * (len(objNewHeader) - len(objNewRow)))
-        objOutputRows.append(objNewRow)
 
-    return objOutputRows
-
-
-def process_pl_tsv(
-    pszPlPath: str,
-    pszOutputPath: str,
-    pszOutputStep0001Path: str,
-    pszOutputStep0002Path: str,
-    pszOutputStep0003ZeroPath: str,
-    pszOutputStep0007Path: str,
-    pszOutputStep0008Path: str,
-    pszOutputStep0009Path: str,
-    pszOutputStep0005Path: str,
-    pszOutputStep0006Path: str,
-    pszOutputStep0010Path: str,
-    pszOutputFinalPath: str,
-    objManhourMap: Dict[str, List[str]],
-    objCompanyMap: Dict[str, str],
+def insert_step0006_rows_into_company_summary_excel(
+    objRows: List[List[str]],
+    objStart: Tuple[int, int],
+    objEnd: Tuple[int, int],
 ) -> None:
-    objRows: List[List[str]] = []
-    with open(pszPlPath, "r", encoding="utf-8", newline="") as objInputFile:
-        for pszLine in objInputFile:
-            pszLineText: str = pszLine.rstrip("\n").rstrip("\r")
-            objRows.append(pszLineText.split("\t") if pszLineText != "" else [""])
-
-    for iRowIndex, objRow in enumerate(objRows):
-        pszFirstColumn: str = objRow[0] if objRow else ""
-        if iRowIndex == 0:
-            if len(objRow) == 0:
-                objRow = [""]
-            objRow.extend(
-                [
-                    "工数",
-                    "1Cカンパニー販管費の工数",
-                    "2Cカンパニー販管費の工数",
-                    "3Cカンパニー販管費の工数",
-                    "4Cカンパニー販管費の工数",
-                    "事業開発カンパニー販管費の工数",
-                ]
-            )
-            objRows[iRowIndex] = objRow
-            continue
-
-        pszKey: Optional[str] = extract_project_key(pszFirstColumn)
-        if pszKey is None:
-            continue
+    pszTemplatePath, pszOutputPath = _build_pj_summary_company_total_paths()
+    _insert_step0006_rows_into_summary_excel(
+        objRows,
+        objStart,
+        objEnd,
+        pszTemplatePath,
+        pszOutputPath,
+        "カンパニー別損益",
+    )
 
-        objManhours: List[str] = objManhourMap.get(pszKey, [])
-        if len(objManhours) < 6:
-            objManhours = objManhours + ["0:00:00"] * (6 - len(objManhours))
 
-        objRow.extend(objManhours[:6])
-        objRows[iRowIndex] = objRow
+def insert_company_sg_admin_cost_columns(objTable: PlTable) -> None:
+    if objTable.row_count() == 0:
+        return
 
-    with open(pszOutputStep0001Path, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objRows:
-            objOutputFile.write("\t".join(objRow) + "\n")
+    iAllocationIndex: int = objTable.find_column("配賦販管費")
+    iOperatingProfitIndex: int = objTable.find_column("営業利益")
+    if iAllocationIndex < 0 or iOperatingProfitIndex < 0:
+        return
 
-    zero_sell_general_admin_cost_for_step0002_targets(objRows)
+    iInsertIndex: int = iAllocationIndex + 1
+    objNewColumns: List[str] = [
+        "1Cカンパニー販管費",
+        "2Cカンパニー販管費",
+        "3Cカンパニー販管費",
+        "4Cカンパニー販管費",
+        "事業開発カンパニー販管費",
+    ]
+    objTable.insert_columns(iInsertIndex, objNewColumns)
+    iHeaderLength: int = objTable.row_length(0)
 
-    (
-        iSellGeneralAdminCostColumnIndex,
-        iAllocationColumnIndex,
-        iManhourColumnIndex,
-    ) = resolve_step0002_column_indices(objRows)
+    iGrossProfitIndex: int = objTable.find_column("売上総利益")
+    iSellGeneralAdminTotalIndex: int = objTable.find_column("販売費及び一般管理費計")
 
-    if iSellGeneralAdminCostColumnIndex >= 0 and iAllocationColumnIndex >= 0 and iManhourColumnIndex >= 0:
-        calculate_allocation(
-            objRows,
-            iSellGeneralAdminCostColumnIndex,
-            iAllocationColumnIndex,
-            iManhourColumnIndex,
-            ["C001", "C002", "C003", "C004", "C005"],
-            True,
-        )
+    objTargetMap: Dict[str, str] = {
+        "C001_1Cカンパニー販管費": "1Cカンパニー販管費",
+        "C002_2Cカンパニー販管費": "2Cカンパニー販管費",
+        "C003_3Cカンパニー販管費": "3Cカンパニー販管費",
+        "C004_4Cカンパニー販管費": "4Cカンパニー販管費",
+        "C005_事業開発カンパニー販管費": "事業開発カンパニー販管費",
+    }
+    objTargetColumnIndices: Dict[str, int] = {
+        pszColumnName: objTable.find_column(pszColumnName)
+        for pszColumnName in objNewColumns
+    }
+
+    for iRowIndex in range(1, objTable.row_count()):
+        pszRowName: str = objTable.row_name(iRowIndex)
+        pszTargetColumn: Optional[str] = objTargetMap.get(pszRowName)
+        if (
+            pszTargetColumn is not None
+            and iGrossProfitIndex >= 0
+            and iSellGeneralAdminTotalIndex > iGrossProfitIndex + 1
+        ):
+            fSum: float = 0.0
+            iEndIndex: int = min(iSellGeneralAdminTotalIndex, objTable.row_length(iRowIndex))
+            for iColumnIndex in range(iGrossProfitIndex + 1, iEndIndex):
+                fSum += objTable.get_number(iRowIndex, iColumnIndex)
+            iTargetIndex: int = objTargetColumnIndices.get(pszTargetColumn, -1)
+            if iTargetIndex >= 0:
+                objTable.set_number(iRowIndex, iTargetIndex, fSum)
 
-    write_tsv_rows(pszOutputStep0002Path, objRows)
+        objTable.extend_row(iRowIndex, iHeaderLength)
 
-    generate_step0002_old_output(pszOutputStep0001Path, pszOutputStep0002Path)
-    generate_step0002_total_output(pszOutputStep0001Path, pszOutputStep0002Path)
-    generate_step0002_msd3_09_output(pszOutputStep0001Path, pszOutputStep0002Path)
-    generate_step0002_msd3_12_output(pszOutputStep0001Path, pszOutputStep0002Path)
 
+def write_step0003_step0004_zero_tsv(
+    objRows: List[List[str]],
+    pszOutputStep0003ZeroPath: str,
+    objCompanyMap: Dict[str, str],
+) -> None:
     # step0004の処理
     # ここから
     objZeroRows: List[List[str]] = [list(objRow) for objRow in objRows]
@@ -1240,6 +1908,7 @@ def process_pl_tsv(
     with open(pszOutputStep0003ZeroPath, "w", encoding="utf-8", newline="") as objOutputFile:
         for objRow in objZeroRows:
             objOutputFile.write("\t".join(objRow) + "\n")
+    record_created_file(pszOutputStep0003ZeroPath)
 
     pszOutputStep0004Path: str = pszOutputStep0003ZeroPath.replace("step0003_", "step0004_", 1)
     iManhourColumnIndexZero: int = find_column_index(objZeroRows[0], "工数") if objZeroRows else -1
@@ -1303,233 +1972,486 @@ def process_pl_tsv(
     with open(pszOutputStep0004Path, "w", encoding="utf-8", newline="") as objOutputFile:
         for objRow in objZeroRows:
             objOutputFile.write("\t".join(objRow) + "\n")
+    record_created_file(pszOutputStep0004Path)
     # step0004の処理
     # ここまで
 
-    iGrossProfitColumnIndex: int = -1
-    iOperatingProfitColumnIndex: int = -1
-    if objRows:
-        objHeaderRow = objRows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "売上総利益":
-                iGrossProfitColumnIndex = iColumnIndex
-            elif pszColumnName == "営業利益":
-                iOperatingProfitColumnIndex = iColumnIndex
-
-    if iGrossProfitColumnIndex >= 0 and iOperatingProfitColumnIndex >= 0:
-        recalculate_operating_profit(
-            objRows,
-            iGrossProfitColumnIndex,
-            iOperatingProfitColumnIndex,
-            [],
-        )
 
-    iNonOperatingIncomeColumnIndex: int = -1
-    iNonOperatingExpenseColumnIndex: int = -1
-    iOrdinaryProfitColumnIndex: int = -1
-    if objRows:
-        objHeaderRow = objRows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "営業外収益":
-                iNonOperatingIncomeColumnIndex = iColumnIndex
-            elif pszColumnName == "営業外費用":
-                iNonOperatingExpenseColumnIndex = iColumnIndex
-            elif pszColumnName == "経常利益":
-                iOrdinaryProfitColumnIndex = iColumnIndex
+def build_step0001_rows(pszPlPath: str, objManhourMap: Dict[str, List[str]]) -> List[List[str]]:
+    objRows: List[List[str]] = load_tsv_rows(pszPlPath)
 
-    if (
-        iOperatingProfitColumnIndex >= 0
-        and iNonOperatingIncomeColumnIndex >= 0
-        and iNonOperatingExpenseColumnIndex >= 0
-        and iOrdinaryProfitColumnIndex >= 0
-    ):
-        recalculate_ordinary_profit(
-            objRows,
-            iOperatingProfitColumnIndex,
-            iNonOperatingIncomeColumnIndex,
-            iNonOperatingExpenseColumnIndex,
-            iOrdinaryProfitColumnIndex,
-        )
+    for iRowIndex, objRow in enumerate(objRows):
+        pszFirstColumn: str = objRow[0] if objRow else ""
+        if iRowIndex == 0:
+            if len(objRow) == 0:
+                objRow = [""]
+            objRow.extend(
+                [
+                    "工数",
+                    "1Cカンパニー販管費の工数",
+                    "2Cカンパニー販管費の工数",
+                    "3Cカンパニー販管費の工数",
+                    "4Cカンパニー販管費の工数",
+                    "事業開発カンパニー販管費の工数",
+                ]
+            )
+            objRows[iRowIndex] = objRow
+            continue
 
-    iExtraordinaryIncomeColumnIndex: int = -1
-    iExtraordinaryLossColumnIndex: int = -1
-    iPreTaxProfitColumnIndex: int = -1
-    if objRows:
-        objHeaderRow = objRows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "特別利益":
-                iExtraordinaryIncomeColumnIndex = iColumnIndex
-            elif pszColumnName == "特別損失":
-                iExtraordinaryLossColumnIndex = iColumnIndex
-            elif pszColumnName == "税引前当期純利益":
-                iPreTaxProfitColumnIndex = iColumnIndex
+        pszKey: Optional[str] = extract_project_key(pszFirstColumn)
+        if pszKey is None:
+            continue
 
-    if (
-        iOrdinaryProfitColumnIndex >= 0
-        and iExtraordinaryIncomeColumnIndex >= 0
-        and iExtraordinaryLossColumnIndex >= 0
-        and iPreTaxProfitColumnIndex >= 0
-    ):
-        recalculate_pre_tax_profit(
-            objRows,
-            iOrdinaryProfitColumnIndex,
-            iExtraordinaryIncomeColumnIndex,
-            iExtraordinaryLossColumnIndex,
-            iPreTaxProfitColumnIndex,
-        )
+        objManhours: List[str] = objManhourMap.get(pszKey, [])
+        if len(objManhours) < 6:
+            objManhours = objManhours + ["0:00:00"] * (6 - len(objManhours))
 
-    objRows = insert_company_sg_admin_cost_columns(objRows)
+        objRow.extend(objManhours[:6])
+        objRows[iRowIndex] = objRow
+    return objRows
 
-    with open(pszOutputStep0005Path, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objRows:
-            objOutputFile.write("\t".join(objRow) + "\n")
 
-    objRows = allocate_company_sg_admin_cost(objRows)
-    zero_sell_general_admin_cost_for_step0006_targets(objRows)
+class PlTsvJob:
+    # process_pl_tsv_batch に渡す 1 か月分の入出力
+    def __init__(
+        self,
+        pszPlPath: str,
+        pszOutputPath: str,
+        pszOutputStep0001Path: str,
+        pszOutputStep0002Path: str,
+        pszOutputStep0003ZeroPath: str,
+        pszOutputStep0007Path: str,
+        pszOutputStep0008Path: str,
+        pszOutputStep0009Path: str,
+        pszOutputStep0005Path: str,
+        pszOutputStep0006Path: str,
+        pszOutputStep0010Path: str,
+        pszOutputFinalPath: str,
+        objManhourMap: Dict[str, List[str]],
+        objCompanyMap: Dict[str, str],
+        pszManhourPath: str = "",
+    ) -> None:
+        # pszManhourPath: objManhourMap / objCompanyMap の読み込み元 (--incremental の入力の記録に使う)
+        self.pszPlPath: str = pszPlPath
+        self.pszOutputPath: str = pszOutputPath
+        self.pszOutputStep0001Path: str = pszOutputStep0001Path
+        self.pszOutputStep0002Path: str = pszOutputStep0002Path
+        self.pszOutputStep0003ZeroPath: str = pszOutputStep0003ZeroPath
+        self.pszOutputStep0007Path: str = pszOutputStep0007Path
+        self.pszOutputStep0008Path: str = pszOutputStep0008Path
+        self.pszOutputStep0009Path: str = pszOutputStep0009Path
+        self.pszOutputStep0005Path: str = pszOutputStep0005Path
+        self.pszOutputStep0006Path: str = pszOutputStep0006Path
+        self.pszOutputStep0010Path: str = pszOutputStep0010Path
+        self.pszOutputFinalPath: str = pszOutputFinalPath
+        self.objManhourMap: Dict[str, List[str]] = objManhourMap
+        self.objCompanyMap: Dict[str, str] = objCompanyMap
+        self.pszManhourPath: str = pszManhourPath
+
+
+def build_segment_rows(objRows: List[List[str]], objSegment: Tuple[int, int]) -> List[List[str]]:
+    # 積み上げた表から 1 か月分 (見出し行 + その月の行) を取り出す
+    if not objRows:
+        return []
+    return [objRows[0]] + objRows[objSegment[0] : objSegment[1]]
 
-    with open(pszOutputStep0006Path, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objRows:
-            objOutputFile.write("\t".join(objRow) + "\n")
 
-    # step0007: 営業利益の再計算（入力は step0006）
-    objStep0007Rows: List[List[str]] = [list(objRow) for objRow in objRows]
-    iGrossProfitColumnIndex: int = -1
-    iOperatingProfitColumnIndex: int = -1
-    iSellGeneralAdminTotalIndex: int = -1
-    if objStep0007Rows:
-        objHeaderRow = objStep0007Rows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "売上総利益":
-                iGrossProfitColumnIndex = iColumnIndex
-            elif pszColumnName == "営業利益":
-                iOperatingProfitColumnIndex = iColumnIndex
-            elif pszColumnName == "販売費及び一般管理費計":
-                iSellGeneralAdminTotalIndex = iColumnIndex
-
-    if iGrossProfitColumnIndex >= 0 and iOperatingProfitColumnIndex >= 0:
-        recalculate_operating_profit(
-            objStep0007Rows,
-            iGrossProfitColumnIndex,
-            iOperatingProfitColumnIndex,
-            [iSellGeneralAdminTotalIndex] if iSellGeneralAdminTotalIndex >= 0 else [],
-        )
+def process_pl_tsv(
+    pszPlPath: str,
+    pszOutputPath: str,
+    pszOutputStep0001Path: str,
+    pszOutputStep0002Path: str,
+    pszOutputStep0003ZeroPath: str,
+    pszOutputStep0007Path: str,
+    pszOutputStep0008Path: str,
+    pszOutputStep0009Path: str,
+    pszOutputStep0005Path: str,
+    pszOutputStep0006Path: str,
+    pszOutputStep0010Path: str,
+    pszOutputFinalPath: str,
+    objManhourMap: Dict[str, List[str]],
+    objCompanyMap: Dict[str, str],
+    bPersistIntermediates: bool = True,
+) -> None:
+    process_pl_tsv_batch(
+        [
+            PlTsvJob(
+                pszPlPath,
+                pszOutputPath,
+                pszOutputStep0001Path,
+                pszOutputStep0002Path,
+                pszOutputStep0003ZeroPath,
+                pszOutputStep0007Path,
+                pszOutputStep0008Path,
+                pszOutputStep0009Path,
+                pszOutputStep0005Path,
+                pszOutputStep0006Path,
+                pszOutputStep0010Path,
+                pszOutputFinalPath,
+                objManhourMap,
+                objCompanyMap,
+            )
+        ],
+        bPersistIntermediates,
+    )
 
-    with open(pszOutputStep0007Path, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objStep0007Rows:
-            objOutputFile.write("\t".join(objRow) + "\n")
 
-    # step0008: 営業外収益・費用、経常利益の再計算（入力は step0007）
-    objStep0008Rows: List[List[str]] = [list(objRow) for objRow in objStep0007Rows]
-    iNonOperatingIncomeColumnIndex: int = -1
-    iNonOperatingExpenseColumnIndex: int = -1
-    iOrdinaryProfitColumnIndex: int = -1
-    if objStep0008Rows:
-        objHeaderRow = objStep0008Rows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "営業外収益":
-                iNonOperatingIncomeColumnIndex = iColumnIndex
-            elif pszColumnName == "営業外費用":
-                iNonOperatingExpenseColumnIndex = iColumnIndex
-            elif pszColumnName == "経常利益":
-                iOrdinaryProfitColumnIndex = iColumnIndex
+def process_pl_tsv_batch(objJobs: List[PlTsvJob], bPersistIntermediates: bool = True) -> None:
+    # 見出し行が同じ月は 1 つの表に積み上げ、配賦・利益の再計算を全月まとめて行う。
+    # 配賦の総額・工数の合計は月 (objSegments の行範囲) ごとに求めるため、結果は 1 か月ずつ処理した場合と同じ。
+    objGroups: Dict[Tuple[str, ...], List[Tuple[PlTsvJob, List[List[str]]]]] = {}
+    objEmptyGroups: List[List[Tuple[PlTsvJob, List[List[str]]]]] = []
+    for objJob in objJobs:
+        objStep0001Rows: List[List[str]] = build_step0001_rows(objJob.pszPlPath, objJob.objManhourMap)
+        if not objStep0001Rows:
+            objEmptyGroups.append([(objJob, objStep0001Rows)])
+            continue
+        objGroups.setdefault(tuple(objStep0001Rows[0]), []).append((objJob, objStep0001Rows))
 
-    if (
-        iOperatingProfitColumnIndex >= 0
-        and iNonOperatingIncomeColumnIndex >= 0
-        and iNonOperatingExpenseColumnIndex >= 0
-        and iOrdinaryProfitColumnIndex >= 0
-    ):
-        recalculate_ordinary_profit(
-            objStep0008Rows,
-            iOperatingProfitColumnIndex,
-            iNonOperatingIncomeColumnIndex,
-            iNonOperatingExpenseColumnIndex,
-            iOrdinaryProfitColumnIndex,
+    for objGroup in list(objGroups.values()) + objEmptyGroups:
+        process_pl_tsv_group(objGroup, bPersistIntermediates)
+
+
+def run_pl_tsv_jobs(objJobs: List[PlTsvJob], bPersistIntermediates: bool, iJobCount: int) -> None:
+    # iJobCount が 2 以上の場合は、連続する月の塊ごとにプロセスプールで process_pl_tsv_batch を実行する。
+    # 全ワーカーの終了を待ってから戻る。
+    iWorkerCount: int = min(iJobCount, len(objJobs))
+    if iWorkerCount <= 1:
+        process_pl_tsv_batch(objJobs, bPersistIntermediates)
+        return
+
+    objChunks: List[List[PlTsvJob]] = []
+    iChunkStart: int = 0
+    for iWorker in range(iWorkerCount):
+        iChunkEnd: int = iChunkStart + (len(objJobs) - iChunkStart) // (iWorkerCount - iWorker)
+        objChunks.append(objJobs[iChunkStart:iChunkEnd])
+        iChunkStart = iChunkEnd
+
+    with ProcessPoolExecutor(max_workers=iWorkerCount) as objExecutor:
+        objFutures = [
+            objExecutor.submit(
+                run_pl_tsv_batch_in_worker,
+                objChunk,
+                bPersistIntermediates,
+                RUN_OUTPUT_MANIFEST is not None,
+            )
+            for objChunk in objChunks
+        ]
+        for objFuture in objFutures:
+            for pszCreatedPath in objFuture.result():
+                record_created_file(pszCreatedPath)
+
+
+def run_pl_tsv_batch_in_worker(
+    objJobs: List[PlTsvJob],
+    bPersistIntermediates: bool,
+    bRecordOutputs: bool,
+) -> List[str]:
+    # プロセスプールのワーカー側で実行し、作成したファイルを親プロセスのマニフェストへ渡すために返す
+    if bRecordOutputs:
+        begin_run_output_manifest()
+    process_pl_tsv_batch(objJobs, bPersistIntermediates)
+    return end_run_output_manifest()
+
+
+# 実行をまたいで使う記録 (--incremental の月ごとの PL 処理、計画.csv の解析結果など) の置き場所
+BUILD_CACHE_DIRECTORY_NAME: str = "SellGeneralAdminCost_Allocation_BuildCache"
+
+
+def compute_file_sha256(pszPath: str) -> str:
+    objHash = hashlib.sha256()
+    with open(pszPath, "rb") as objFile:
+        for objChunk in iter(lambda: objFile.read(1024 * 1024), b""):
+            objHash.update(objChunk)
+    return objHash.hexdigest()
+
+
+class PlTsvBuildCache:
+    # 月ごとの PL 処理の入力 (工数TSV・損益計算書TSV・本スクリプト・オプション) と出力の内容ハッシュを状態ファイルに記録する。
+    # 入力が前回と同じ月は、出力を記録したハッシュの内容に戻して process_pl_tsv を省く。
+    # 出力の内容は objects/ にハッシュ名で保存し、移動・削除された出力もそこから戻す。
+    def __init__(self, pszDirectory: str) -> None:
+        self.pszDirectory: str = pszDirectory
+        self.pszStatePath: str = os.path.join(pszDirectory, "build_state.json")
+        self.pszObjectDirectory: str = os.path.join(pszDirectory, "objects")
+        self.pszScriptHash: str = compute_file_sha256(os.path.abspath(__file__))
+        self.objEntries: Dict[str, Dict[str, object]] = {}
+        try:
+            with open(self.pszStatePath, "r", encoding="utf-8") as objFile:
+                objState = json.load(objFile)
+        except (OSError, ValueError):
+            objState = None
+        if isinstance(objState, dict) and isinstance(objState.get("entries"), dict):
+            self.objEntries = objState["entries"]
+
+    def build_job_key(self, objJob: PlTsvJob) -> str:
+        return get_tsv_rows_cache_key(objJob.pszOutputFinalPath)
+
+    def build_input_signature(self, objJob: PlTsvJob, bPersistIntermediates: bool) -> Dict[str, object]:
+        return {
+            "manhour": compute_file_sha256(objJob.pszManhourPath),
+            "pl": compute_file_sha256(objJob.pszPlPath),
+            "script": self.pszScriptHash,
+            "persist_intermediates": bPersistIntermediates,
+        }
+
+    def get_object_path(self, pszHash: str) -> str:
+        return os.path.join(self.pszObjectDirectory, pszHash)
+
+    def try_restore(self, objJob: PlTsvJob, objSignature: Dict[str, object]) -> bool:
+        # 記録した出力をすべて戻せる場合だけ戻して True を返す (1 つでも戻せなければ何もしない)
+        objEntry: Optional[Dict[str, object]] = self.objEntries.get(self.build_job_key(objJob))
+        if objEntry is None or objEntry.get("inputs") != objSignature:
+            return False
+        objOutputs: List[Tuple[str, str, bool]] = []
+        for pszPath, pszHash in objEntry.get("outputs", []):
+            bCurrent: bool = os.path.isfile(pszPath) and compute_file_sha256(pszPath) == pszHash
+            if not bCurrent and not os.path.isfile(self.get_object_path(pszHash)):
+                return False
+            objOutputs.append((pszPath, pszHash, bCurrent))
+        if not objOutputs:
+            return False
+        for pszPath, pszHash, bCurrent in objOutputs:
+            if bCurrent:
+                record_created_file(pszPath)
+                continue
+            unlink_hard_linked_output_file(pszPath)
+            os.makedirs(os.path.dirname(pszPath), exist_ok=True)
+            copy_output_file(self.get_object_path(pszHash), pszPath)
+        # step0010 の temp へのリンクは process_pl_tsv_group と同じように作り直す
+        move_files_to_temp_and_copy_back(
+            [objJob.pszOutputStep0010Path, objJob.pszOutputStep0010Path.replace("_vertical", "")],
+            get_script_base_directory(),
         )
+        return True
 
-    with open(pszOutputStep0008Path, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objStep0008Rows:
-            objOutputFile.write("\t".join(objRow) + "\n")
+    def store(self, objJob: PlTsvJob, objSignature: Dict[str, object], objOutputPaths: List[str]) -> None:
+        os.makedirs(self.pszObjectDirectory, exist_ok=True)
+        objOutputs: List[List[str]] = []
+        for pszPath in objOutputPaths:
+            if not os.path.isfile(pszPath):
+                continue
+            pszHash: str = compute_file_sha256(pszPath)
+            pszObjectPath: str = self.get_object_path(pszHash)
+            if not os.path.isfile(pszObjectPath):
+                shutil.copyfile(pszPath, pszObjectPath)
+            objOutputs.append([os.path.abspath(pszPath), pszHash])
+        self.objEntries[self.build_job_key(objJob)] = {"inputs": objSignature, "outputs": objOutputs}
+
+    def discard(self, objJob: PlTsvJob) -> None:
+        self.objEntries.pop(self.build_job_key(objJob), None)
+
+    def save(self) -> None:
+        # どの記録からも参照されなくなった内容は削除する
+        os.makedirs(self.pszObjectDirectory, exist_ok=True)
+        objUsedHashes: set[str] = {
+            pszHash for objEntry in self.objEntries.values() for _, pszHash in objEntry.get("outputs", [])
+        }
+        for pszName in os.listdir(self.pszObjectDirectory):
+            if pszName not in objUsedHashes:
+                os.remove(os.path.join(self.pszObjectDirectory, pszName))
+        pszTemporaryPath: str = self.pszStatePath + ".tmp"
+        with open(pszTemporaryPath, "w", encoding="utf-8", newline="") as objFile:
+            json.dump({"version": 1, "entries": self.objEntries}, objFile, ensure_ascii=False)
+        os.replace(pszTemporaryPath, self.pszStatePath)
+
+
+def run_pl_tsv_jobs_incrementally(
+    objJobs: List[PlTsvJob],
+    bPersistIntermediates: bool,
+    iJobCount: int,
+) -> None:
+    # 入力が前回と同じ月は前回の出力を戻し、残りの月だけ run_pl_tsv_jobs で処理して記録する。
+    # 処理した月の出力は、この間にマニフェストへ記録されたファイルのうち、その月の出力フォルダにあり年月が同じもの。
+    objBuildCache: PlTsvBuildCache = PlTsvBuildCache(
+        os.path.join(get_script_base_directory(), BUILD_CACHE_DIRECTORY_NAME)
+    )
+    objPendingJobs: List[Tuple[PlTsvJob, Dict[str, object]]] = []
+    for objJob in objJobs:
+        objSignature: Dict[str, object] = objBuildCache.build_input_signature(objJob, bPersistIntermediates)
+        if not objBuildCache.try_restore(objJob, objSignature):
+            objPendingJobs.append((objJob, objSignature))
+
+    objKeysBefore: set[str] = set(RUN_OUTPUT_MANIFEST or {})
+    run_pl_tsv_jobs([objJob for objJob, _ in objPendingJobs], bPersistIntermediates, iJobCount)
+    objCreatedPaths: List[str] = [
+        pszPath for pszKey, pszPath in (RUN_OUTPUT_MANIFEST or {}).items() if pszKey not in objKeysBefore
+    ]
 
-    # step0009: 税引前当期純利益の再計算（入力は step0008）
-    objStep0009Rows: List[List[str]] = [list(objRow) for objRow in objStep0008Rows]
-    iExtraordinaryIncomeColumnIndex: int = -1
-    iExtraordinaryLossColumnIndex: int = -1
-    iPreTaxProfitColumnIndex: int = -1
-    if objStep0009Rows:
-        objHeaderRow = objStep0009Rows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "特別利益":
-                iExtraordinaryIncomeColumnIndex = iColumnIndex
-            elif pszColumnName == "特別損失":
-                iExtraordinaryLossColumnIndex = iColumnIndex
-            elif pszColumnName == "税引前当期純利益":
-                iPreTaxProfitColumnIndex = iColumnIndex
+    def build_output_key(objJob: PlTsvJob) -> Tuple[str, Optional[Tuple[int, int]]]:
+        return (
+            os.path.dirname(get_tsv_rows_cache_key(objJob.pszOutputFinalPath)),
+            extract_year_month_from_path(objJob.pszPlPath),
+        )
 
-    if (
-        iOrdinaryProfitColumnIndex >= 0
-        and iExtraordinaryIncomeColumnIndex >= 0
-        and iExtraordinaryLossColumnIndex >= 0
-        and iPreTaxProfitColumnIndex >= 0
-    ):
-        recalculate_pre_tax_profit(
-            objStep0009Rows,
-            iOrdinaryProfitColumnIndex,
-            iExtraordinaryIncomeColumnIndex,
-            iExtraordinaryLossColumnIndex,
-            iPreTaxProfitColumnIndex,
+    objJobCounts: Dict[Tuple[str, Optional[Tuple[int, int]]], int] = {}
+    for objJob, _ in objPendingJobs:
+        objJobCounts[build_output_key(objJob)] = objJobCounts.get(build_output_key(objJob), 0) + 1
+    for objJob, objSignature in objPendingJobs:
+        objMonth: Optional[Tuple[int, int]] = extract_year_month_from_path(objJob.pszPlPath)
+        if objMonth is None or objJobCounts[build_output_key(objJob)] > 1:
+            # 出力をどの月のものか決められないため記録しない
+            objBuildCache.discard(objJob)
+            continue
+        objOutputDirectories: set[str] = {
+            os.path.dirname(get_tsv_rows_cache_key(objJob.pszPlPath)),
+            os.path.dirname(get_tsv_rows_cache_key(objJob.pszOutputFinalPath)),
+        }
+        objBuildCache.store(
+            objJob,
+            objSignature,
+            [
+                pszPath
+                for pszPath in objCreatedPaths
+                if os.path.dirname(get_tsv_rows_cache_key(pszPath)) in objOutputDirectories
+                and extract_year_month_from_path(pszPath) == objMonth
+            ],
         )
+    objBuildCache.save()
 
-    with open(pszOutputStep0009Path, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objStep0009Rows:
-            objOutputFile.write("\t".join(objRow) + "\n")
 
-    objStep0010Rows: List[List[str]] = [list(objRow) for objRow in objStep0009Rows]
-    iCorporateTaxColumnIndexStep0010: int = -1
-    iCorporateTaxTotalColumnIndexStep0010: int = -1
-    iNetProfitColumnIndexStep0010: int = -1
-    iPreTaxProfitColumnIndexStep0010: int = -1
-    if objStep0010Rows:
-        objHeaderRow = objStep0010Rows[0]
-        for iColumnIndex, pszColumnName in enumerate(objHeaderRow):
-            if pszColumnName == "法人税、住民税及び事業税":
-                iCorporateTaxColumnIndexStep0010 = iColumnIndex
-            elif pszColumnName == "法人税等":
-                iCorporateTaxTotalColumnIndexStep0010 = iColumnIndex
-            elif pszColumnName == "税引前当期純利益":
-                iPreTaxProfitColumnIndexStep0010 = iColumnIndex
-            elif pszColumnName == "当期純利益":
-                iNetProfitColumnIndexStep0010 = iColumnIndex
+def process_pl_tsv_group(
+    objGroup: List[Tuple[PlTsvJob, List[List[str]]]],
+    bPersistIntermediates: bool,
+) -> None:
+    # 各ステップは積み上げた objTable をその場で更新していく。
+    # 中間TSV (step0001〜step0009) は bPersistIntermediates が True の場合のみ、月ごとに切り出して書き出す。
+    objRows: List[List[str]] = []
+    objSegments: List[Tuple[int, int]] = []
+    for _, objStep0001Rows in objGroup:
+        if not objRows:
+            objRows.extend(objStep0001Rows[:1])
+        iStartRowIndex: int = len(objRows)
+        objRows.extend(objStep0001Rows[1:])
+        objSegments.append((iStartRowIndex, len(objRows)))
+    objJobs: List[PlTsvJob] = [objJob for objJob, _ in objGroup]
+
+    def write_segments(objSegmentRows: List[List[str]], objPaths: List[str]) -> None:
+        for iSegment, pszOutputPath in enumerate(objPaths):
+            write_tsv_rows(pszOutputPath, build_segment_rows(objSegmentRows, objSegments[iSegment]))
 
-    if (
-        iCorporateTaxColumnIndexStep0010 >= 0
-        and iCorporateTaxTotalColumnIndexStep0010 >= 0
-        and iPreTaxProfitColumnIndexStep0010 >= 0
-        and iNetProfitColumnIndexStep0010 >= 0
-    ):
-        recalculate_net_profit(
-            objStep0010Rows,
-            iCorporateTaxColumnIndexStep0010,
-            iCorporateTaxTotalColumnIndexStep0010,
-            iPreTaxProfitColumnIndexStep0010,
-            iNetProfitColumnIndexStep0010,
+    objTable: PlTable = PlTable(objRows)
+
+    objStep0001Table: Optional[PlTable] = None
+    if bPersistIntermediates:
+        write_segments(objTable.materialize(), [objJob.pszOutputStep0001Path for objJob in objJobs])
+        objStep0001Table = objTable.copy()
+
+    zero_sell_general_admin_cost_for_step0002_targets(objTable)
+
+    (
+        iSellGeneralAdminCostColumnIndex,
+        iAllocationColumnIndex,
+        iManhourColumnIndex,
+    ) = resolve_step0002_column_indices(objTable)
+
+    # step0002 本体と各派生ファイルの配賦は同じ工数・同じ行に対するため、まとめて計算する。
+    # 先頭の組 (_MSD3_09) は step0002 本体と同じ条件。
+    objStep0002Variants: List[Tuple[str, Optional[List[str]], bool]] = [
+        ("_MSD3_09", ["C001", "C002", "C003", "C004", "C005"], True),
+    ]
+    if bPersistIntermediates:
+        objStep0002Variants.extend(
+            [
+                ("_old", ["C001", "C002", "C003", "C004", "C005"], False),
+                ("_合計", [], True),
+                ("_MSD3_12", ["C001", "C002", "C003", "C004", "C005", "C006", "C007"], True),
+            ]
+        )
+    objStep0002RowIndices: np.ndarray = np.zeros(0, dtype=np.int64)
+    objStep0002Allocations: np.ndarray = np.zeros((len(objStep0002Variants), 0), dtype=np.int64)
+    bAllocateStep0002: bool = (
+        iSellGeneralAdminCostColumnIndex >= 0 and iAllocationColumnIndex >= 0 and iManhourColumnIndex >= 0
+    )
+    if bAllocateStep0002:
+        objStep0002RowIndices, objStep0002Allocations = calculate_allocations(
+            objTable,
+            iSellGeneralAdminCostColumnIndex,
+            iManhourColumnIndex,
+            [
+                (objDeductionCodes, bUseHamiltonRounding)
+                for _, objDeductionCodes, bUseHamiltonRounding in objStep0002Variants
+            ],
+            objSegments,
+        )
+        write_allocation_column(
+            objTable,
+            iAllocationColumnIndex,
+            objStep0002RowIndices,
+            objStep0002Allocations[0],
         )
 
-    with open(pszOutputStep0010Path, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objStep0010Rows:
-            objOutputFile.write("\t".join(objRow) + "\n")
+    if bPersistIntermediates and objStep0001Table is not None:
+        objStep0002Rows: List[List[str]] = objTable.materialize()
+        write_segments(objStep0002Rows, [objJob.pszOutputStep0002Path for objJob in objJobs])
 
-    write_transposed_tsv(pszOutputStep0010Path)
-    pszOutputStep0010HorizontalPath: str = pszOutputStep0010Path.replace("_vertical", "")
-    move_files_to_temp_and_copy_back(
-        [pszOutputStep0010Path, pszOutputStep0010HorizontalPath],
-        get_script_base_directory(),
+        for iVariant, (pszSuffix, objDeductionCodes, bUseHamiltonRounding) in enumerate(objStep0002Variants):
+            write_segments(
+                build_step0002_variant_rows(
+                    objStep0001Table,
+                    objDeductionCodes,
+                    bUseHamiltonRounding,
+                    (objStep0002RowIndices, objStep0002Allocations[iVariant]),
+                ),
+                [build_step0002_variant_path(objJob.pszOutputStep0002Path, pszSuffix) for objJob in objJobs],
+            )
+        objStep0001Table = None
+
+        for iSegment, objJob in enumerate(objJobs):
+            write_step0003_step0004_zero_tsv(
+                build_segment_rows(objStep0002Rows, objSegments[iSegment]),
+                objJob.pszOutputStep0003ZeroPath,
+                objJob.objCompanyMap,
+            )
+
+    recalculate_profit_cascade(objTable, [], False)
+
+    insert_company_sg_admin_cost_columns(objTable)
+
+    if bPersistIntermediates:
+        write_segments(objTable.materialize(), [objJob.pszOutputStep0005Path for objJob in objJobs])
+
+    allocate_company_sg_admin_cost(objTable, objSegments)
+    zero_sell_general_admin_cost_for_step0006_targets(objTable)
+
+    if bPersistIntermediates:
+        write_segments(objTable.materialize(), [objJob.pszOutputStep0006Path for objJob in objJobs])
+
+    # step0007: 営業利益の再計算（入力は step0006）
+    # step0008: 営業外収益・費用、経常利益の再計算（入力は step0007）
+    # step0009: 税引前当期純利益の再計算（入力は step0008）
+    # step0010: 当期純利益の再計算（入力は step0009）
+    # 列の挿入後なので列番号は引き直す (重複している場合は最後の列)
+    iSellGeneralAdminTotalIndex: int = objTable.find_last_column("販売費及び一般管理費計")
+    objSnapshotRows: List[Optional[List[List[str]]]] = recalculate_profit_cascade(
+        objTable,
+        [iSellGeneralAdminTotalIndex] if iSellGeneralAdminTotalIndex >= 0 else [],
+        True,
+        [True, True, True, False] if bPersistIntermediates else None,
     )
+    objSnapshotPaths: List[List[str]] = [
+        [objJob.pszOutputStep0007Path for objJob in objJobs],
+        [objJob.pszOutputStep0008Path for objJob in objJobs],
+        [objJob.pszOutputStep0009Path for objJob in objJobs],
+    ]
+    for iStep, objRowsForStep in enumerate(objSnapshotRows):
+        if objRowsForStep is not None:
+            write_segments(objRowsForStep, objSnapshotPaths[iStep])
 
-    with open(pszOutputFinalPath, "w", encoding="utf-8", newline="") as objOutputFile:
-        for objRow in objStep0010Rows:
-            objOutputFile.write("\t".join(objRow) + "\n")
-    write_transposed_tsv(pszOutputFinalPath)
+    objStep0010Rows: List[List[str]] = objTable.materialize()
+    for iSegment, objJob in enumerate(objJobs):
+        objStep0010SegmentRows: List[List[str]] = build_segment_rows(objStep0010Rows, objSegments[iSegment])
+        write_tsv_rows(objJob.pszOutputStep0010Path, objStep0010SegmentRows)
+
+        write_transposed_tsv(objJob.pszOutputStep0010Path, objStep0010SegmentRows)
+        pszOutputStep0010HorizontalPath: str = objJob.pszOutputStep0010Path.replace("_vertical", "")
+        move_files_to_temp_and_copy_back(
+            [objJob.pszOutputStep0010Path, pszOutputStep0010HorizontalPath],
+            get_script_base_directory(),
+        )
+
+        write_tsv_rows(objJob.pszOutputFinalPath, objStep0010SegmentRows)
+        write_transposed_tsv(objJob.pszOutputFinalPath, objStep0010SegmentRows)
 
 
 def transpose_rows(objRows: List[List[str]]) -> List[List[str]]:
@@ -1546,23 +2468,26 @@ def transpose_rows(objRows: List[List[str]]) -> List[List[str]]:
     return objTransposed
 
 
-def write_transposed_tsv(pszInputPath: str) -> None:
+def write_transposed_tsv(pszInputPath: str, objRows: Optional[List[List[str]]] = None) -> None:
     pszDirectory: str
     pszFileName: str
     pszDirectory, pszFileName = os.path.split(pszInputPath)
     pszOutputFileName: str = pszFileName.replace("_vertical", "")
     pszOutputPath: str = os.path.join(pszDirectory, pszOutputFileName)
 
-    objRows: List[List[str]] = []
-    with open(pszInputPath, "r", encoding="utf-8", newline="") as objInputFile:
-        for pszLine in objInputFile:
-            pszLineText: str = pszLine.rstrip("\n").rstrip("\r")
-            objRows.append(pszLineText.split("\t"))
+    if objRows is None:
+        objRows = []
+        with open(pszInputPath, "r", encoding="utf-8", newline="") as objInputFile:
+            for pszLine in objInputFile:
+                pszLineText: str = pszLine.rstrip("\n").rstrip("\r")
+                objRows.append(pszLineText.split("\t"))
 
     objTransposed = transpose_rows(objRows)
+    unlink_hard_linked_output_file(pszOutputPath)
     with open(pszOutputPath, "w", encoding="utf-8", newline="") as objOutputFile:
         for objRow in objTransposed:
             objOutputFile.write("\t".join(objRow) + "\n")
+    record_created_file(pszOutputPath)
 
 
 def move_files_to_temp_and_copy_back(objFilePaths: List[str], pszBaseDirectory: str) -> None:
@@ -1576,9 +2501,7 @@ def move_files_to_temp_and_copy_back(objFilePaths: List[str], pszBaseDirectory:
         if not os.path.isfile(pszFilePath):
             continue
         pszFileName: str = os.path.basename(pszFilePath)
-        pszTempPath: str = os.path.join(pszTempDirectory, pszFileName)
-        shutil.move(pszFilePath, pszTempPath)
-        shutil.copy2(pszTempPath, os.path.join(pszBaseDirectory, pszFileName))
+        link_output_file(pszFilePath, os.path.join(pszTempDirectory, pszFileName))
 
 
 def move_files_to_temp(objFilePaths: List[str], pszBaseDirectory: str) -> None:
@@ -1593,7 +2516,7 @@ def move_files_to_temp(objFilePaths: List[str], pszBaseDirectory: str) -> None:
             continue
         pszFileName: str = os.path.basename(pszFilePath)
         pszTempPath: str = os.path.join(pszTempDirectory, pszFileName)
-        shutil.move(pszFilePath, pszTempPath)
+        move_output_file(pszFilePath, pszTempPath)
 
 
 def move_cp_step_tsv_files_to_temp_subfolders(pszBaseDirectory: str) -> None:
@@ -1698,7 +2621,7 @@ def move_cp_step_tsv_files_to_temp_subfolders(pszBaseDirectory: str) -> None:
             if not os.path.isfile(pszSourcePath):
                 continue
             pszDestinationPath: str = os.path.join(pszTargetDirectory, pszFileName)
-            shutil.move(pszSourcePath, pszDestinationPath)
+            move_output_file(pszSourcePath, pszDestinationPath)
 
     objStep0004VerticalPatterns: List[Tuple[re.Pattern[str], str]] = [
         (
@@ -1710,7 +2633,7 @@ def move_cp_step_tsv_files_to_temp_subfolders(pszBaseDirectory: str) -> None:
             "0002_CP別_step0001-0005",
         ),
     ]
-    for pszFileName in sorted(os.listdir(pszTempDirectory)):
+    for pszFileName in list_run_output_file_names(pszTempDirectory):
         pszSourcePath: str = os.path.join(pszTempDirectory, pszFileName)
         if not os.path.isfile(pszSourcePath):
             continue
@@ -1726,7 +2649,7 @@ def move_cp_step_tsv_files_to_temp_subfolders(pszBaseDirectory: str) -> None:
         pszDestinationPath: str = os.path.join(pszTargetDirectory, pszFileName)
         if os.path.exists(pszDestinationPath):
             os.remove(pszDestinationPath)
-        shutil.move(pszSourcePath, pszDestinationPath)
+        move_output_file(pszSourcePath, pszDestinationPath)
 
 
 def move_pl_tsv_files_into_income_statement_temp_subfolder(pszBaseDirectory: str) -> None:
@@ -1739,7 +2662,7 @@ def move_pl_tsv_files_into_income_statement_temp_subfolder(pszBaseDirectory: str
     for pszSourceDirectory in objSourceDirectories:
         if not os.path.isdir(pszSourceDirectory):
             continue
-        for pszFileName in sorted(os.listdir(pszSourceDirectory)):
+        for pszFileName in list_run_output_file_names(pszSourceDirectory):
             if not objPattern.match(pszFileName):
                 continue
             pszSourcePath: str = os.path.join(pszSourceDirectory, pszFileName)
@@ -1750,7 +2673,7 @@ def move_pl_tsv_files_into_income_statement_temp_subfolder(pszBaseDirectory: str
                 continue
             if os.path.exists(pszDestinationPath):
                 os.remove(pszDestinationPath)
-            shutil.move(pszSourcePath, pszDestinationPath)
+            move_output_file(pszSourcePath, pszDestinationPath)
 
 
 def move_monthly_income_statement_tsv_files_into_temp_subfolder(pszBaseDirectory: str) -> None:
@@ -1773,7 +2696,7 @@ def move_monthly_income_statement_tsv_files_into_temp_subfolder(pszBaseDirectory
         pszDestinationPath: str = os.path.join(pszTargetDirectory, pszFileName)
         if os.path.exists(pszDestinationPath):
             os.remove(pszDestinationPath)
-        shutil.move(pszSourcePath, pszDestinationPath)
+        move_output_file(pszSourcePath, pszDestinationPath)
 
 
 def move_cost_report_tsv_files_into_temp_subfolder(pszBaseDirectory: str) -> None:
@@ -1794,7 +2717,7 @@ def move_cost_report_tsv_files_into_temp_subfolder(pszBaseDirectory: str) -> Non
         pszDestinationPath: str = os.path.join(pszTargetDirectory, pszFileName)
         if os.path.exists(pszDestinationPath):
             os.remove(pszDestinationPath)
-        shutil.move(pszSourcePath, pszDestinationPath)
+        move_output_file(pszSourcePath, pszDestinationPath)
 
 
 def move_step0007_split_files_into_0003_pj_summary_temp_subfolder(pszBaseDirectory: str) -> None:
@@ -1820,7 +2743,7 @@ def move_step0007_split_files_into_0003_pj_summary_temp_subfolder(pszBaseDirecto
         pszDestinationPath: str = os.path.join(pszTargetDirectory, pszFileName)
         if os.path.exists(pszDestinationPath):
             os.remove(pszDestinationPath)
-        shutil.move(pszSourcePath, pszDestinationPath)
+        move_output_file(pszSourcePath, pszDestinationPath)
 
 
 def move_pj_summary_tsv_files_to_temp_subfolders(pszBaseDirectory: str) -> None:
@@ -1873,7 +2796,7 @@ def move_pj_summary_tsv_files_to_temp_subfolders(pszBaseDirectory: str) -> None:
         ),
     ]
 
-    objFileNames: List[str] = sorted(os.listdir(pszBaseDirectory))
+    objFileNames: List[str] = list_run_output_file_names(pszBaseDirectory)
     for pszFolderName, objPatterns in objFolderPatterns:
         pszTargetDirectory: str = os.path.join(pszTempDirectory, pszFolderName)
         os.makedirs(pszTargetDirectory, exist_ok=True)
@@ -1886,7 +2809,7 @@ def move_pj_summary_tsv_files_to_temp_subfolders(pszBaseDirectory: str) -> None:
             if not os.path.isfile(pszSourcePath):
                 continue
             pszDestinationPath: str = os.path.join(pszTargetDirectory, pszFileName)
-            shutil.move(pszSourcePath, pszDestinationPath)
+            move_output_file(pszSourcePath, pszDestinationPath)
 
 
 def move_cp_step_folders_to_temp(pszBaseDirectory: str) -> None:
@@ -1927,6 +2850,7 @@ def move_cp_step_folders_to_temp(pszBaseDirectory: str) -> None:
         if os.path.isdir(pszDestinationPath):
             shutil.rmtree(pszDestinationPath)
         shutil.move(pszSourcePath, pszDestinationPath)
+        record_moved_directory(pszSourcePath, pszDestinationPath)
 
 
 def remove_bycompany_managementcontrol_step0005_directory() -> None:
@@ -2113,6 +3037,7 @@ def ensure_selected_range_file(pszDirectory: str, objRange: Tuple[Tuple[int, int
     )
     with open(pszAccountPeriodPath, "w", encoding="utf-8", newline="") as objFile:
         objFile.write("\n".join(objAccountPeriodLines) + "\n")
+    record_created_file(pszAccountPeriodPath)
 
     write_cp_previous_period_range_file(pszDirectory, objRange)
     if EXECUTION_ROOT_DIRECTORY:
@@ -2120,11 +3045,11 @@ def ensure_selected_range_file(pszDirectory: str, objRange: Tuple[Tuple[int, int
         os.makedirs(pszPeriodDirectory, exist_ok=True)
         pszSelectedRangeCopyPath = os.path.join(pszPeriodDirectory, os.path.basename(pszOutputPath))
         pszAccountPeriodCopyPath = os.path.join(pszPeriodDirectory, os.path.basename(pszAccountPeriodPath))
-        shutil.copy2(
+        copy_output_file(
             pszOutputPath,
             pszSelectedRangeCopyPath,
         )
-        shutil.copy2(
+        copy_output_file(
             pszAccountPeriodPath,
             pszAccountPeriodCopyPath,
         )
@@ -2141,11 +3066,119 @@ def ensure_selected_range_file(pszDirectory: str, objRange: Tuple[Tuple[int, int
                 objFile.write(pszSelectedRangeText)
                 objFile.write("\n")
                 objFile.write(pszAccountPeriodText)
+            record_created_file(pszMergedPath)
     return pszOutputPath
 
 
-def record_created_file(_pszPath: str) -> None:
-    return
+# この実行で作成したファイルの一覧 (作成順)。キーは get_tsv_rows_cache_key で正規化したパス、値は絶対パス。
+# main で有効にし、出力の振り分け (move_*_temp_* など) はディレクトリを読み直さずにこの一覧から対象を選ぶ。
+# 移動・削除したファイルはここでも移動・削除しておく。None の間は何も記録しない。
+RUN_OUTPUT_MANIFEST: "Optional[OrderedDict[str, str]]" = None
+# temp へハードリンクした出力。書き直す前にリンクを切り、temp 側の内容を変えないようにする。
+HARD_LINKED_OUTPUT_KEYS: set[str] = set()
+
+
+def begin_run_output_manifest() -> None:
+    global RUN_OUTPUT_MANIFEST
+    RUN_OUTPUT_MANIFEST = OrderedDict()
+
+
+def end_run_output_manifest() -> List[str]:
+    global RUN_OUTPUT_MANIFEST
+    objPaths: List[str] = list(RUN_OUTPUT_MANIFEST.values()) if RUN_OUTPUT_MANIFEST is not None else []
+    RUN_OUTPUT_MANIFEST = None
+    return objPaths
+
+
+def record_created_file(pszPath: str) -> None:
+    if RUN_OUTPUT_MANIFEST is None:
+        return
+    RUN_OUTPUT_MANIFEST[get_tsv_rows_cache_key(pszPath)] = os.path.abspath(pszPath)
+
+
+def record_removed_file(pszPath: str) -> None:
+    if RUN_OUTPUT_MANIFEST is None:
+        return
+    RUN_OUTPUT_MANIFEST.pop(get_tsv_rows_cache_key(pszPath), None)
+
+
+def record_moved_directory(pszSourceDirectory: str, pszDestinationDirectory: str) -> None:
+    # フォルダごと移動した場合は、その下に記録したファイルのパスを付け替える
+    if RUN_OUTPUT_MANIFEST is None:
+        return
+    pszSourcePrefix: str = get_tsv_rows_cache_key(pszSourceDirectory) + os.sep
+    pszDestinationPrefix: str = get_tsv_rows_cache_key(pszDestinationDirectory) + os.sep
+    pszSourceDirectoryPath: str = os.path.abspath(pszSourceDirectory)
+    for pszKey in list(RUN_OUTPUT_MANIFEST):
+        if pszKey.startswith(pszDestinationPrefix):
+            del RUN_OUTPUT_MANIFEST[pszKey]
+    for pszKey, pszPath in list(RUN_OUTPUT_MANIFEST.items()):
+        if not pszKey.startswith(pszSourcePrefix):
+            continue
+        del RUN_OUTPUT_MANIFEST[pszKey]
+        record_created_file(
+            os.path.join(pszDestinationDirectory, os.path.relpath(pszPath, pszSourceDirectoryPath))
+        )
+
+
+def list_run_output_file_names(pszDirectory: str) -> List[str]:
+    # マニフェストが有効ならこの実行で作成したファイルだけを、無効ならディレクトリの内容を名前順で返す
+    if RUN_OUTPUT_MANIFEST is None:
+        return sorted(os.listdir(pszDirectory))
+    pszDirectoryKey: str = get_tsv_rows_cache_key(pszDirectory)
+    return sorted(
+        os.path.basename(pszPath)
+        for pszKey, pszPath in RUN_OUTPUT_MANIFEST.items()
+        if os.path.dirname(pszKey) == pszDirectoryKey
+    )
+
+
+# "Output:" として表示したファイル (--output-manifest で呼び出し元へ渡す成果物)
+REPORTED_OUTPUT_PATHS: List[str] = []
+
+
+def report_output_file(pszPath: str) -> None:
+    print(f"Output: {pszPath}")
+    REPORTED_OUTPUT_PATHS.append(pszPath)
+
+
+def move_output_file(pszSourcePath: str, pszDestinationPath: str) -> None:
+    # 移動先が同じファイルへのハードリンクの場合、rename は何もしないため移動元を削除する
+    if os.path.isfile(pszDestinationPath) and os.path.samefile(pszSourcePath, pszDestinationPath):
+        os.remove(pszSourcePath)
+    else:
+        shutil.move(pszSourcePath, pszDestinationPath)
+    record_removed_file(pszSourcePath)
+    record_created_file(pszDestinationPath)
+
+
+def copy_output_file(pszSourcePath: str, pszDestinationPath: str) -> None:
+    shutil.copy2(pszSourcePath, pszDestinationPath)
+    record_created_file(pszDestinationPath)
+
+
+def link_output_file(pszSourcePath: str, pszLinkPath: str) -> None:
+    # 同じ内容を 2 か所に置く。ハードリンクを作れない場合 (別ドライブなど) はコピーする
+    if os.path.lexists(pszLinkPath):
+        os.remove(pszLinkPath)
+    try:
+        os.link(pszSourcePath, pszLinkPath)
+    except OSError:
+        shutil.copy2(pszSourcePath, pszLinkPath)
+    else:
+        HARD_LINKED_OUTPUT_KEYS.add(get_tsv_rows_cache_key(pszSourcePath))
+        HARD_LINKED_OUTPUT_KEYS.add(get_tsv_rows_cache_key(pszLinkPath))
+    record_created_file(pszLinkPath)
+
+
+def unlink_hard_linked_output_file(pszPath: str) -> None:
+    # ハードリンクしたファイルへ書き込むと、リンク先の内容まで変わるため先に削除する
+    pszKey: str = get_tsv_rows_cache_key(pszPath)
+    if pszKey not in HARD_LINKED_OUTPUT_KEYS:
+        return
+    HARD_LINKED_OUTPUT_KEYS.discard(pszKey)
+    if os.path.lexists(pszPath):
+        os.remove(pszPath)
 
 
 def month_to_ordinal(objMonth: Tuple[int, int]) -> int:
@@ -2281,12 +3314,13 @@ def write_cp_previous_period_range_file(
 
     with open(pszOutputPath, "w", encoding="utf-8", newline="") as objFile:
         objFile.write("\n".join(objLines) + "\n")
+    record_created_file(pszOutputPath)
 
     if EXECUTION_ROOT_DIRECTORY:
         pszPeriodDirectory = os.path.join(EXECUTION_ROOT_DIRECTORY, "期間")
         os.makedirs(pszPeriodDirectory, exist_ok=True)
         pszCopyPath = os.path.join(pszPeriodDirectory, os.path.basename(pszOutputPath))
-        shutil.copy2(pszOutputPath, pszCopyPath)
+        copy_output_file(pszOutputPath, pszCopyPath)
 
     return pszOutputPath
 
@@ -2410,13 +3444,126 @@ def try_parse_float(pszText: str) -> Optional[float]:
         return None
 
 
+# read_tsv_rows / write_tsv_rows で共有する解析済みTSVのキャッシュ (プロセス内)。
+# キーはパス、値は (mtime, サイズ, inode, 行, 概算バイト数)。ファイルが更新されると stat が変わり読み直す。
+TSV_ROWS_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+TSV_ROWS_CACHE: "OrderedDict[str, Tuple[int, int, int, List[List[str]], int]]" = OrderedDict()
+TSV_ROWS_CACHE_BYTES: int = 0
+
+
+def get_tsv_rows_cache_key(pszPath: str) -> str:
+    return os.path.normcase(os.path.abspath(pszPath))
+
+
+def discard_cached_tsv_rows(pszPath: str) -> None:
+    global TSV_ROWS_CACHE_BYTES
+    objEntry = TSV_ROWS_CACHE.pop(get_tsv_rows_cache_key(pszPath), None)
+    if objEntry is not None:
+        TSV_ROWS_CACHE_BYTES -= objEntry[4]
+
+
+def store_cached_tsv_rows(pszPath: str, objRows: List[List[str]], iByteCount: int) -> None:
+    global TSV_ROWS_CACHE_BYTES
+    discard_cached_tsv_rows(pszPath)
+    if iByteCount > TSV_ROWS_CACHE_MAX_BYTES:
+        return
+    try:
+        objStat = os.stat(pszPath)
+    except OSError:
+        return
+    TSV_ROWS_CACHE[get_tsv_rows_cache_key(pszPath)] = (
+        objStat.st_mtime_ns,
+        objStat.st_size,
+        objStat.st_ino,
+        objRows,
+        iByteCount,
+    )
+    TSV_ROWS_CACHE_BYTES += iByteCount
+    while TSV_ROWS_CACHE_BYTES > TSV_ROWS_CACHE_MAX_BYTES and TSV_ROWS_CACHE:
+        _, objOldEntry = TSV_ROWS_CACHE.popitem(last=False)
+        TSV_ROWS_CACHE_BYTES -= objOldEntry[4]
+
+
+# 後で削除される中間TSV (CP別 step0006〜step0008 など) を書き出さずに保持するストア。
+# write_tsv_rows はここへ入れ、read_tsv_rows / tsv_file_exists / copy_tsv_file はここを先に見る。
+# cleanup_cp_step_intermediate_tsv_files で破棄し、残ったものだけ flush_deferred_tsv_artifacts で書き出す。
+DEFERRED_TSV_ARTIFACTS: Dict[str, List[List[str]]] = {}
+DEFERRED_TSV_DIRECTORY: Optional[str] = None
+DEFERRED_TSV_PATTERNS: List[re.Pattern[str]] = []
+
+
+def begin_deferred_tsv_artifacts(pszDirectory: str, objPatterns: List[re.Pattern[str]]) -> None:
+    global DEFERRED_TSV_DIRECTORY
+    global DEFERRED_TSV_PATTERNS
+    DEFERRED_TSV_DIRECTORY = get_tsv_rows_cache_key(pszDirectory)
+    DEFERRED_TSV_PATTERNS = list(objPatterns)
+
+
+def is_deferred_tsv_path(pszPath: str) -> bool:
+    if DEFERRED_TSV_DIRECTORY is None:
+        return False
+    if os.path.dirname(get_tsv_rows_cache_key(pszPath)) != DEFERRED_TSV_DIRECTORY:
+        return False
+    pszFileName: str = os.path.basename(pszPath)
+    return any(objPattern.match(pszFileName) for objPattern in DEFERRED_TSV_PATTERNS)
+
+
+def tsv_file_exists(pszPath: str) -> bool:
+    return get_tsv_rows_cache_key(pszPath) in DEFERRED_TSV_ARTIFACTS or os.path.isfile(pszPath)
+
+
+def copy_tsv_file(pszSourcePath: str, pszTargetPath: str) -> None:
+    objRows: Optional[List[List[str]]] = DEFERRED_TSV_ARTIFACTS.get(get_tsv_rows_cache_key(pszSourcePath))
+    if objRows is None:
+        copy_output_file(pszSourcePath, pszTargetPath)
+        return
+    write_tsv_rows(pszTargetPath, objRows)
+
+
+def discard_deferred_tsv_artifacts(pszDirectory: str, objPatterns: List[re.Pattern[str]]) -> None:
+    pszDirectoryKey: str = get_tsv_rows_cache_key(pszDirectory)
+    for pszKey in list(DEFERRED_TSV_ARTIFACTS):
+        if os.path.dirname(pszKey) != pszDirectoryKey:
+            continue
+        if any(objPattern.match(os.path.basename(pszKey)) for objPattern in objPatterns):
+            del DEFERRED_TSV_ARTIFACTS[pszKey]
+
+
+def flush_deferred_tsv_artifacts() -> None:
+    global DEFERRED_TSV_DIRECTORY
+    DEFERRED_TSV_DIRECTORY = None
+    DEFERRED_TSV_PATTERNS.clear()
+    for pszKey, objRows in list(DEFERRED_TSV_ARTIFACTS.items()):
+        write_tsv_rows(pszKey, objRows)
+    DEFERRED_TSV_ARTIFACTS.clear()
+
+
 def read_tsv_rows(pszPath: str) -> List[List[str]]:
+    # 呼び出し側が行を書き換えても良いように、キャッシュからは行ごとの複製を返す
+    pszKey: str = get_tsv_rows_cache_key(pszPath)
+    objDeferredRows: Optional[List[List[str]]] = DEFERRED_TSV_ARTIFACTS.get(pszKey)
+    if objDeferredRows is not None:
+        return [list(objRow) for objRow in objDeferredRows]
+    objEntry = TSV_ROWS_CACHE.get(pszKey)
+    if objEntry is not None:
+        try:
+            objStat = os.stat(pszPath)
+        except OSError:
+            objStat = None
+        if objStat is not None and (objStat.st_mtime_ns, objStat.st_size, objStat.st_ino) == objEntry[:3]:
+            TSV_ROWS_CACHE.move_to_end(pszKey)
+            return [list(objRow) for objRow in objEntry[3]]
+        discard_cached_tsv_rows(pszPath)
+
     objRows: List[List[str]] = []
+    iByteCount: int = 0
     with open(pszPath, "r", encoding="utf-8", newline="") as objFile:
         for pszLine in objFile:
             pszLineText: str = pszLine.rstrip("\n").rstrip("\r")
             objRows.append(pszLineText.split("\t") if pszLineText != "" else [""])
-    return objRows
+            iByteCount += len(pszLine)
+    store_cached_tsv_rows(pszPath, objRows, iByteCount)
+    return [list(objRow) for objRow in objRows]
 
 
 def sum_tsv_rows(objBaseRows: List[List[str]], objAddRows: List[List[str]]) -> List[List[str]]:
@@ -2492,17 +3639,13 @@ def can_use_simple_position_sum(
     if len(objBaseRows) != len(objAddRows):
         return False
 
-    objManhourColumns: set[str] = {
-        "工数",
-        "1Cカンパニー販管費の工数",
-        "2Cカンパニー販管費の工数",
-        "3Cカンパニー販管費の工数",
-        "4Cカンパニー販管費の工数",
-        "事業開発カンパニー販管費の工数",
-    }
-
     iRowCount: int = len(objBaseRows)
     objHeader: List[str] = objBaseRows[0] if objBaseRows else []
+    objManhourColumnIndices: set[int] = {
+        iColumnIndex
+        for iColumnIndex, pszColumnName in enumerate(objHeader)
+        if pszColumnName in PL_TABLE_MANHOUR_COLUMN_NAMES
+    }
     for iRowIndex in range(iRowCount):
         objBaseRow: List[str] = objBaseRows[iRowIndex]
         objAddRow: List[str] = objAddRows[iRowIndex]
@@ -2517,8 +3660,7 @@ def can_use_simple_position_sum(
         for iColumnIndex in range(1, len(objBaseRow)):
             pszBaseValue: str = objBaseRow[iColumnIndex].strip()
             pszAddValue: str = objAddRow[iColumnIndex].strip()
-            pszColumnName: str = objHeader[iColumnIndex] if iColumnIndex < len(objHeader) else ""
-            if pszColumnName in objManhourColumns:
+            if iColumnIndex in objManhourColumnIndices:
                 if not is_time_text_or_blank(pszBaseValue):
                     return False
                 if not is_time_text_or_blank(pszAddValue):
@@ -2540,26 +3682,21 @@ def sum_tsv_rows_by_position(
     if not objAddRows:
         return objBaseRows
 
-    objManhourColumns: set[str] = {
-        "工数",
-        "1Cカンパニー販管費の工数",
-        "2Cカンパニー販管費の工数",
-        "3Cカンパニー販管費の工数",
-        "4Cカンパニー販管費の工数",
-        "事業開発カンパニー販管費の工数",
-    }
-
     objHeader: List[str] = objBaseRows[0] if objBaseRows else []
+    objManhourColumnIndices: set[int] = {
+        iColumnIndex
+        for iColumnIndex, pszColumnName in enumerate(objHeader)
+        if pszColumnName in PL_TABLE_MANHOUR_COLUMN_NAMES
+    }
     iRowCount: int = len(objBaseRows)
     for iRowIndex in range(1, iRowCount):
         objBaseRow: List[str] = objBaseRows[iRowIndex]
         objAddRow: List[str] = objAddRows[iRowIndex]
         for iColumnIndex in range(1, len(objBaseRow)):
-            pszColumnName: str = objHeader[iColumnIndex] if iColumnIndex < len(objHeader) else ""
-            if pszColumnName in objManhourColumns:
-                fBaseSeconds: float = parse_time_to_seconds(objBaseRow[iColumnIndex])
-                fAddSeconds: float = parse_time_to_seconds(objAddRow[iColumnIndex])
-                objBaseRow[iColumnIndex] = format_seconds_as_time_text(fBaseSeconds + fAddSeconds)
+            if iColumnIndex in objManhourColumnIndices:
+                iBaseSeconds: int = parse_time_to_int_seconds(objBaseRow[iColumnIndex])
+                iAddSeconds: int = parse_time_to_int_seconds(objAddRow[iColumnIndex])
+                objBaseRow[iColumnIndex] = format_seconds_as_time_text(iBaseSeconds + iAddSeconds)
                 continue
             fBase: float = try_parse_float(objBaseRow[iColumnIndex]) or 0.0
             fAdd: float = try_parse_float(objAddRow[iColumnIndex]) or 0.0
@@ -2569,10 +3706,324 @@ def sum_tsv_rows_by_position(
 
 
 
+class TsvRowsAccumulator:
+    # 月次TSVを順に足し合わせる。結果は、前から順に
+    # can_use_simple_position_sum が True なら sum_tsv_rows_by_position、そうでなければ sum_tsv_rows
+    # を適用した場合と同じになる。
+    # 各月のセルは追加時に 1 回だけ数値化し、行 × 列 の行列で持つ。
+    # 行はキー (1 列目) と同じキーの中での出現順で合わせ、列は位置で合わせる。
+    # 足し合わせたセルは to_rows() で文字列に整形する (それまでは整形後の値を読み直した値で持つ)。
+    # 数値として読めないセルは「空欄なら後の月の値を入れ、空欄でなければそのまま」。
+    def __init__(self) -> None:
+        self.objLabels: List[str] = []
+        self.objLengths: List[int] = []
+        self.objKeyIndices: Dict[str, List[int]] = {}
+        self.objTexts: np.ndarray = np.empty((0, 0), dtype=object)
+        self.objValues: np.ndarray = np.zeros((0, 0), dtype=np.float64)
+        self.objNumeric: np.ndarray = np.zeros((0, 0), dtype=bool)
+        self.objBlank: np.ndarray = np.ones((0, 0), dtype=bool)
+        self.objFormatted: np.ndarray = np.zeros((0, 0), dtype=bool)
+
+    @staticmethod
+    def parse_rows(
+        objRows: List[List[str]],
+        iColumnCount: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # 1 列目を除くセルを (文字列, 数値, 数値として読めるか, 空欄か) の行列にする
+        objTextRows: List[List[str]] = []
+        objValueRows: List[List[float]] = []
+        objNumericRows: List[List[bool]] = []
+        objBlankRows: List[List[bool]] = []
+        for objRow in objRows:
+            iLength: int = len(objRow)
+            objTextRow: List[str] = [""] + objRow[1:] + [""] * (iColumnCount - max(iLength, 1))
+            objValueRow: List[float] = [0.0] * iColumnCount
+            objNumericRow: List[bool] = [False] * iColumnCount
+            objBlankRow: List[bool] = [True] * iColumnCount
+            for iColumnIndex in range(1, iLength):
+                # float() も前後の空白を無視するため、try_parse_float と同じ結果になる
+                pszText: str = objRow[iColumnIndex]
+                try:
+                    objValueRow[iColumnIndex] = float(pszText)
+                except ValueError:
+                    if pszText.strip() != "":
+                        objBlankRow[iColumnIndex] = False
+                    continue
+                objNumericRow[iColumnIndex] = True
+                objBlankRow[iColumnIndex] = False
+            objTextRows.append(objTextRow)
+            objValueRows.append(objValueRow)
+            objNumericRows.append(objNumericRow)
+            objBlankRows.append(objBlankRow)
+        objTexts: np.ndarray = np.empty((len(objRows), iColumnCount), dtype=object)
+        if objTextRows and iColumnCount > 0:
+            objTexts[:, :] = objTextRows
+        return (
+            objTexts,
+            np.array(objValueRows, dtype=np.float64).reshape(len(objRows), iColumnCount),
+            np.array(objNumericRows, dtype=bool).reshape(len(objRows), iColumnCount),
+            np.array(objBlankRows, dtype=bool).reshape(len(objRows), iColumnCount),
+        )
+
+    def ensure_shape(self, iRowCount: int, iColumnCount: int) -> None:
+        iOldRowCount, iOldColumnCount = self.objValues.shape
+        if iRowCount <= iOldRowCount and iColumnCount <= iOldColumnCount:
+            return
+        iNewRowCount: int = max(iRowCount, iOldRowCount)
+        iNewColumnCount: int = max(iColumnCount, iOldColumnCount)
+
+        def grow(objArray: np.ndarray, objFill: object) -> np.ndarray:
+            objGrown: np.ndarray = np.full((iNewRowCount, iNewColumnCount), objFill, dtype=objArray.dtype)
+            objGrown[:iOldRowCount, :iOldColumnCount] = objArray
+            return objGrown
+
+        self.objTexts = grow(self.objTexts, "")
+        self.objValues = grow(self.objValues, 0.0)
+        self.objNumeric = grow(self.objNumeric, False)
+        self.objBlank = grow(self.objBlank, True)
+        self.objFormatted = grow(self.objFormatted, False)
+
+    def append_rows(
+        self,
+        objRows: List[List[str]],
+        objParsed: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        objRowIndices: List[int],
+    ) -> None:
+        # objRows[objRowIndices] を末尾に追加する (sum_tsv_rows の「対応する行が無い」場合)
+        iStartRowIndex: int = len(self.objLabels)
+        self.ensure_shape(iStartRowIndex + len(objRowIndices), objParsed[0].shape[1])
+        iEndRowIndex: int = iStartRowIndex + len(objRowIndices)
+        iColumnCount: int = objParsed[0].shape[1]
+        objTexts, objValues, objNumeric, objBlank = objParsed
+        self.objTexts[iStartRowIndex:iEndRowIndex, :iColumnCount] = objTexts[objRowIndices]
+        self.objValues[iStartRowIndex:iEndRowIndex, :iColumnCount] = objValues[objRowIndices]
+        self.objNumeric[iStartRowIndex:iEndRowIndex, :iColumnCount] = objNumeric[objRowIndices]
+        self.objBlank[iStartRowIndex:iEndRowIndex, :iColumnCount] = objBlank[objRowIndices]
+        for iOffset, iRowIndex in enumerate(objRowIndices):
+            objRow: List[str] = objRows[iRowIndex]
+            pszLabel: str = objRow[0] if objRow else ""
+            self.objLabels.append(pszLabel)
+            self.objLengths.append(len(objRow))
+            self.objKeyIndices.setdefault(pszLabel, []).append(iStartRowIndex + iOffset)
+
+    def row_text(self, iRowIndex: int) -> List[str]:
+        iLength: int = self.objLengths[iRowIndex]
+        if iLength == 0:
+            return []
+        objRow: List[str] = [self.objLabels[iRowIndex]]
+        for iColumnIndex in range(1, iLength):
+            if self.objFormatted[iRowIndex, iColumnIndex]:
+                objRow.append(format_number(float(self.objValues[iRowIndex, iColumnIndex])))
+            else:
+                objRow.append(self.objTexts[iRowIndex, iColumnIndex])
+        return objRow
+
+    def to_rows(self) -> List[List[str]]:
+        return [self.row_text(iRowIndex) for iRowIndex in range(len(self.objLabels))]
+
+    def add(self, objRows: List[List[str]]) -> None:
+        if not self.objLabels:
+            # 最初の月 (または、ここまでの合計が空の場合) はそのまま複製する
+            iColumnCount: int = max((len(objRow) for objRow in objRows), default=0)
+            self.append_rows(objRows, self.parse_rows(objRows, iColumnCount), list(range(len(objRows))))
+            return
+        if not objRows:
+            return
+        iColumnCount = max(max(len(objRow) for objRow in objRows), self.objValues.shape[1])
+        objParsed: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] = self.parse_rows(objRows, iColumnCount)
+        self.ensure_shape(len(self.objLabels), iColumnCount)
+        if self.can_add_by_position(objRows, objParsed):
+            self.add_by_position(objParsed)
+        else:
+            self.add_by_key(objRows, objParsed)
+
+    def manhour_column_mask(self, iColumnCount: int) -> np.ndarray:
+        objHeader: List[str] = self.row_text(0)
+        return np.array(
+            [
+                1 <= iColumnIndex < len(objHeader) and objHeader[iColumnIndex] in PL_TABLE_MANHOUR_COLUMN_NAMES
+                for iColumnIndex in range(iColumnCount)
+            ],
+            dtype=bool,
+        )
+
+    def can_add_by_position(
+        self,
+        objRows: List[List[str]],
+        objParsed: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    ) -> bool:
+        # can_use_simple_position_sum と同じ判定
+        iRowCount: int = len(self.objLabels)
+        if len(objRows) != iRowCount:
+            return False
+        for iRowIndex, objRow in enumerate(objRows):
+            if len(objRow) != self.objLengths[iRowIndex]:
+                return False
+            if iRowIndex == 0:
+                if objRow != self.row_text(0):
+                    return False
+                continue
+            if (objRow[0] if objRow else "") != self.objLabels[iRowIndex]:
+                return False
+
+        objTexts, _, objNumeric, objBlank = objParsed
+        iColumnCount: int = objTexts.shape[1]
+        objManhourColumns: np.ndarray = self.manhour_column_mask(iColumnCount)
+        objOtherColumns: np.ndarray = ~objManhourColumns
+        objOtherColumns[:1] = False
+        objBaseNumeric: np.ndarray = self.objNumeric[1:iRowCount, :iColumnCount] | self.objBlank[1:iRowCount, :iColumnCount]
+        objAddNumeric: np.ndarray = objNumeric[1:] | objBlank[1:]
+        if not (objBaseNumeric[:, objOtherColumns].all() and objAddNumeric[:, objOtherColumns].all()):
+            return False
+        for iColumnIndex in np.nonzero(objManhourColumns)[0].tolist():
+            for iRowIndex in range(1, iRowCount):
+                if iColumnIndex >= self.objLengths[iRowIndex]:
+                    continue
+                if self.objFormatted[iRowIndex, iColumnIndex]:
+                    return False
+                if not is_time_text_or_blank(self.objTexts[iRowIndex, iColumnIndex]):
+                    return False
+                if not is_time_text_or_blank(objTexts[iRowIndex, iColumnIndex]):
+                    return False
+        return True
+
+    def add_by_position(self, objParsed: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> None:
+        # sum_tsv_rows_by_position と同じ計算 (行・列の並びは同じ)
+        objTexts, objValues, _, _ = objParsed
+        iRowCount: int = len(self.objLabels)
+        iColumnCount: int = objTexts.shape[1]
+        objLengths: np.ndarray = np.array(self.objLengths, dtype=np.int64)
+        objInRow: np.ndarray = np.arange(iColumnCount)[None, :] < objLengths[1:, None]
+        objManhourColumns: np.ndarray = self.manhour_column_mask(iColumnCount)
+        objNumberCells: np.ndarray = objInRow & ~objManhourColumns[None, :]
+        objNumberCells[:, :1] = False
+        objRowIndices, objColumnIndices = np.nonzero(objNumberCells)
+        objRowIndices += 1
+        self.objValues[objRowIndices, objColumnIndices] = normalize_formatted_numbers(
+            self.objValues[objRowIndices, objColumnIndices] + objValues[objRowIndices, objColumnIndices]
+        )
+        self.objFormatted[objRowIndices, objColumnIndices] = True
+        self.objNumeric[objRowIndices, objColumnIndices] = True
+        self.objBlank[objRowIndices, objColumnIndices] = False
+
+        for iColumnIndex in np.nonzero(objManhourColumns)[0].tolist():
+            for iRowIndex in range(1, iRowCount):
+                if iColumnIndex >= self.objLengths[iRowIndex]:
+                    continue
+                self.objTexts[iRowIndex, iColumnIndex] = format_seconds_as_time_text(
+                    parse_time_to_int_seconds(self.objTexts[iRowIndex, iColumnIndex])
+                    + parse_time_to_int_seconds(objTexts[iRowIndex, iColumnIndex])
+                )
+                self.objValues[iRowIndex, iColumnIndex] = 0.0
+                self.objNumeric[iRowIndex, iColumnIndex] = False
+                self.objBlank[iRowIndex, iColumnIndex] = False
+
+    def add_by_key(
+        self,
+        objRows: List[List[str]],
+        objParsed: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    ) -> None:
+        # sum_tsv_rows と同じ計算。行は (キー, 同じキーの中での出現順) で合わせる。
+        objTexts, objValues, objNumeric, objBlank = objParsed
+        iColumnCount: int = objTexts.shape[1]
+
+        # 見出し行: 空欄の見出しだけ後の月の見出しで埋める
+        objHeader: List[str] = objRows[0]
+        pszOldHeaderLabel: str = self.objLabels[0]
+        self.objLengths[0] = max(self.objLengths[0], len(objHeader))
+        if self.objLengths[0] > 0 and pszOldHeaderLabel.strip() == "" and objHeader and objHeader[0].strip() != "":
+            self.objLabels[0] = objHeader[0]
+        for iColumnIndex in range(1, len(objHeader)):
+            if self.objBlank[0, iColumnIndex] and not objBlank[0, iColumnIndex]:
+                self.objTexts[0, iColumnIndex] = objTexts[0, iColumnIndex]
+                self.objValues[0, iColumnIndex] = objValues[0, iColumnIndex]
+                self.objNumeric[0, iColumnIndex] = objNumeric[0, iColumnIndex]
+                self.objBlank[0, iColumnIndex] = False
+                self.objFormatted[0, iColumnIndex] = False
+
+        objTargetIndices: List[int] = []
+        objSourceIndices: List[int] = []
+        objNewRowIndices: List[int] = []
+        objCursors: Dict[str, int] = {}
+        for iRowIndex in range(1, len(objRows)):
+            objRow: List[str] = objRows[iRowIndex]
+            pszKey: str = objRow[0] if objRow else ""
+            iCursor: int = objCursors.get(pszKey, 0)
+            objCursors[pszKey] = iCursor + 1
+            objIndices: List[int] = self.objKeyIndices.get(pszKey, [])
+            if iCursor < len(objIndices):
+                iTargetIndex: int = objIndices[iCursor]
+                objTargetIndices.append(iTargetIndex)
+                objSourceIndices.append(iRowIndex)
+                self.objLengths[iTargetIndex] = max(self.objLengths[iTargetIndex], len(objRow))
+            else:
+                objNewRowIndices.append(iRowIndex)
+
+        if objTargetIndices:
+            objTargets: np.ndarray = np.array(objTargetIndices, dtype=np.int64)
+            objSources: np.ndarray = np.array(objSourceIndices, dtype=np.int64)
+            objBaseValues: np.ndarray = self.objValues[objTargets, :iColumnCount]
+            objBaseNumeric: np.ndarray = self.objNumeric[objTargets, :iColumnCount]
+            objBaseBlank: np.ndarray = self.objBlank[objTargets, :iColumnCount]
+            objAddValues: np.ndarray = objValues[objSources]
+            objAddNumeric: np.ndarray = objNumeric[objSources]
+            objAddBlank: np.ndarray = objBlank[objSources]
+
+            objBoth: np.ndarray = objBaseNumeric & objAddNumeric
+            objFillNumber: np.ndarray = ~objBaseNumeric & objBaseBlank & objAddNumeric
+            objFillText: np.ndarray = ~objBaseNumeric & objBaseBlank & ~objAddNumeric & ~objAddBlank
+            objBoth[:, :1] = False
+            objFillNumber[:, :1] = False
+            objFillText[:, :1] = False
+
+            objNewValues: np.ndarray = objBaseValues.copy()
+            objChanged: np.ndarray = objBoth | objFillNumber
+            objSums: np.ndarray = np.where(objBoth, objBaseValues + objAddValues, objAddValues)
+            objNewValues[objChanged] = normalize_formatted_numbers(objSums[objChanged])
+            self.objValues[objTargets, :iColumnCount] = objNewValues
+            self.objNumeric[objTargets, :iColumnCount] = objBaseNumeric | objChanged
+            self.objBlank[objTargets, :iColumnCount] = objBaseBlank & ~objChanged & ~objFillText
+            self.objFormatted[objTargets, :iColumnCount] |= objChanged
+            objBaseTexts: np.ndarray = self.objTexts[objTargets, :iColumnCount]
+            objBaseTexts[objFillText] = objTexts[objSources][objFillText]
+            self.objTexts[objTargets, :iColumnCount] = objBaseTexts
+
+        # 見出しの 1 列目が変わった場合は、次の月からは新しいキーで引く
+        if self.objLabels[0] != pszOldHeaderLabel:
+            self.objKeyIndices[pszOldHeaderLabel].remove(0)
+            self.objKeyIndices.setdefault(self.objLabels[0], []).insert(0, 0)
+
+        if objNewRowIndices:
+            self.append_rows(objRows, objParsed, objNewRowIndices)
+
+
+
 def write_tsv_rows(pszPath: str, objRows: List[List[str]]) -> None:
+    objLines: List[str] = ["\t".join(objRow) for objRow in objRows]
+    if is_deferred_tsv_path(pszPath) and not any(
+        "\n" in pszLineText or "\r" in pszLineText for pszLineText in objLines
+    ):
+        DEFERRED_TSV_ARTIFACTS[get_tsv_rows_cache_key(pszPath)] = [
+            pszLineText.split("\t") if pszLineText != "" else [""] for pszLineText in objLines
+        ]
+        return
+    DEFERRED_TSV_ARTIFACTS.pop(get_tsv_rows_cache_key(pszPath), None)
+    unlink_hard_linked_output_file(pszPath)
     with open(pszPath, "w", encoding="utf-8", newline="") as objFile:
-        for objRow in objRows:
-            objFile.write("\t".join(objRow) + "\n")
+        for pszLineText in objLines:
+            objFile.write(pszLineText + "\n")
+    record_created_file(pszPath)
+
+    # 書き出した内容を read_tsv_rows で読み直した場合と同じ行としてキャッシュする。
+    # セル内に改行を含む場合は行の区切りが変わるため、キャッシュせずに読み直させる。
+    if any("\n" in pszLineText or "\r" in pszLineText for pszLineText in objLines):
+        discard_cached_tsv_rows(pszPath)
+        return
+    store_cached_tsv_rows(
+        pszPath,
+        [pszLineText.split("\t") if pszLineText != "" else [""] for pszLineText in objLines],
+        sum(len(pszLineText) + 1 for pszLineText in objLines),
+    )
 
 
 def format_sales_ratio(fValue: float) -> str:
@@ -2950,15 +4401,19 @@ def find_column_index(objHeader: List[str], pszName: str) -> int:
 
 
 def is_company_project(pszProjectName: str) -> bool:
-    return re.match(r"^C\d{3}_", pszProjectName) is not None
+    return classify_project_name(pszProjectName)[1] == "company"
 
 
 def is_summary_project(pszProjectName: str) -> bool:
-    return pszProjectName.startswith("合計")
+    return classify_project_name(pszProjectName)[1] == "summary"
 
 
 def is_project_code(pszProjectName: str, pszPrefix: str, iDigits: int) -> bool:
-    return re.match(rf"^{pszPrefix}\d{{{iDigits}}}_", pszProjectName) is not None
+    objPattern: Optional[re.Pattern[str]] = PROJECT_CODE_PATTERNS.get((pszPrefix, iDigits))
+    if objPattern is None:
+        objPattern = re.compile(rf"^{pszPrefix}\d{{{iDigits}}}_")
+        PROJECT_CODE_PATTERNS[(pszPrefix, iDigits)] = objPattern
+    return objPattern.match(pszProjectName) is not None
 
 
 def collect_project_rows(
@@ -2985,12 +4440,14 @@ def build_project_rows_for_summary(
     objCandidateRows: List[List[str]] = collect_project_rows(objRows, iProjectNameColumnIndex)
     objOrderedRows: List[List[str]] = []
     objRules: List[Tuple[str, int]] = [("J", 3), ("P", 5)]
+    objNames: List[str] = [
+        objRow[iProjectNameColumnIndex] if 0 <= iProjectNameColumnIndex < len(objRow) else ""
+        for objRow in objCandidateRows
+    ]
+    objClasses = classify_project_names(objNames)
     for pszPrefix, iDigits in objRules:
-        for objRow in objCandidateRows:
-            pszName: str = ""
-            if 0 <= iProjectNameColumnIndex < len(objRow):
-                pszName = objRow[iProjectNameColumnIndex]
-            if pszName == "" or is_company_project(pszName) or is_summary_project(pszName):
+        for objRow, pszName, objClass in zip(objCandidateRows, objNames, objClasses):
+            if pszName == "" or objClass[1] in ("company", "summary"):
                 continue
             if is_project_code(pszName, pszPrefix, iDigits):
                 objOrderedRows.append(objRow)
@@ -3280,101 +4737,17 @@ def combine_company_sg_admin_columns(
 
 
 def load_org_table_group_map(pszOrgTablePath: str) -> Dict[str, str]:
-    objGroupMap: Dict[str, str] = {}
-    if not os.path.isfile(pszOrgTablePath):
-        return objGroupMap
-
-    objRows = read_tsv_rows(pszOrgTablePath)
-    if not objRows:
-        return objGroupMap
-
-    objHeader = objRows[0]
-    iCodeIndex = find_column_index(objHeader, "PJコード")
-    objGroupColumnCandidates = ["計上グループ名", "計上グループ"]
-    iGroupIndex = -1
-    for pszColumn in objGroupColumnCandidates:
-        iGroupIndex = find_column_index(objHeader, pszColumn)
-        if iGroupIndex >= 0:
-            break
-
-    iStartIndex = 0
-    if iCodeIndex >= 0:
-        if iGroupIndex < 0:
-            iGroupIndex = iCodeIndex + 2
-        iStartIndex = 1
-    else:
-        iCodeIndex = 2
-        iGroupIndex = 4
-
-    for objRow in objRows[iStartIndex:]:
-        if iCodeIndex >= len(objRow) or iGroupIndex >= len(objRow):
-            continue
-        pszProjectCode: str = objRow[iCodeIndex].strip()
-        pszGroupName: str = objRow[iGroupIndex].strip()
-        if not pszProjectCode:
-            continue
-
-        objMatch = re.match(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectCode)
-        if objMatch is None:
-            objMatch = re.match(r"^(P\d{5}|[A-OQ-Z]\d{3})", pszProjectCode)
-        if objMatch is None:
-            continue
-        pszPrefix: str = objMatch.group(1)
-        if not pszPrefix.endswith("_"):
-            pszPrefix += "_"
-        if pszPrefix not in objGroupMap:
-            objGroupMap[pszPrefix] = pszGroupName
-
-    return objGroupMap
+    objIndex: Optional[OrgTableIndex] = get_org_table_index(pszOrgTablePath)
+    if objIndex is None:
+        return {}
+    return objIndex.objGroupMap
 
 
 def load_org_table_company_map(pszOrgTablePath: str) -> Dict[str, str]:
-    objCompanyMap: Dict[str, str] = {}
-    if not os.path.isfile(pszOrgTablePath):
-        return objCompanyMap
-
-    objRows = read_tsv_rows(pszOrgTablePath)
-    if not objRows:
-        return objCompanyMap
-
-    objHeader = objRows[0]
-    iCodeIndex = find_column_index(objHeader, "PJコード")
-    objCompanyColumnCandidates = ["計上カンパニー名", "計上カンパニー"]
-    iCompanyIndex = -1
-    for pszColumn in objCompanyColumnCandidates:
-        iCompanyIndex = find_column_index(objHeader, pszColumn)
-        if iCompanyIndex >= 0:
-            break
-
-    iStartIndex = 0
-    if iCodeIndex >= 0:
-        if iCompanyIndex < 0:
-            iCompanyIndex = iCodeIndex + 2
-        iStartIndex = 1
-    else:
-        iCodeIndex = 2
-        iCompanyIndex = 4
-
-    for objRow in objRows[iStartIndex:]:
-        if iCodeIndex >= len(objRow) or iCompanyIndex >= len(objRow):
-            continue
-        pszProjectCode: str = objRow[iCodeIndex].strip()
-        pszCompanyName: str = objRow[iCompanyIndex].strip()
-        if not pszProjectCode:
-            continue
-
-        objMatch = re.match(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectCode)
-        if objMatch is None:
-            objMatch = re.match(r"^(P\d{5}|[A-OQ-Z]\d{3})", pszProjectCode)
-        if objMatch is None:
-            continue
-        pszPrefix: str = objMatch.group(1)
-        if not pszPrefix.endswith("_"):
-            pszPrefix += "_"
-        if pszPrefix not in objCompanyMap:
-            objCompanyMap[pszPrefix] = pszCompanyName
-
-    return objCompanyMap
+    objIndex: Optional[OrgTableIndex] = get_org_table_index(pszOrgTablePath)
+    if objIndex is None:
+        return {}
+    return objIndex.objCompanyMap
 
 
 def insert_accounting_group_column(
@@ -3391,9 +4764,8 @@ def insert_accounting_group_column(
             continue
 
         pszGroupName: str = ""
-        objMatch = re.match(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectName)
-        if objMatch is not None:
-            pszPrefix = objMatch.group(1)
+        pszPrefix: Optional[str] = classify_project_name(pszProjectName)[3]
+        if pszPrefix is not None:
             pszGroupName = objGroupMap.get(pszPrefix, "")
         elif pszProjectName == "本部":
             pszGroupName = objGroupMap.get("本部", "")
@@ -3406,42 +4778,17 @@ def insert_accounting_group_column(
 
 
 def get_headquarters_group_from_org_table(pszOrgTablePath: str) -> str:
-    if not os.path.isfile(pszOrgTablePath):
+    objIndex: Optional[OrgTableIndex] = get_org_table_index(pszOrgTablePath)
+    if objIndex is None:
         print(f"Warning: org table not found: {pszOrgTablePath}")
         return ""
-
-    objRows = read_tsv_rows(pszOrgTablePath)
-    if not objRows:
+    if objIndex.bEmpty:
         print(f"Warning: org table empty: {pszOrgTablePath}")
         return ""
-
-    objHeader = objRows[0]
-    iCodeIndex = find_column_index(objHeader, "PJコード")
-    objGroupColumnCandidates = ["計上グループ名", "計上グループ"]
-    iGroupIndex = -1
-    for pszColumn in objGroupColumnCandidates:
-        iGroupIndex = find_column_index(objHeader, pszColumn)
-        if iGroupIndex >= 0:
-            break
-
-    iStartIndex = 0
-    if iCodeIndex >= 0:
-        if iGroupIndex < 0:
-            iGroupIndex = iCodeIndex + 2
-        iStartIndex = 1
-    else:
-        iCodeIndex = 2
-        iGroupIndex = 4
-
-    for objRow in objRows[iStartIndex:]:
-        if iCodeIndex >= len(objRow) or iGroupIndex >= len(objRow):
-            continue
-        if objRow[iCodeIndex].strip() != "本部":
-            continue
-        return objRow[iGroupIndex].strip()
-
-    print("Warning: 本部 row not found in org table.")
-    return ""
+    if objIndex.pszHeadquartersGroup is None:
+        print("Warning: 本部 row not found in org table.")
+        return ""
+    return objIndex.pszHeadquartersGroup
 
 
 def insert_accounting_company_column(
@@ -3458,9 +4805,8 @@ def insert_accounting_company_column(
             continue
 
         pszCompanyName: str = ""
-        objMatch = re.match(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectName)
-        if objMatch is not None:
-            pszPrefix = objMatch.group(1)
+        pszPrefix: Optional[str] = classify_project_name(pszProjectName)[3]
+        if pszPrefix is not None:
             pszCompanyName = objCompanyMap.get(pszPrefix, "")
 
         objOutputRows.append([pszCompanyName] + (objRow if objRow else []))
@@ -3469,39 +4815,10 @@ def insert_accounting_company_column(
 
 
 def get_headquarters_company_from_org_table(pszOrgTablePath: str) -> str:
-    if not os.path.isfile(pszOrgTablePath):
-        return ""
-
-    objRows = read_tsv_rows(pszOrgTablePath)
-    if not objRows:
+    objIndex: Optional[OrgTableIndex] = get_org_table_index(pszOrgTablePath)
+    if objIndex is None:
         return ""
-
-    objHeader = objRows[0]
-    iCodeIndex = find_column_index(objHeader, "PJコード")
-    objCompanyColumnCandidates = ["計上カンパニー名", "計上カンパニー"]
-    iCompanyIndex = -1
-    for pszColumn in objCompanyColumnCandidates:
-        iCompanyIndex = find_column_index(objHeader, pszColumn)
-        if iCompanyIndex >= 0:
-            break
-
-    iStartIndex = 0
-    if iCodeIndex >= 0:
-        if iCompanyIndex < 0:
-            iCompanyIndex = iCodeIndex + 2
-        iStartIndex = 1
-    else:
-        iCodeIndex = 2
-        iCompanyIndex = 3
-
-    for objRow in objRows[iStartIndex:]:
-        if iCodeIndex >= len(objRow) or iCompanyIndex >= len(objRow):
-            continue
-        if objRow[iCodeIndex].strip() != "本部":
-            continue
-        return objRow[iCompanyIndex].strip()
-
-    return ""
+    return objIndex.pszHeadquartersCompany
 
 
 def fill_headquarters_company_in_rows(
@@ -3624,9 +4941,8 @@ def build_step0003_rows_with_debug(
             elif pszProjectName == "":
                 pszReason = "その他の原因"
             else:
-                objMatch = re.match(r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectName)
-                if objMatch is not None:
-                    pszPrefix = objMatch.group(1)
+                pszPrefix = classify_project_name(pszProjectName)[3]
+                if pszPrefix is not None:
                     pszCompanyName = objGroupMap.get(pszPrefix, "")
                     if pszCompanyName == "":
                         pszReason = "管轄PJ表エラー"
@@ -4217,8 +5533,8 @@ def insert_per_hour_rows(
 
     for iColumnIndex in range(1, iColumnCount):
         pszManhour = objManhourRow[iColumnIndex] if iColumnIndex < len(objManhourRow) else ""
-        fSeconds = parse_time_to_seconds(pszManhour)
-        fHours = fSeconds / 3600.0 if fSeconds > 0.0 else 0.0
+        iSeconds: int = parse_time_to_int_seconds(pszManhour)
+        fHours = iSeconds / 3600.0 if iSeconds > 0 else 0.0
         objManhourHoursRow[iColumnIndex] = f"{fHours:.1f}"
         objManhourHmsRow[iColumnIndex] = pszManhour
 
@@ -4430,10 +5746,11 @@ def create_step0007_pl_cr(
                     pszStep0011Path = os.path.join(pszStep0011Directory, pszStep0011Name)
                     objStep0011Rows = build_step0011_rows(objStep0010Rows)
                     write_tsv_rows(pszStep0011Path, objStep0011Rows)
-                    create_pj_summary_pl_cr_manhour_excel(
-                        pszDirectory,
-                        pszColumnName,
-                        pszStep0011Path,
+                    queue_excel_export(
+                        create_pj_summary_pl_cr_manhour_excel,
+                        (pszDirectory, pszColumnName, pszStep0011Path),
+                        [pszStep0011Path],
+                        f"PJサマリ_単・累計_{pszColumnName}.xlsx",
                     )
 
     move_files_to_temp(
@@ -5206,13 +6523,13 @@ def create_pj_summary(
             pszDirectory,
             "0003_PJサマリ_step0001_単月_製造原価報告書.tsv",
         )
-        shutil.copy2(pszSingleCostReportPath, pszCostReportSingleOutputPath)
+        copy_output_file(pszSingleCostReportPath, pszCostReportSingleOutputPath)
     if os.path.isfile(pszCumulativeCostReportPath):
         pszCostReportCumulativeOutputPath: str = os.path.join(
             pszDirectory,
             "0003_PJサマリ_step0001_累計_製造原価報告書.tsv",
         )
-        shutil.copy2(pszCumulativeCostReportPath, pszCostReportCumulativeOutputPath)
+        copy_output_file(pszCumulativeCostReportPath, pszCostReportCumulativeOutputPath)
 
     #//
     #// PJサマリの損益計算書部分の作成
@@ -5265,17 +6582,17 @@ def create_pj_summary(
             pszDirectory,
             "0003_PJサマリ_step0002_単月_製造原価報告書.tsv",
         )
-        shutil.copy2(pszSingleCostReportPath, pszCostReportSingleStep0002Path)
+        copy_output_file(pszSingleCostReportPath, pszCostReportSingleStep0002Path)
         pszCostReportSingleStep0003Path: str = os.path.join(
             pszDirectory,
             "0003_PJサマリ_step0003_単月_製造原価報告書.tsv",
         )
-        shutil.copy2(pszSingleCostReportPath, pszCostReportSingleStep0003Path)
+        copy_output_file(pszSingleCostReportPath, pszCostReportSingleStep0003Path)
         pszCostReportSingleStep0004Path: str = os.path.join(
             pszDirectory,
             "0003_PJサマリ_step0004_単月_製造原価報告書.tsv",
         )
-        shutil.copy2(pszCostReportSingleStep0003Path, pszCostReportSingleStep0004Path)
+        copy_output_file(pszCostReportSingleStep0003Path, pszCostReportSingleStep0004Path)
         pszCostReportSingleStep0004VerticalPath: str = os.path.join(
             pszDirectory,
             "0003_PJサマリ_step0004_単月_製造原価報告書_vertical.tsv",
@@ -5289,17 +6606,17 @@ def create_pj_summary(
             pszDirectory,
             "0003_PJサマリ_step0002_累計_製造原価報告書.tsv",
         )
-        shutil.copy2(pszCumulativeCostReportPath, pszCostReportCumulativeStep0002Path)
+        copy_output_file(pszCumulativeCostReportPath, pszCostReportCumulativeStep0002Path)
         pszCostReportCumulativeStep0003Path: str = os.path.join(
             pszDirectory,
             "0003_PJサマリ_step0003_累計_製造原価報告書.tsv",
         )
-        shutil.copy2(pszCumulativeCostReportPath, pszCostReportCumulativeStep0003Path)
+        copy_output_file(pszCumulativeCostReportPath, pszCostReportCumulativeStep0003Path)
         pszCostReportCumulativeStep0004Path: str = os.path.join(
             pszDirectory,
             "0003_PJサマリ_step0004_累計_製造原価報告書.tsv",
         )
-        shutil.copy2(pszCostReportCumulativeStep0003Path, pszCostReportCumulativeStep0004Path)
+        copy_output_file(pszCostReportCumulativeStep0003Path, pszCostReportCumulativeStep0004Path)
         pszCostReportCumulativeStep0004VerticalPath: str = os.path.join(
             pszDirectory,
             "0003_PJサマリ_step0004_累計_製造原価報告書_vertical.tsv",
@@ -5409,7 +6726,7 @@ def create_pj_summary(
             pszDirectory,
             "0003_PJサマリ_step0006_単月_損益計算書_E∪F.tsv",
         )
-        shutil.copy2(pszSingleCostStep0005Path, pszSingleCostStep0006Path)
+        copy_output_file(pszSingleCostStep0005Path, pszSingleCostStep0006Path)
         objSingleStep0006Rows = insert_per_hour_rows(read_tsv_rows(pszSinglePlStep0005Path))
         write_tsv_rows(pszSinglePlStep0006Path, objSingleStep0006Rows)
 
@@ -5458,7 +6775,7 @@ def create_pj_summary(
             pszDirectory,
             "0003_PJサマリ_step0006_累計_損益計算書_E∪F.tsv",
         )
-        shutil.copy2(pszCumulativeCostStep0005Path, pszCumulativeCostStep0006Path)
+        copy_output_file(pszCumulativeCostStep0005Path, pszCumulativeCostStep0006Path)
         objCumulativeStep0006Rows = insert_per_hour_rows(
             read_tsv_rows(pszCumulativePlStep0005Path)
         )
@@ -5859,12 +7176,185 @@ def create_pj_summary(
             write_tsv_rows(pszGrossProfitFinalPath, objGrossProfitStep0006Rows)
 
 
+class CumulativeReportSource:
+    # 累計レポート用の月次TSVを 1 か月 1 回だけ読み込んで保持する。
+    # 行・列の並び (見出し・行名・行の長さ) が同じ月どうしは月方向の累積和を持ち、
+    # 期間 (開始月〜終了月) の合計を累積和の差で求める。
+    def __init__(self, pszDirectory: str, pszInputPrefix: str) -> None:
+        self.pszDirectory: str = pszDirectory
+        self.pszInputPrefix: str = pszInputPrefix
+        self.objMonthRows: Dict[Tuple[int, int], List[List[str]]] = {}
+        self.objMonthLayouts: Dict[Tuple[int, int], Optional[Tuple[object, ...]]] = {}
+        self.objMonthValues: Dict[Tuple[int, int], np.ndarray] = {}
+        self.objLayoutPrefixSums: Dict[
+            Tuple[object, ...],
+            Tuple[List[Tuple[int, int]], np.ndarray, np.ndarray, np.ndarray],
+        ] = {}
+
+    def load_months(self, objMonths: List[Tuple[int, int]]) -> None:
+        for objMonth in objMonths:
+            if objMonth in self.objMonthRows:
+                continue
+            pszHorizontalPath: str = build_report_file_path(self.pszDirectory, self.pszInputPrefix, objMonth)
+            pszVerticalPath: str = build_report_vertical_file_path(
+                self.pszDirectory,
+                self.pszInputPrefix,
+                objMonth,
+            )
+            if not os.path.isfile(pszHorizontalPath) and not os.path.isfile(pszVerticalPath):
+                continue
+            objRows: Optional[List[List[str]]] = read_report_rows(
+                self.pszDirectory,
+                self.pszInputPrefix,
+                objMonth,
+            )
+            if objRows is None:
+                continue
+            self.objMonthRows[objMonth] = objRows
+            objMatrix = build_position_sum_matrix(objRows)
+            if objMatrix is None:
+                self.objMonthLayouts[objMonth] = None
+                continue
+            self.objMonthLayouts[objMonth] = objMatrix[0]
+            self.objMonthValues[objMonth] = objMatrix[1]
+        self.objLayoutPrefixSums.clear()
+
+    def get_rows(self, objMonth: Tuple[int, int]) -> Optional[List[List[str]]]:
+        objRows: Optional[List[List[str]]] = self.objMonthRows.get(objMonth)
+        if objRows is None:
+            # 読み込めない月は read_report_rows に任せる (見つからない旨の表示を含む)
+            objRows = read_report_rows(self.pszDirectory, self.pszInputPrefix, objMonth)
+        return objRows
+
+    def build_prefix_sums(
+        self,
+        objLayout: Tuple[object, ...],
+    ) -> Tuple[List[Tuple[int, int]], np.ndarray, np.ndarray, np.ndarray]:
+        objPrefixSums = self.objLayoutPrefixSums.get(objLayout)
+        if objPrefixSums is not None:
+            return objPrefixSums
+
+        objMonths: List[Tuple[int, int]] = sorted(
+            objMonth for objMonth, objMonthLayout in self.objMonthLayouts.items() if objMonthLayout == objLayout
+        )
+        # 月 × 行 × 列 の行列 (各月は読み込み時に 1 回だけ数値化してある)
+        objValues: np.ndarray = np.stack([self.objMonthValues[objMonth] for objMonth in objMonths])
+
+        objPrefix: np.ndarray = np.zeros((len(objMonths) + 1,) + objValues.shape[1:], dtype=np.float64)
+        np.cumsum(objValues, axis=0, out=objPrefix[1:])
+        # 整数だけのセルは足す順序によらず誤差が出ないため、累積和の差がそのまま逐次加算の結果になる。
+        # 小数を含むセルは format_number による丸めが途中に入るので、期間ごとに逐次加算する。
+        objExact: np.ndarray = np.all(objValues == np.rint(objValues), axis=0) & (
+            np.abs(objValues).sum(axis=0) < 2.0**53
+        )
+        objPrefixSums = (objMonths, objValues, objPrefix, objExact)
+        self.objLayoutPrefixSums[objLayout] = objPrefixSums
+        return objPrefixSums
+
+    def sum_months(self, objMonths: List[Tuple[int, int]]) -> Optional[List[List[str]]]:
+        objMonthRowsList: List[List[List[str]]] = []
+        for objMonth in objMonths:
+            objRows: Optional[List[List[str]]] = self.get_rows(objMonth)
+            if objRows is None:
+                return None
+            objMonthRowsList.append(objRows)
+
+        objLayout: Optional[Tuple[object, ...]] = self.objMonthLayouts.get(objMonths[0])
+        bPrefixSum: bool = (
+            len(objMonths) >= 2
+            and objLayout is not None
+            and all(self.objMonthLayouts.get(objMonth) == objLayout for objMonth in objMonths)
+        )
+        if not bPrefixSum or objLayout is None:
+            objAccumulator: TsvRowsAccumulator = TsvRowsAccumulator()
+            for objRows in objMonthRowsList:
+                objAccumulator.add(objRows)
+            return objAccumulator.to_rows()
+
+        objFirstRows: List[List[str]] = objMonthRowsList[0]
+        if not objFirstRows:
+            return []
+        objLayoutMonths, objValues, objPrefix, objExact = self.build_prefix_sums(objLayout)
+        iStartIndex: int = objLayoutMonths.index(objMonths[0])
+        iEndIndex: int = iStartIndex + len(objMonths)
+        objTotals: np.ndarray = objPrefix[iEndIndex] - objPrefix[iStartIndex]
+        if not objExact.all():
+            objInexact: np.ndarray = ~objExact
+            objAccumulated: np.ndarray = objValues[iStartIndex][objInexact]
+            for iMonth in range(iStartIndex + 1, iEndIndex):
+                if iMonth > iStartIndex + 1:
+                    objAccumulated = normalize_formatted_numbers(objAccumulated)
+                objAccumulated = objAccumulated + objValues[iMonth][objInexact]
+            objTotals[objInexact] = objAccumulated
+
+        objHeader: List[str] = objFirstRows[0]
+        objManhourColumnIndices: set[int] = {
+            iColumnIndex
+            for iColumnIndex, pszColumnName in enumerate(objHeader)
+            if pszColumnName in PL_TABLE_MANHOUR_COLUMN_NAMES
+        }
+        objTotalValues: List[List[float]] = objTotals.tolist()
+        objTotalRows = [list(objHeader)]
+        for iRowIndex in range(1, len(objFirstRows)):
+            objRow: List[str] = objFirstRows[iRowIndex]
+            objRowTotals: List[float] = objTotalValues[iRowIndex]
+            objTotalRow: List[str] = objRow[:1]
+            for iColumnIndex in range(1, len(objRow)):
+                if iColumnIndex in objManhourColumnIndices:
+                    objTotalRow.append(format_seconds_as_time_text(objRowTotals[iColumnIndex]))
+                else:
+                    objTotalRow.append(format_number(objRowTotals[iColumnIndex]))
+            objTotalRows.append(objTotalRow)
+        return objTotalRows
+
+
+def build_position_sum_matrix(
+    objRows: List[List[str]],
+) -> Optional[Tuple[Tuple[object, ...], np.ndarray]]:
+    # 月次TSVを (並び, 行 × 列 の float64 行列) にする。工数列は整数秒、空欄は 0 とする。
+    # 並び (見出し・行名・行の長さ) が同じ月どうしは、can_use_simple_position_sum が常に True になり
+    # 行列の位置で足し合わせられる。
+    # 数値・時刻として読めないセル (または有限でない数値) がある月は None を返す。
+    if not objRows:
+        return ((), np.zeros((0, 0), dtype=np.float64))
+    objHeader: List[str] = objRows[0]
+    objManhourColumnIndices: set[int] = {
+        iColumnIndex
+        for iColumnIndex, pszColumnName in enumerate(objHeader)
+        if pszColumnName in PL_TABLE_MANHOUR_COLUMN_NAMES
+    }
+    iColumnCount: int = max(len(objRow) for objRow in objRows)
+    objValues: np.ndarray = np.zeros((len(objRows), iColumnCount), dtype=np.float64)
+    objRowKeys: List[Tuple[str, int]] = []
+    for iRowIndex in range(1, len(objRows)):
+        objRow: List[str] = objRows[iRowIndex]
+        objRowValues: List[float] = [0.0] * iColumnCount
+        for iColumnIndex in range(1, len(objRow)):
+            pszValue: str = objRow[iColumnIndex].strip()
+            if pszValue == "":
+                continue
+            if iColumnIndex in objManhourColumnIndices:
+                if not is_time_text_or_blank(pszValue):
+                    return None
+                objRowValues[iColumnIndex] = parse_time_to_int_seconds(pszValue)
+                continue
+            fValue: Optional[float] = try_parse_float(pszValue)
+            if fValue is None or not np.isfinite(fValue):
+                return None
+            objRowValues[iColumnIndex] = fValue
+        objValues[iRowIndex] = objRowValues
+        objRowKeys.append((objRow[0] if objRow else "", len(objRow)))
+    return ((tuple(objHeader), tuple(objRowKeys)), objValues)
+
+
 def create_cumulative_report(
     pszDirectory: str,
     pszPrefix: str,
     objRange: Tuple[Tuple[int, int], Tuple[int, int]],
     pszInputPrefix: Optional[str] = None,
+    objSource: Optional[CumulativeReportSource] = None,
 ) -> None:
+    # objSource: 複数の期間で月次TSVの読み込みと累積和を共有する場合に指定する
     objStart, objEnd = objRange
     objMonths = build_month_sequence(objStart, objEnd)
     if not objMonths:
@@ -5874,31 +7364,30 @@ def create_cumulative_report(
         pszInputPrefix = pszPrefix
 
     objTotalRows: Optional[List[List[str]]] = None
-    for objMonth in objMonths:
-        objRows: Optional[List[List[str]]] = read_report_rows(
-            pszDirectory,
-            pszInputPrefix,
-            objMonth,
-        )
-        if objRows is None:
-            return
-        if objTotalRows is None:
-            objTotalRows = objRows
-        else:
-            if can_use_simple_position_sum(objTotalRows, objRows):
-                objTotalRows = sum_tsv_rows_by_position(objTotalRows, objRows)
-            else:
-                objTotalRows = sum_tsv_rows(objTotalRows, objRows)
+    if objSource is not None:
+        objTotalRows = objSource.sum_months(objMonths)
+    else:
+        objAccumulator: TsvRowsAccumulator = TsvRowsAccumulator()
+        for objMonth in objMonths:
+            objRows: Optional[List[List[str]]] = read_report_rows(
+                pszDirectory,
+                pszInputPrefix,
+                objMonth,
+            )
+            if objRows is None:
+                return
+            objAccumulator.add(objRows)
+        objTotalRows = objAccumulator.to_rows()
 
     if objTotalRows is None:
         return
     pszOutputPath: str = build_cumulative_file_path(pszDirectory, pszPrefix, objStart, objEnd)
     write_tsv_rows(pszOutputPath, objTotalRows)
-    print(f"Output: {pszOutputPath}")
+    report_output_file(pszOutputPath)
     pszVerticalOutputPath: str = pszOutputPath.replace(".tsv", "_vertical.tsv")
     objVerticalRows: List[List[str]] = transpose_rows(objTotalRows)
     write_tsv_rows(pszVerticalOutputPath, objVerticalRows)
-    print(f"Output: {pszVerticalOutputPath}")
+    report_output_file(pszVerticalOutputPath)
 
 
 def create_cumulative_report_without_company_columns(
@@ -5946,10 +7435,10 @@ def create_cumulative_report_without_company_columns(
         objRange[1],
     )
     write_tsv_rows(pszOutputPath, objOutputRows)
-    print(f"Output: {pszOutputPath}")
+    report_output_file(pszOutputPath)
     pszVerticalOutputPath: str = pszOutputPath.replace(".tsv", "_vertical.tsv")
     write_tsv_rows(pszVerticalOutputPath, transpose_rows(objOutputRows))
-    print(f"Output: {pszVerticalOutputPath}")
+    report_output_file(pszVerticalOutputPath)
 
 
 def build_pj_summary_range(
@@ -5964,7 +7453,7 @@ def build_pj_summary_range(
     return (iStartYear, 4), (iEndYear, iEndMonth)
 
 
-def create_cumulative_reports(pszPlPath: str) -> None:
+def create_cumulative_reports(pszPlPath: str, iJobCount: int = 1) -> None:
     pszInputDirectory: str = os.path.dirname(pszPlPath)
     pszDirectory: str = get_script_base_directory()
     pszRangePath: Optional[str] = find_selected_range_path(pszInputDirectory)
@@ -5998,30 +7487,233 @@ def create_cumulative_reports(pszPlPath: str) -> None:
             append_unique_range(objFiscalBRanges[-1])
         objCurrentRanges = build_cp_period_ranges_from_selected_range(objRange)
 
-    objTotalsExcelRanges = build_current_period_ranges_for_pj_summary_totals(objRange)
+    objTotalsExcelRanges = build_current_period_ranges_for_pj_summary_totals(objRange)
+
+    # CP別の中間TSV (最後に削除されるもの) はメモリ上に保持し、残るものだけを最後に書き出す。
+    # step0009 はディレクトリの一覧から探されるため対象外。
+    begin_deferred_tsv_artifacts(
+        pszDirectory,
+        [
+            objPattern
+            for objPattern in build_cp_step_intermediate_tsv_patterns()
+            if "step0009" not in objPattern.pattern
+        ],
+    )
+    try:
+        create_cumulative_reports_for_ranges(
+            pszPlPath,
+            pszDirectory,
+            objRange,
+            objAllRanges,
+            objTotalsExcelRanges,
+            iJobCount,
+        )
+    finally:
+        flush_deferred_tsv_artifacts()
+
+
+def has_pj_summary_cumulative_pl(
+    pszDirectory: str,
+    objRange: Tuple[Tuple[int, int], Tuple[int, int]],
+) -> bool:
+    # create_pj_summary が累計の損益計算書を読めるか (読める場合は月名のない共通のファイルも書く)
+    pszCumulativePlPath: str = build_cumulative_file_path(
+        pszDirectory,
+        "損益計算書",
+        objRange[0],
+        objRange[1],
+    ).replace(".tsv", "_vertical.tsv")
+    return os.path.isfile(pszCumulativePlPath) or os.path.isfile(
+        pszCumulativePlPath.replace("_vertical.tsv", ".tsv")
+    )
+
+
+class PjSummaryMonthResult:
+    # ワーカーで作成した単月PJサマリ 1 か月分の結果 (親プロセスへ月の順に取り込む)
+    def __init__(
+        self,
+        pszStdout: str,
+        objReportedPaths: List[str],
+        objCreatedPaths: List[str],
+        objDeferredArtifacts: Dict[str, List[List[str]]],
+        objDiscardedDeferredKeys: List[str],
+    ) -> None:
+        self.pszStdout: str = pszStdout
+        self.objReportedPaths: List[str] = objReportedPaths
+        self.objCreatedPaths: List[str] = objCreatedPaths
+        self.objDeferredArtifacts: Dict[str, List[List[str]]] = objDeferredArtifacts
+        self.objDiscardedDeferredKeys: List[str] = objDiscardedDeferredKeys
+
+
+def run_single_month_pj_summaries_in_worker(
+    pszPlPath: str,
+    objMonths: List[Tuple[int, int]],
+    pszDeferredDirectory: Optional[str],
+    objDeferredPatterns: List[re.Pattern[str]],
+    objInputTables: Dict[str, List[List[str]]],
+    pszExecutionRootDirectory: Optional[str],
+    bRecordOutputs: bool,
+) -> List[PjSummaryMonthResult]:
+    # プロセスプールのワーカー側で objMonths を古い月から順に作成する。
+    # 中間TSVの保持 (DEFERRED_TSV_ARTIFACTS) は親プロセスと同じ条件で行い、月ごとに変わった分だけを返す。
+    global EXECUTION_ROOT_DIRECTORY
+    global DEFERRED_TSV_DIRECTORY
+    EXECUTION_ROOT_DIRECTORY = pszExecutionRootDirectory
+    DEFERRED_TSV_DIRECTORY = pszDeferredDirectory
+    DEFERRED_TSV_PATTERNS[:] = objDeferredPatterns
+    DEFERRED_TSV_ARTIFACTS.clear()
+    DEFERRED_TSV_ARTIFACTS.update(objInputTables)
+    objResults: List[PjSummaryMonthResult] = []
+    try:
+        for objMonth in objMonths:
+            objDeferredBefore: Dict[str, List[List[str]]] = dict(DEFERRED_TSV_ARTIFACTS)
+            iReportedCount: int = len(REPORTED_OUTPUT_PATHS)
+            if bRecordOutputs:
+                begin_run_output_manifest()
+            objStdout: io.StringIO = io.StringIO()
+            with redirect_stdout(objStdout):
+                create_pj_summary(pszPlPath, (objMonth, objMonth))
+            objResults.append(
+                PjSummaryMonthResult(
+                    objStdout.getvalue(),
+                    REPORTED_OUTPUT_PATHS[iReportedCount:],
+                    end_run_output_manifest(),
+                    {
+                        pszKey: objRows
+                        for pszKey, objRows in DEFERRED_TSV_ARTIFACTS.items()
+                        if objDeferredBefore.get(pszKey) is not objRows
+                    },
+                    [pszKey for pszKey in objDeferredBefore if pszKey not in DEFERRED_TSV_ARTIFACTS],
+                )
+            )
+    finally:
+        DEFERRED_TSV_ARTIFACTS.clear()
+    return objResults
+
+
+def create_single_month_pj_summaries(
+    pszPlPath: str,
+    pszDirectory: str,
+    objMonths: List[Tuple[int, int]],
+    iJobCount: int,
+) -> None:
+    # 単月のPJサマリ (create_pj_summary(pszPlPath, (objMonth, objMonth))) を古い月から順に作成する。
+    # iJobCount が 2 以上の場合は、同じ暦月 (前年同月を参照し合う月) の並びごとにプロセスプールで作成する。
+    # 累計の損益計算書がある月は月名のない共通のファイルや Excel の登録も行うため、その暦月の並びは親プロセスで作る。
+    # ワーカーの結果 (標準出力・作成したファイル・保持した中間TSV) は月の順に取り込むので、順に作成した場合と同じになる。
+    objChains: Dict[int, List[Tuple[int, int]]] = {}
+    for objMonth in objMonths:
+        objChains.setdefault(objMonth[1], []).append(objMonth)
+    objParallelChains: List[List[Tuple[int, int]]] = [
+        objChain
+        for objChain in objChains.values()
+        if not any(has_pj_summary_cumulative_pl(pszDirectory, (objMonth, objMonth)) for objMonth in objChain)
+    ]
+    iWorkerCount: int = min(iJobCount, len(objParallelChains))
+    if iWorkerCount <= 1:
+        for objMonth in objMonths:
+            create_pj_summary(pszPlPath, (objMonth, objMonth))
+        return
+
+    with ProcessPoolExecutor(max_workers=iWorkerCount) as objExecutor:
+        objFutures: Dict[Tuple[int, int], Tuple[Future, int]] = {}
+        for objChain in objParallelChains:
+            # 前年同月の CP別 step0006 を親プロセスで保持している場合は一緒に渡す
+            pszPriorLabel: str = f"_単月_損益計算書_{objChain[0][0] - 1}年{objChain[0][1]:02d}月_"
+            objInputTables: Dict[str, List[List[str]]] = {
+                pszKey: objRows for pszKey, objRows in DEFERRED_TSV_ARTIFACTS.items() if pszPriorLabel in pszKey
+            }
+            objFuture = objExecutor.submit(
+                run_single_month_pj_summaries_in_worker,
+                pszPlPath,
+                objChain,
+                DEFERRED_TSV_DIRECTORY,
+                DEFERRED_TSV_PATTERNS,
+                objInputTables,
+                EXECUTION_ROOT_DIRECTORY,
+                RUN_OUTPUT_MANIFEST is not None,
+            )
+            for iIndex, objMonth in enumerate(objChain):
+                objFutures[objMonth] = (objFuture, iIndex)
+
+        for objMonth in objMonths:
+            objFutureItem: Optional[Tuple[Future, int]] = objFutures.get(objMonth)
+            if objFutureItem is None:
+                create_pj_summary(pszPlPath, (objMonth, objMonth))
+                continue
+            objResult: PjSummaryMonthResult = objFutureItem[0].result()[objFutureItem[1]]
+            sys.stdout.write(objResult.pszStdout)
+            REPORTED_OUTPUT_PATHS.extend(objResult.objReportedPaths)
+            for pszCreatedPath in objResult.objCreatedPaths:
+                record_created_file(pszCreatedPath)
+            for pszKey in objResult.objDiscardedDeferredKeys:
+                DEFERRED_TSV_ARTIFACTS.pop(pszKey, None)
+            DEFERRED_TSV_ARTIFACTS.update(objResult.objDeferredArtifacts)
+
+
+def create_cumulative_reports_for_ranges(
+    pszPlPath: str,
+    pszDirectory: str,
+    objRange: Tuple[Tuple[int, int], Tuple[int, int]],
+    objAllRanges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    objTotalsExcelRanges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    iJobCount: int = 1,
+) -> None:
+    objStart, objEnd = objRange
 
+    # 全期間で使う月を先に 1 回だけ読み込み、各期間は累積和の差で求める
+    objCumulativeMonths: List[Tuple[int, int]] = []
     for objRangeItem in objAllRanges:
-        create_cumulative_report(
-            pszDirectory,
-            "損益計算書_販管費配賦",
-            objRangeItem,
-            pszInputPrefix="損益計算書_販管費配賦",
-        )
-        create_cumulative_report(pszDirectory, "製造原価報告書", objRangeItem)
-        create_pj_summary(
+        objCumulativeMonths.extend(build_month_sequence(objRangeItem[0], objRangeItem[1]))
+    objPlSource: CumulativeReportSource = CumulativeReportSource(pszDirectory, "損益計算書_販管費配賦")
+    objCostReportSource: CumulativeReportSource = CumulativeReportSource(pszDirectory, "製造原価報告書")
+    objPlSource.load_months(objCumulativeMonths)
+    objCostReportSource.load_months(objCumulativeMonths)
+
+    # 互いに独立した Excel 出力はここまでに登録しておき、TSV の移動の前にまとめて作成する
+    objExcelStage: ExcelExportStage = begin_excel_export_stage(iJobCount)
+    try:
+        # PJサマリの合計Excelは全期間分を書き込んでから 1 回だけ保存する
+        begin_pj_summary_total_workbook_session()
+        try:
+            for objRangeItem in objAllRanges:
+                create_cumulative_report(
+                    pszDirectory,
+                    "損益計算書_販管費配賦",
+                    objRangeItem,
+                    pszInputPrefix="損益計算書_販管費配賦",
+                    objSource=objPlSource,
+                )
+                create_cumulative_report(pszDirectory, "製造原価報告書", objRangeItem, objSource=objCostReportSource)
+                create_pj_summary(
+                    pszPlPath,
+                    objRangeItem,
+                    create_step0007=True,
+                    bWriteTotalsExcel=objRangeItem in objTotalsExcelRanges,
+                )
+        finally:
+            end_pj_summary_total_workbook_session()
+        create_single_month_pj_summaries(
             pszPlPath,
-            objRangeItem,
-            create_step0007=True,
-            bWriteTotalsExcel=objRangeItem in objTotalsExcelRanges,
-        )
-    objMonths = build_month_sequence(objStart, objEnd)
-    for objMonth in objMonths:
-        create_pj_summary(pszPlPath, (objMonth, objMonth))
-    pszCompanyManagementPath = try_create_cp_step0009_vertical(pszDirectory)
-    pszGroupManagementPath = try_create_cp_group_step0009_vertical(pszDirectory)
-    copy_cp_management_excels(pszCompanyManagementPath, pszGroupManagementPath)
-    create_pj_summary_gross_profit_ranking_excel(pszDirectory)
-    create_pj_summary_sales_cost_sg_admin_margin_excel(pszDirectory)
+            pszDirectory,
+            build_month_sequence(objStart, objEnd),
+            iJobCount,
+        )
+        objCompanyManagementJob = try_create_cp_step0009_vertical(pszDirectory)
+        objGroupManagementJob = try_create_cp_group_step0009_vertical(pszDirectory)
+        queue_excel_export(
+            create_pj_summary_gross_profit_ranking_excel,
+            (pszDirectory,),
+            [os.path.join(pszDirectory, "0002_PJサマリ_step0010_単月・累計_粗利金額ランキング.tsv")],
+        )
+        queue_excel_export(create_pj_summary_sales_cost_sg_admin_margin_excel, (pszDirectory,), [])
+    finally:
+        end_excel_export_stage()
+    objExcelStage.run()
+    copy_cp_management_excels(
+        objCompanyManagementJob.objResult if objCompanyManagementJob is not None else None,
+        objGroupManagementJob.objResult if objGroupManagementJob is not None else None,
+    )
     move_monthly_income_statement_tsv_files_into_temp_subfolder(pszDirectory)
     move_pl_tsv_files_into_income_statement_temp_subfolder(pszDirectory)
     move_cost_report_tsv_files_into_temp_subfolder(pszDirectory)
@@ -6033,7 +7725,7 @@ def create_cumulative_reports(pszPlPath: str) -> None:
     remove_bycompany_managementcontrol_step0005_directory()
 
 
-def cleanup_cp_step_intermediate_tsv_files(pszDirectory: str) -> None:
+def build_cp_step_intermediate_tsv_patterns() -> List[re.Pattern[str]]:
     objMonthPattern = r"\d{4}年\d{2}月"
     objRangePattern = rf"{objMonthPattern}-{objMonthPattern}"
     objPatterns = [
@@ -6092,81 +7784,20 @@ def cleanup_cp_step_intermediate_tsv_files(pszDirectory: str) -> None:
             rf"^0002_CP別_step0009_累計_損益計算書_{objRangePattern}_計上グループ_vertical\.tsv$"
         ),
     ]
-    for pszName in os.listdir(pszDirectory):
-        if not any(objPattern.match(pszName) for objPattern in objPatterns):
-            continue
-        pszPath = os.path.join(pszDirectory, pszName)
-        if not os.path.isfile(pszPath):
-            continue
-        os.remove(pszPath)
+    return objPatterns
 
 
 def cleanup_cp_step_intermediate_tsv_files(pszDirectory: str) -> None:
-    objMonthPattern = r"\d{4}年\d{2}月"
-    objRangePattern = rf"{objMonthPattern}-{objMonthPattern}"
-    objPatterns = [
-        re.compile(
-            rf"^0001_CP別_step0006_単月_損益計算書_{objMonthPattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0001_CP別_step0006_累計_損益計算書_{objRangePattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0001_CP別_step0007_単月_損益計算書_{objMonthPattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0001_CP別_step0007_累計_損益計算書_{objRangePattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0001_CP別_step0008_単月_損益計算書_{objMonthPattern}_計上カンパニー_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0001_CP別_step0008_累計_損益計算書_{objRangePattern}_計上カンパニー_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0001_CP別_step0009_単月_損益計算書_{objMonthPattern}_計上カンパニー_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0001_CP別_step0009_累計_損益計算書_{objRangePattern}_計上カンパニー_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0001_単月_損益計算書_{objMonthPattern}\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0001_累計_損益計算書_{objRangePattern}\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0006_単月_損益計算書_{objMonthPattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0006_累計_損益計算書_{objRangePattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0007_単月_損益計算書_{objMonthPattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0007_累計_損益計算書_{objRangePattern}_.+_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0008_単月_損益計算書_{objMonthPattern}_計上グループ_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0008_累計_損益計算書_{objRangePattern}_計上グループ_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0009_単月_損益計算書_{objMonthPattern}_計上グループ_vertical\.tsv$"
-        ),
-        re.compile(
-            rf"^0002_CP別_step0009_累計_損益計算書_{objRangePattern}_計上グループ_vertical\.tsv$"
-        ),
-    ]
-    for pszName in os.listdir(pszDirectory):
+    objPatterns = build_cp_step_intermediate_tsv_patterns()
+    discard_deferred_tsv_artifacts(pszDirectory, objPatterns)
+    for pszName in list_run_output_file_names(pszDirectory):
         if not any(objPattern.match(pszName) for objPattern in objPatterns):
             continue
         pszPath = os.path.join(pszDirectory, pszName)
         if not os.path.isfile(pszPath):
             continue
         os.remove(pszPath)
+        record_removed_file(pszPath)
 
 
 def copy_cp_step0005_vertical_files(pszDirectory: str, objPaths: List[Optional[str]]) -> None:
@@ -6179,7 +7810,7 @@ def copy_cp_step0005_vertical_files(pszDirectory: str, objPaths: List[Optional[s
             continue
         pszFileName: str = os.path.basename(pszPath)
         pszTargetPath: str = os.path.join(pszTargetDirectory, pszFileName)
-        shutil.copy2(pszPath, pszTargetPath)
+        copy_output_file(pszPath, pszTargetPath)
 
 
 def move_cp_step0001_to_step0004_vertical_files(
@@ -6231,7 +7862,7 @@ def move_cp_step0001_to_step0004_vertical_files(
         if not os.path.isfile(pszPath):
             continue
         pszTargetPath: str = os.path.join(pszTargetDirectory, os.path.basename(pszPath))
-        shutil.move(pszPath, pszTargetPath)
+        move_output_file(pszPath, pszTargetPath)
 
 
 def copy_company_step0006_files(
@@ -6250,7 +7881,7 @@ def copy_company_step0006_files(
             create_step0007=create_step0007,
         ):
             pszTargetPath: str = os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath))
-            shutil.copy2(pszOutputPath, pszTargetPath)
+            copy_tsv_file(pszOutputPath, pszTargetPath)
 
 
 def build_company_step0006_files(
@@ -6413,14 +8044,13 @@ def create_pj_summary_gross_profit_ranking_excel(pszDirectory: str) -> Optional[
     )
     if not os.path.isfile(pszTemplatePath):
         return None
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objSheet = objWorkbook.worksheets[0]
     objSheet.title = "粗利金額ランキング"
     objRows = read_tsv_rows(pszInputPath)
     iFormatRowIndex: int = 2 if objSheet.max_row >= 2 else 1
-    for iRowIndex, objRow in enumerate(objRows, start=1):
-        for iColumnIndex, pszValue in enumerate(objRow, start=1):
-            objCellValue = parse_tsv_value_for_excel(pszValue)
+    for iRowIndex, objValueRow in enumerate(convert_tsv_rows_for_excel(objRows), start=1):
+        for iColumnIndex, objCellValue in enumerate(objValueRow, start=1):
             objCell = objSheet.cell(
                 row=iRowIndex,
                 column=iColumnIndex,
@@ -6441,6 +8071,7 @@ def create_pj_summary_gross_profit_ranking_excel(pszDirectory: str) -> Optional[
         "PJサマリ_単月・累計_粗利金額ランキング.xlsx",
     )
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     if EXECUTION_ROOT_DIRECTORY:
         pszRankingDirectory: str = os.path.join(EXECUTION_ROOT_DIRECTORY, "カンパニー利益率順位")
         os.makedirs(pszRankingDirectory, exist_ok=True)
@@ -6449,7 +8080,7 @@ def create_pj_summary_gross_profit_ranking_excel(pszDirectory: str) -> Optional[
             "PJサマリ_単月・累計_粗利金額ランキング.xlsx",
         )
         if os.path.abspath(pszCopyPath) != os.path.abspath(pszOutputPath):
-            shutil.copy2(pszOutputPath, pszCopyPath)
+            copy_output_file(pszOutputPath, pszCopyPath)
     return pszOutputPath
 
 
@@ -6575,7 +8206,7 @@ def create_pj_summary_sales_cost_sg_admin_margin_excel(pszDirectory: str) -> Opt
     )
     if not os.path.isfile(pszTemplatePath):
         return None
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objTemplateSheet = objWorkbook.worksheets[0]
     for iIndex, pszInputName in enumerate(objCandidates):
         if iIndex < len(objWorkbook.worksheets):
@@ -6588,9 +8219,8 @@ def create_pj_summary_sales_cost_sg_admin_margin_excel(pszDirectory: str) -> Opt
         objRows = read_tsv_rows(os.path.join(pszDirectory, pszInputName))
         iFormatRowIndex: int = 2 if objSheet.max_row >= 2 else 1
         iLastColumn: int = max((len(objRow) for objRow in objRows), default=0)
-        for iRowIndex, objRow in enumerate(objRows, start=1):
-            for iColumnIndex, pszValue in enumerate(objRow, start=1):
-                objCellValue = parse_tsv_value_for_excel(pszValue)
+        for iRowIndex, objValueRow in enumerate(convert_tsv_rows_for_excel(objRows), start=1):
+            for iColumnIndex, objCellValue in enumerate(objValueRow, start=1):
                 objCell = objSheet.cell(
                     row=iRowIndex,
                     column=iColumnIndex,
@@ -6617,13 +8247,14 @@ def create_pj_summary_sales_cost_sg_admin_margin_excel(pszDirectory: str) -> Opt
         "PJサマリ_PJ別_売上・売上原価・販管費・利益率.xlsx",
     )
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     if EXECUTION_ROOT_DIRECTORY:
         pszCompanyResultsDirectory = os.path.join(
             EXECUTION_ROOT_DIRECTORY,
             "カンパニー実績",
         )
         os.makedirs(pszCompanyResultsDirectory, exist_ok=True)
-        shutil.copy2(
+        copy_output_file(
             pszOutputPath,
             os.path.join(pszCompanyResultsDirectory, os.path.basename(pszOutputPath)),
         )
@@ -6653,20 +8284,20 @@ def create_pj_summary_pl_cr_manhour_excel(
     )
     if not os.path.isfile(pszTemplatePath):
         return None
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objSheet = objWorkbook.worksheets[0]
     objSheetNameMatch = objSheetNamePattern.match(pszProjectName)
     if objSheetNameMatch:
         objSheet.title = objSheetNameMatch.group(1)
     objRows = read_tsv_rows(pszInputPath)
+    objValueRows: List[List[Optional[object]]] = convert_tsv_rows_for_excel(objRows)
     for iRowIndex, objRow in enumerate(objRows, start=1):
         pszRowLabel: str = objRow[0] if len(objRow) >= 1 else ""
         for iColumnIndex, pszValue in enumerate(objRow, start=1):
-            objCellValue = parse_tsv_value_for_excel(pszValue)
             objCell = objSheet.cell(
                 row=iRowIndex,
                 column=iColumnIndex,
-                value=objCellValue,
+                value=objValueRows[iRowIndex - 1][iColumnIndex - 1],
             )
             if pszRowLabel == "工数行(h:mm:ss)" and iColumnIndex in (2, 5):
                 objExcelTimeSerial = parse_h_mm_ss_to_excel_serial(pszValue)
@@ -6684,13 +8315,14 @@ def create_pj_summary_pl_cr_manhour_excel(
         f"PJサマリ_単・累計_{pszProjectName}.xlsx",
     )
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     if EXECUTION_ROOT_DIRECTORY:
         pszProjectProfitDirectory = os.path.join(
             EXECUTION_ROOT_DIRECTORY,
             "プロジェクト損益",
         )
         os.makedirs(pszProjectProfitDirectory, exist_ok=True)
-        shutil.copy2(
+        copy_output_file(
             pszOutputPath,
             os.path.join(pszProjectProfitDirectory, os.path.basename(pszOutputPath)),
         )
@@ -6854,15 +8486,12 @@ def create_step0010_pj_income_statement_excel_from_tsv(
     if not os.path.isfile(pszTemplatePath):
         return None
 
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objSheet = objWorkbook.worksheets[0]
     objSheet.title = pszYearMonth
     objRows = read_tsv_rows(pszStep0010Path)
     iLastColumn: int = max((len(objRow) for objRow in objRows), default=0)
-    for iRowIndex, objRow in enumerate(objRows, start=1):
-        for iColumnIndex, pszValue in enumerate(objRow, start=1):
-            objCellValue = parse_tsv_value_for_excel(pszValue)
-            objSheet.cell(row=iRowIndex, column=iColumnIndex, value=objCellValue)
+    write_tsv_rows_to_sheet(objSheet, objRows)
 
     _apply_step0010_income_statement_borders(objSheet, len(objRows), iLastColumn)
     _clear_step0010_income_statement_borders_outside_data(
@@ -6877,10 +8506,11 @@ def create_step0010_pj_income_statement_excel_from_tsv(
         f"販管費配賦後_損益計算書_{pszYearMonth}_A∪B_プロジェクト名_C∪D.xlsx",
     )
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     if EXECUTION_ROOT_DIRECTORY:
         pszTargetDirectory = os.path.join(EXECUTION_ROOT_DIRECTORY, "PJ別損益計算書")
         os.makedirs(pszTargetDirectory, exist_ok=True)
-        shutil.copy2(
+        copy_output_file(
             pszOutputPath,
             os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath)),
         )
@@ -6911,15 +8541,12 @@ def create_step0010_pj_income_statement_vertical_excel_from_tsv(
     if not os.path.isfile(pszTemplatePath):
         return None
 
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objSheet = objWorkbook.worksheets[0]
     objSheet.title = f"{pszYearMonth}_vertical"
     objRows = read_tsv_rows(pszStep0010VerticalPath)
     iLastColumn: int = max((len(objRow) for objRow in objRows), default=0)
-    for iRowIndex, objRow in enumerate(objRows, start=1):
-        for iColumnIndex, pszValue in enumerate(objRow, start=1):
-            objCellValue = parse_tsv_value_for_excel(pszValue)
-            objSheet.cell(row=iRowIndex, column=iColumnIndex, value=objCellValue)
+    write_tsv_rows_to_sheet(objSheet, objRows)
 
     _apply_step0010_income_statement_borders(objSheet, len(objRows), iLastColumn)
     _clear_step0010_income_statement_borders_outside_data(
@@ -6934,10 +8561,11 @@ def create_step0010_pj_income_statement_vertical_excel_from_tsv(
         f"販管費配賦後_損益計算書_{pszYearMonth}_A∪B_プロジェクト名_C∪D_vertical.xlsx",
     )
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     if EXECUTION_ROOT_DIRECTORY:
         pszTargetDirectory = os.path.join(EXECUTION_ROOT_DIRECTORY, "PJ別損益計算書")
         os.makedirs(pszTargetDirectory, exist_ok=True)
-        shutil.copy2(
+        copy_output_file(
             pszOutputPath,
             os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath)),
         )
@@ -7003,7 +8631,7 @@ def create_step0010_pj_income_statement_both_excel(
         os.path.dirname(pszNormalExcelPath),
         f"販管費配賦後_損益計算書_{pszYearMonth}_A∪B_プロジェクト名_C∪D_両方.xlsx",
     )
-    shutil.copy2(pszNormalExcelPath, pszOutputPath)
+    copy_output_file(pszNormalExcelPath, pszOutputPath)
 
     objBothWorkbook = load_workbook(pszOutputPath)
     objVerticalWorkbook = load_workbook(pszVerticalExcelPath)
@@ -7022,10 +8650,11 @@ def create_step0010_pj_income_statement_both_excel(
     copy_excel_sheet_contents(objVerticalSourceSheet, objVerticalSheet)
 
     objBothWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     if EXECUTION_ROOT_DIRECTORY:
         pszTargetDirectory = os.path.join(EXECUTION_ROOT_DIRECTORY, "PJ別損益計算書")
         os.makedirs(pszTargetDirectory, exist_ok=True)
-        shutil.copy2(
+        copy_output_file(
             pszOutputPath,
             os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath)),
         )
@@ -7082,7 +8711,7 @@ def create_step0010_pj_income_statement_range_excel_from_tsvs(
     if not os.path.isfile(pszTemplatePath):
         return None
 
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objTemplateSheet = objWorkbook.worksheets[0]
 
     for iIndex, (objYearMonth, pszPath) in enumerate(objPathPairs):
@@ -7098,10 +8727,7 @@ def create_step0010_pj_income_statement_range_excel_from_tsvs(
 
         objRows = read_tsv_rows(pszPath)
         iLastColumn: int = max((len(objRow) for objRow in objRows), default=0)
-        for iRowIndex, objRow in enumerate(objRows, start=1):
-            for iColumnIndex, pszValue in enumerate(objRow, start=1):
-                objCellValue = parse_tsv_value_for_excel(pszValue)
-                objSheet.cell(row=iRowIndex, column=iColumnIndex, value=objCellValue)
+        write_tsv_rows_to_sheet(objSheet, objRows)
 
         _apply_step0010_income_statement_borders(objSheet, len(objRows), iLastColumn)
         _clear_step0010_income_statement_borders_outside_data(
@@ -7118,17 +8744,20 @@ def create_step0010_pj_income_statement_range_excel_from_tsvs(
     )
     pszOutputPath: str = os.path.join(pszDirectory, pszOutputName)
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     if EXECUTION_ROOT_DIRECTORY:
         pszTargetDirectory = os.path.join(EXECUTION_ROOT_DIRECTORY, "PJ別損益計算書")
         os.makedirs(pszTargetDirectory, exist_ok=True)
-        shutil.copy2(
+        copy_output_file(
             pszOutputPath,
             os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath)),
         )
     return pszOutputPath
 
 
-def create_step0010_pj_income_statement_excels(pszDirectory: str) -> List[str]:
+def create_step0010_pj_income_statement_excels(pszDirectory: str, iJobCount: int = 1) -> List[str]:
+    # 月ごと・期間の Excel はまとめて作成し (iJobCount が 2 以上ならプロセスプール)、
+    # それらを読む「両方」の Excel は後から作成する
     objOutputs: List[str] = []
     objNormalOutputByYearMonth: Dict[Tuple[int, int], str] = {}
     objVerticalOutputByYearMonth: Dict[Tuple[int, int], str] = {}
@@ -7143,6 +8772,8 @@ def create_step0010_pj_income_statement_excels(pszDirectory: str) -> List[str]:
     )
     objMonthlyNormalPaths: List[str] = []
     objMonthlyVerticalPaths: List[str] = []
+    objExcelStage: ExcelExportStage = ExcelExportStage(iJobCount)
+    objMonthlyJobs: List[Tuple[str, ExcelExportJob, Dict[Tuple[int, int], str]]] = []
 
     for pszName in sorted(os.listdir(pszDirectory)):
         pszPath = os.path.join(pszDirectory, pszName)
@@ -7161,12 +8792,13 @@ def create_step0010_pj_income_statement_excels(pszDirectory: str) -> List[str]:
                 objYearMonth = extract_year_month_from_path(pszPath)
                 if objYearMonth != objTargetYearMonth:
                     continue
-            pszOutput = create_step0010_pj_income_statement_excel_from_tsv(pszPath)
-            if pszOutput is not None:
-                objOutputs.append(pszOutput)
-                objYearMonth = extract_year_month_from_path(pszPath)
-                if objYearMonth is not None:
-                    objNormalOutputByYearMonth[objYearMonth] = pszOutput
+            objMonthlyJobs.append(
+                (
+                    pszPath,
+                    objExcelStage.queue(create_step0010_pj_income_statement_excel_from_tsv, (pszPath,), [pszPath]),
+                    objNormalOutputByYearMonth,
+                )
+            )
             continue
         if re.fullmatch(
             r"損益計算書_販管費配賦_step0010_\d{4}年\d{2}月_A∪B_プロジェクト名_C∪D_vertical\.tsv",
@@ -7177,37 +8809,63 @@ def create_step0010_pj_income_statement_excels(pszDirectory: str) -> List[str]:
                 objYearMonth = extract_year_month_from_path(pszPath)
                 if objYearMonth != objTargetYearMonth:
                     continue
-            pszOutput = create_step0010_pj_income_statement_vertical_excel_from_tsv(pszPath)
-            if pszOutput is not None:
-                objOutputs.append(pszOutput)
-                objYearMonth = extract_year_month_from_path(pszPath)
-                if objYearMonth is not None:
-                    objVerticalOutputByYearMonth[objYearMonth] = pszOutput
+            objMonthlyJobs.append(
+                (
+                    pszPath,
+                    objExcelStage.queue(
+                        create_step0010_pj_income_statement_vertical_excel_from_tsv,
+                        (pszPath,),
+                        [pszPath],
+                    ),
+                    objVerticalOutputByYearMonth,
+                )
+            )
 
-    pszRangeOutput = create_step0010_pj_income_statement_range_excel_from_tsvs(
-        pszDirectory,
+    objRangeJob: ExcelExportJob = objExcelStage.queue(
+        create_step0010_pj_income_statement_range_excel_from_tsvs,
+        (pszDirectory, objMonthlyNormalPaths, False),
         objMonthlyNormalPaths,
-        False,
     )
+    objRangeVerticalJob: ExcelExportJob = objExcelStage.queue(
+        create_step0010_pj_income_statement_range_excel_from_tsvs,
+        (pszDirectory, objMonthlyVerticalPaths, True),
+        objMonthlyVerticalPaths,
+    )
+    objExcelStage.run()
+
+    for pszPath, objJob, objOutputByYearMonth in objMonthlyJobs:
+        pszOutput = objJob.objResult
+        if pszOutput is not None:
+            objOutputs.append(pszOutput)
+            objYearMonth = extract_year_month_from_path(pszPath)
+            if objYearMonth is not None:
+                objOutputByYearMonth[objYearMonth] = pszOutput
+
+    pszRangeOutput = objRangeJob.objResult
     if pszRangeOutput is not None:
         objOutputs.append(pszRangeOutput)
 
-    pszRangeVerticalOutput = create_step0010_pj_income_statement_range_excel_from_tsvs(
-        pszDirectory,
-        objMonthlyVerticalPaths,
-        True,
-    )
+    pszRangeVerticalOutput = objRangeVerticalJob.objResult
     if pszRangeVerticalOutput is not None:
         objOutputs.append(pszRangeVerticalOutput)
 
     objBothYearMonths = sorted(
         set(objNormalOutputByYearMonth.keys()) & set(objVerticalOutputByYearMonth.keys())
     )
-    for objYearMonth in objBothYearMonths:
-        pszBothOutput = create_step0010_pj_income_statement_both_excel(
-            objNormalOutputByYearMonth[objYearMonth],
-            objVerticalOutputByYearMonth[objYearMonth],
+    objBothJobs: List[ExcelExportJob] = [
+        objExcelStage.queue(
+            create_step0010_pj_income_statement_both_excel,
+            (
+                objNormalOutputByYearMonth[objYearMonth],
+                objVerticalOutputByYearMonth[objYearMonth],
+            ),
+            [],
         )
+        for objYearMonth in objBothYearMonths
+    ]
+    objExcelStage.run()
+    for objJob in objBothJobs:
+        pszBothOutput = objJob.objResult
         if pszBothOutput is not None:
             objOutputs.append(pszBothOutput)
 
@@ -7394,6 +9052,15 @@ CP_GROUP_ALLOWED_NAMES: List[str] = [
 ]
 
 
+# 計画.csv でこの名称の行からグループ別の計画が始まる
+CP_GROUP_START_NAMES: List[str] = [
+    "受託事業-施設運営",
+    "受託事業-その他",
+    "自社-施設運営",
+    "自社-その他",
+]
+
+
 def parse_japanese_year_month_label(pszLabel: str) -> Optional[Tuple[int, int]]:
     objMatch = re.match(r"^(\d{4})年(\d{1,2})月$", (pszLabel or "").strip())
     if objMatch is None:
@@ -7439,17 +9106,24 @@ def parse_plan_numeric_value(pszValue: str) -> Optional[float]:
 
 CP_COMPANY_PLAN_CACHE: Optional[Dict[Tuple[str, str], Dict[Tuple[int, int], str]]] = None
 CP_GROUP_PLAN_CACHE: Optional[Dict[Tuple[str, str], Dict[Tuple[int, int], str]]] = None
+# 計画.csv の解析結果を保存するファイル (BUILD_CACHE_DIRECTORY_NAME の下)
+CP_PLAN_CACHE_FILE_NAME: str = "計画_csv.pickle"
+CP_PLAN_CACHE_VERSION: int = 1
 
 
-def read_cp_company_plan_map() -> Dict[Tuple[str, str], Dict[Tuple[int, int], str]]:
-    global CP_COMPANY_PLAN_CACHE
-    if CP_COMPANY_PLAN_CACHE is not None:
-        return CP_COMPANY_PLAN_CACHE
-    pszPlanPath: str = os.path.join(get_script_base_directory(), "計画.csv")
-    if not os.path.isfile(pszPlanPath):
-        CP_COMPANY_PLAN_CACHE = {}
-        return CP_COMPANY_PLAN_CACHE
+def build_cp_plan_filter_key() -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    # 保存した解析結果はこの名称一覧で絞り込み済みのため、一覧が変わったら使わない
+    return (
+        tuple(sorted(set(CP_COMPANY_ALLOWED_NAMES))),
+        tuple(sorted(set(CP_GROUP_ALLOWED_NAMES))),
+        tuple(sorted(set(CP_GROUP_START_NAMES))),
+    )
+
 
+def parse_cp_plan_maps(
+    pszPlanPath: str,
+) -> Tuple[Dict[Tuple[str, str], Dict[Tuple[int, int], str]], Dict[Tuple[str, str], Dict[Tuple[int, int], str]]]:
+    # 計画.csv を 1 回読み、カンパニー別 (グループの見出しより前) とグループ別 (見出し以降) の計画を作る
     objRows: List[List[str]] = []
     with open(pszPlanPath, "r", encoding="utf-8-sig", newline="") as objFile:
         objSniffer = csv.Sniffer()
@@ -7464,9 +9138,10 @@ def read_cp_company_plan_map() -> Dict[Tuple[str, str], Dict[Tuple[int, int], st
         for objRow in objReader:
             objRows.append(list(objRow))
 
+    objCompanyPlanMap: Dict[Tuple[str, str], Dict[Tuple[int, int], str]] = {}
+    objGroupPlanMap: Dict[Tuple[str, str], Dict[Tuple[int, int], str]] = {}
     if not objRows:
-        CP_COMPANY_PLAN_CACHE = {}
-        return CP_COMPANY_PLAN_CACHE
+        return objCompanyPlanMap, objGroupPlanMap
 
     objMonthColumns: Dict[int, Tuple[int, int]] = {}
     for iColumnIndex, pszLabel in enumerate(objRows[0]):
@@ -7475,105 +9150,118 @@ def read_cp_company_plan_map() -> Dict[Tuple[str, str], Dict[Tuple[int, int], st
             objMonthColumns[iColumnIndex] = objMonth
 
     objAllowedCompanySet = set(CP_COMPANY_ALLOWED_NAMES)
-    objGroupStartNames = {
-        "受託事業-施設運営",
-        "受託事業-その他",
-        "自社-施設運営",
-        "自社-その他",
-    }
-    pszCurrentCompany: str = ""
-    objPlanMap: Dict[Tuple[str, str], Dict[Tuple[int, int], str]] = {}
+    objAllowedGroupSet = set(CP_GROUP_ALLOWED_NAMES)
+    objGroupStartNames = set(CP_GROUP_START_NAMES)
+    pszCurrentName: str = ""
+    bInGroupSection: bool = False
 
     for objRow in objRows[1:]:
-        pszCompanyCell: str = objRow[0].strip() if len(objRow) > 0 else ""
-        if pszCompanyCell in objGroupStartNames:
-            break
-        if pszCompanyCell != "":
-            pszCurrentCompany = pszCompanyCell
-        if pszCurrentCompany not in objAllowedCompanySet:
-            continue
+        pszNameCell: str = objRow[0].strip() if len(objRow) > 0 else ""
+        if pszNameCell in objGroupStartNames:
+            bInGroupSection = True
+        if pszNameCell != "":
+            pszCurrentName = pszNameCell
+        if bInGroupSection:
+            if pszCurrentName not in objAllowedGroupSet:
+                continue
+            objPlanMap = objGroupPlanMap
+        else:
+            if pszCurrentName not in objAllowedCompanySet:
+                continue
+            objPlanMap = objCompanyPlanMap
         pszSubject: str = objRow[1].strip() if len(objRow) > 1 else ""
         if pszSubject == "":
             continue
-        objKey = (pszCurrentCompany, pszSubject)
-        objMonthMap: Dict[Tuple[int, int], str] = objPlanMap.setdefault(objKey, {})
+        objMonthMap: Dict[Tuple[int, int], str] = objPlanMap.setdefault((pszCurrentName, pszSubject), {})
         for iColumnIndex, objMonth in objMonthColumns.items():
             if iColumnIndex >= len(objRow):
                 continue
             objMonthMap[objMonth] = (objRow[iColumnIndex] or "").strip()
-
-    CP_COMPANY_PLAN_CACHE = objPlanMap
-    return CP_COMPANY_PLAN_CACHE
+    return objCompanyPlanMap, objGroupPlanMap
 
 
-
-def read_cp_group_plan_map() -> Dict[Tuple[str, str], Dict[Tuple[int, int], str]]:
+def load_cp_plan_maps() -> None:
+    # 解析結果は計画.csv の内容ハッシュと一緒に保存し、次の実行では解析を省く。
+    # 更新時刻・サイズが保存時と同じなら読み直さず、違う場合は内容ハッシュが同じかどうかで判断する。
+    global CP_COMPANY_PLAN_CACHE
     global CP_GROUP_PLAN_CACHE
-    if CP_GROUP_PLAN_CACHE is not None:
-        return CP_GROUP_PLAN_CACHE
     pszPlanPath: str = os.path.join(get_script_base_directory(), "計画.csv")
     if not os.path.isfile(pszPlanPath):
+        CP_COMPANY_PLAN_CACHE = {}
         CP_GROUP_PLAN_CACHE = {}
-        return CP_GROUP_PLAN_CACHE
+        return
 
-    objRows: List[List[str]] = []
-    with open(pszPlanPath, "r", encoding="utf-8-sig", newline="") as objFile:
-        objSniffer = csv.Sniffer()
-        pszSample: str = objFile.read(4096)
-        objFile.seek(0)
-        try:
-            objDialect = objSniffer.sniff(pszSample, delimiters=",	")
-            pszDelimiter = objDialect.delimiter
-        except csv.Error:
-            pszDelimiter = "	"
-        objReader = csv.reader(objFile, delimiter=pszDelimiter)
-        for objRow in objReader:
-            objRows.append(list(objRow))
+    pszCachePath: str = os.path.join(
+        get_script_base_directory(),
+        BUILD_CACHE_DIRECTORY_NAME,
+        CP_PLAN_CACHE_FILE_NAME,
+    )
+    objCached: Optional[Dict[str, object]] = None
+    try:
+        with open(pszCachePath, "rb") as objFile:
+            objCached = pickle.load(objFile)
+    except Exception:
+        objCached = None
+    objFilterKey = build_cp_plan_filter_key()
+    if (
+        not isinstance(objCached, dict)
+        or objCached.get("version") != CP_PLAN_CACHE_VERSION
+        or objCached.get("filter") != objFilterKey
+    ):
+        objCached = None
 
-    if not objRows:
-        CP_GROUP_PLAN_CACHE = {}
-        return CP_GROUP_PLAN_CACHE
+    objStat = os.stat(pszPlanPath)
+    objSignature: Tuple[int, int] = (objStat.st_mtime_ns, objStat.st_size)
+    if objCached is not None and objCached.get("signature") == objSignature:
+        CP_COMPANY_PLAN_CACHE = objCached["company"]
+        CP_GROUP_PLAN_CACHE = objCached["group"]
+        return
 
-    objMonthColumns: Dict[int, Tuple[int, int]] = {}
-    for iColumnIndex, pszLabel in enumerate(objRows[0]):
-        objMonth = parse_japanese_year_month_label(pszLabel)
-        if objMonth is not None:
-            objMonthColumns[iColumnIndex] = objMonth
+    pszHash: str = compute_file_sha256(pszPlanPath)
+    if objCached is not None and objCached.get("hash") == pszHash:
+        CP_COMPANY_PLAN_CACHE = objCached["company"]
+        CP_GROUP_PLAN_CACHE = objCached["group"]
+    else:
+        CP_COMPANY_PLAN_CACHE, CP_GROUP_PLAN_CACHE = parse_cp_plan_maps(pszPlanPath)
 
-    objAllowedGroupSet = set(CP_GROUP_ALLOWED_NAMES)
-    objGroupStartNames = {
-        "受託事業-施設運営",
-        "受託事業-その他",
-        "自社-施設運営",
-        "自社-その他",
-    }
-    pszCurrentGroup: str = ""
-    bInGroupSection: bool = False
-    objPlanMap: Dict[Tuple[str, str], Dict[Tuple[int, int], str]] = {}
+    # 保存できない場合 (読み取り専用の場所など) は次の実行でも解析する。
+    # 一時ファイル名にはプロセス ID を付け、同時に動く別の実行と書き込みが混ざらないようにする。
+    pszTemporaryPath: str = "{0}.{1}.tmp".format(pszCachePath, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(pszCachePath), exist_ok=True)
+        with open(pszTemporaryPath, "wb") as objFile:
+            pickle.dump(
+                {
+                    "version": CP_PLAN_CACHE_VERSION,
+                    "filter": objFilterKey,
+                    "signature": objSignature,
+                    "hash": pszHash,
+                    "company": CP_COMPANY_PLAN_CACHE,
+                    "group": CP_GROUP_PLAN_CACHE,
+                },
+                objFile,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(pszTemporaryPath, pszCachePath)
+    except (OSError, pickle.PicklingError):
+        try:
+            os.remove(pszTemporaryPath)
+        except OSError:
+            pass
 
-    for objRow in objRows[1:]:
-        pszGroupCell: str = objRow[0].strip() if len(objRow) > 0 else ""
-        if pszGroupCell in objGroupStartNames:
-            bInGroupSection = True
-        if not bInGroupSection:
-            continue
-        if pszGroupCell != "":
-            pszCurrentGroup = pszGroupCell
-        if pszCurrentGroup not in objAllowedGroupSet:
-            continue
-        pszSubject: str = objRow[1].strip() if len(objRow) > 1 else ""
-        if pszSubject == "":
-            continue
-        objKey = (pszCurrentGroup, pszSubject)
-        objMonthMap: Dict[Tuple[int, int], str] = objPlanMap.setdefault(objKey, {})
-        for iColumnIndex, objMonth in objMonthColumns.items():
-            if iColumnIndex >= len(objRow):
-                continue
-            objMonthMap[objMonth] = (objRow[iColumnIndex] or "").strip()
 
-    CP_GROUP_PLAN_CACHE = objPlanMap
+def read_cp_company_plan_map() -> Dict[Tuple[str, str], Dict[Tuple[int, int], str]]:
+    if CP_COMPANY_PLAN_CACHE is None:
+        load_cp_plan_maps()
+    return CP_COMPANY_PLAN_CACHE
+
+
+def read_cp_group_plan_map() -> Dict[Tuple[str, str], Dict[Tuple[int, int], str]]:
+    if CP_GROUP_PLAN_CACHE is None:
+        load_cp_plan_maps()
     return CP_GROUP_PLAN_CACHE
 
+
 def apply_cp_company_plan_values(
     objInsertedRows: List[List[str]],
     pszCurrentLabel: str,
@@ -7741,7 +9429,7 @@ def parse_period_month_count(pszLabel: str) -> int:
 
 
 def build_step0006_prior_map(pszPriorPath: str) -> Dict[str, str]:
-    if not os.path.isfile(pszPriorPath):
+    if not tsv_file_exists(pszPriorPath):
         return {}
     objPriorRows = read_tsv_rows(pszPriorPath)
     if not objPriorRows:
@@ -7788,7 +9476,7 @@ def build_cp_group_step0008_vertical(
             pszDirectory,
             f"{pszPrefix}{pszGroup}_vertical.tsv",
         )
-        if not os.path.isfile(pszInputPath):
+        if not tsv_file_exists(pszInputPath):
             return None
         objRows.extend(read_tsv_rows(pszInputPath))
 
@@ -7802,7 +9490,7 @@ def build_cp_group_step0008_vertical(
     pszTargetDirectory: str = os.path.join(pszScriptDirectory, "0002_CP別_step0008")
     os.makedirs(pszTargetDirectory, exist_ok=True)
     pszTargetPath: str = os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath))
-    shutil.copy2(pszOutputPath, pszTargetPath)
+    copy_tsv_file(pszOutputPath, pszTargetPath)
     return pszOutputPath
 
 
@@ -7831,7 +9519,7 @@ def build_cp_company_step0008_vertical(
             pszDirectory,
             f"{pszPrefix}{pszCompany}_vertical.tsv",
         )
-        if not os.path.isfile(pszInputPath):
+        if not tsv_file_exists(pszInputPath):
             return None
         objRows.extend(read_tsv_rows(pszInputPath))
 
@@ -7844,7 +9532,7 @@ def build_cp_company_step0008_vertical(
     pszTargetDirectory: str = os.path.join(pszScriptDirectory, "0001_CP別_step0008")
     os.makedirs(pszTargetDirectory, exist_ok=True)
     pszTargetPath: str = os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath))
-    shutil.copy2(pszOutputPath, pszTargetPath)
+    copy_tsv_file(pszOutputPath, pszTargetPath)
     return pszOutputPath
 
 
@@ -8056,6 +9744,10 @@ def find_cp_group_step0009_vertical_paths(
     return objMatches
 
 
+EXCEL_INTEGER_TEXT_PATTERN = re.compile(r"[+-]?\d+")
+EXCEL_DECIMAL_TEXT_PATTERN = re.compile(r"[+-]?\d+\.\d+")
+
+
 def parse_tsv_value_for_excel(pszValue: str) -> Optional[object]:
     pszText: str = (pszValue or "").strip()
     if pszText == "":
@@ -8071,13 +9763,49 @@ def parse_tsv_value_for_excel(pszValue: str) -> Optional[object]:
         pszNormalized = pszNormalized[1:]
     pszNormalized = pszNormalized.replace("－", "-").replace("＋", "+")
     pszNormalized = pszNormalized.replace(",", "")
-    if re.fullmatch(r"[+-]?\d+", pszNormalized):
+    if EXCEL_INTEGER_TEXT_PATTERN.fullmatch(pszNormalized):
         return int(pszNormalized)
-    if re.fullmatch(r"[+-]?\d+\.\d+", pszNormalized):
+    if EXCEL_DECIMAL_TEXT_PATTERN.fullmatch(pszNormalized):
         return float(pszNormalized)
     return pszText
 
 
+def convert_tsv_rows_for_excel(objRows: List[List[str]]) -> List[List[Optional[object]]]:
+    # 表全体をまとめて変換する。同じ文字列 ("0" や空欄など) は 1 回だけ判定する。
+    objConvertedValues: Dict[str, Optional[object]] = {}
+    objValueRows: List[List[Optional[object]]] = []
+    for objRow in objRows:
+        objValueRow: List[Optional[object]] = []
+        for pszValue in objRow:
+            if pszValue in objConvertedValues:
+                objValueRow.append(objConvertedValues[pszValue])
+                continue
+            objCellValue = parse_tsv_value_for_excel(pszValue)
+            objConvertedValues[pszValue] = objCellValue
+            objValueRow.append(objCellValue)
+        objValueRows.append(objValueRow)
+    return objValueRows
+
+
+def write_tsv_rows_to_sheet(objSheet, objRows: List[List[str]]) -> None:
+    # TSV の行を 1 行目から書き込む (1 セルずつ objSheet.cell(...) で書き込む場合と同じ結果)。
+    # セルが 1 つもないシートは append で行ごとに追加し、
+    # テンプレートのセルがあるシートは既存セルの書式を残したまま値だけを書き換える。
+    objValueRows: List[List[Optional[object]]] = convert_tsv_rows_for_excel(objRows)
+    objCells = objSheet._cells
+    if not objCells and objSheet._current_row == 0:
+        for objValueRow in objValueRows:
+            objSheet.append(objValueRow)
+        return
+    for iRowIndex, objValueRow in enumerate(objValueRows, start=1):
+        for iColumnIndex, objCellValue in enumerate(objValueRow, start=1):
+            objCell = objCells.get((iRowIndex, iColumnIndex))
+            if objCell is None:
+                objSheet.cell(row=iRowIndex, column=iColumnIndex, value=objCellValue)
+            elif objCellValue is not None:
+                objCell.value = objCellValue
+
+
 def create_cp_company_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
     pszTargetDirectory: str = os.path.join(pszScriptDirectory, "0001_CP別_step0009")
     if not os.path.isdir(pszTargetDirectory):
@@ -8145,6 +9873,7 @@ def create_cp_company_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
             objLines.append("判定結果: 必要TSV不足なし")
         with open(pszMissingReportPath, "w", encoding="utf-8", newline="\n") as objReportFile:
             objReportFile.write("\n".join(objLines) + "\n")
+        record_created_file(pszMissingReportPath)
         if objMissingPeriodItems:
             return None
     else:
@@ -8159,7 +9888,7 @@ def create_cp_company_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
     if not os.path.isfile(pszTemplatePath):
         return None
 
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objTemplateSheet = objWorkbook.worksheets[0]
     for pszPeriodLabel, pszInputPath in objTsvPaths:
         if pszPeriodLabel in objWorkbook.sheetnames:
@@ -8167,14 +9896,7 @@ def create_cp_company_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
         objSheet = objWorkbook.copy_worksheet(objTemplateSheet)
         objSheet.title = pszPeriodLabel
         objRows = read_tsv_rows(pszInputPath)
-        for iRowIndex, objRow in enumerate(objRows, start=1):
-            for iColumnIndex, pszValue in enumerate(objRow, start=1):
-                objCellValue = parse_tsv_value_for_excel(pszValue)
-                objSheet.cell(
-                    row=iRowIndex,
-                    column=iColumnIndex,
-                    value=objCellValue,
-                )
+        write_tsv_rows_to_sheet(objSheet, objRows)
     if objTemplateSheet in objWorkbook.worksheets:
         objWorkbook.remove(objTemplateSheet)
 
@@ -8192,6 +9914,7 @@ def create_cp_company_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
         pszOutputFileName,
     )
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     return pszOutputPath
 
 
@@ -8223,7 +9946,7 @@ def create_cp_group_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
     if not os.path.isfile(pszTemplatePath):
         return None
 
-    objWorkbook = load_workbook(pszTemplatePath)
+    objWorkbook = load_template_workbook(pszTemplatePath)
     objTemplateSheet = objWorkbook.worksheets[0]
     for pszPeriodLabel, pszInputPath in objTsvPaths:
         if pszPeriodLabel in objWorkbook.sheetnames:
@@ -8231,14 +9954,7 @@ def create_cp_group_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
         objSheet = objWorkbook.copy_worksheet(objTemplateSheet)
         objSheet.title = pszPeriodLabel
         objRows = read_tsv_rows(pszInputPath)
-        for iRowIndex, objRow in enumerate(objRows, start=1):
-            for iColumnIndex, pszValue in enumerate(objRow, start=1):
-                objCellValue = parse_tsv_value_for_excel(pszValue)
-                objSheet.cell(
-                    row=iRowIndex,
-                    column=iColumnIndex,
-                    value=objCellValue,
-                )
+        write_tsv_rows_to_sheet(objSheet, objRows)
     if objTemplateSheet in objWorkbook.worksheets:
         objWorkbook.remove(objTemplateSheet)
 
@@ -8256,6 +9972,7 @@ def create_cp_group_step0009_excel(pszScriptDirectory: str) -> Optional[str]:
         pszOutputFileName,
     )
     objWorkbook.save(pszOutputPath)
+    record_created_file(pszOutputPath)
     return pszOutputPath
 
 
@@ -8293,7 +10010,7 @@ def build_cp_company_step0009_single_for_month(
         objMonth,
         "0001",
     )
-    if not os.path.isfile(pszInputPath):
+    if not tsv_file_exists(pszInputPath):
         return None
     objRows = read_tsv_rows(pszInputPath)
     pszOutputPath = build_cp_company_step0009_single_path(pszDirectory, objMonth)
@@ -8310,7 +10027,7 @@ def build_cp_step0009_vertical_for_range(
         objRange,
         "0001",
     )
-    if not os.path.isfile(pszCumulativePath):
+    if not tsv_file_exists(pszCumulativePath):
         return None
     objOutputRows: List[List[str]] = read_tsv_rows(pszCumulativePath)
     objMonths = build_month_sequence(objRange[0], objRange[1])
@@ -8320,7 +10037,7 @@ def build_cp_step0009_vertical_for_range(
             objMonth,
             "0001",
         )
-        if not os.path.isfile(pszSinglePath):
+        if not tsv_file_exists(pszSinglePath):
             return None
         objSingleRows = read_tsv_rows(pszSinglePath)
         objOutputRows = append_vertical_columns(objOutputRows, objSingleRows)
@@ -8332,7 +10049,7 @@ def build_cp_step0009_vertical_for_range(
     pszTargetDirectory: str = os.path.join(pszScriptDirectory, "0001_CP別_step0009")
     os.makedirs(pszTargetDirectory, exist_ok=True)
     pszTargetPath: str = os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath))
-    shutil.copy2(pszOutputPath, pszTargetPath)
+    copy_output_file(pszOutputPath, pszTargetPath)
     return pszOutputPath
 
 
@@ -8345,7 +10062,7 @@ def build_cp_group_step0009_vertical_for_range(
         objRange,
         "0002",
     )
-    if not os.path.isfile(pszCumulativePath):
+    if not tsv_file_exists(pszCumulativePath):
         return None
     objOutputRows: List[List[str]] = read_tsv_rows(pszCumulativePath)
     objMonths = build_month_sequence(objRange[0], objRange[1])
@@ -8355,7 +10072,7 @@ def build_cp_group_step0009_vertical_for_range(
             objMonth,
             "0002",
         )
-        if not os.path.isfile(pszSinglePath):
+        if not tsv_file_exists(pszSinglePath):
             return None
         objSingleRows = read_tsv_rows(pszSinglePath)
         objOutputRows = append_vertical_columns(objOutputRows, objSingleRows)
@@ -8367,7 +10084,7 @@ def build_cp_group_step0009_vertical_for_range(
     pszTargetDirectory: str = os.path.join(pszScriptDirectory, "0002_CP別_step0009")
     os.makedirs(pszTargetDirectory, exist_ok=True)
     pszTargetPath: str = os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath))
-    shutil.copy2(pszOutputPath, pszTargetPath)
+    copy_output_file(pszOutputPath, pszTargetPath)
     return pszOutputPath
 
 
@@ -8399,11 +10116,11 @@ def copy_cp_management_excels(
         pszGroupDirectory,
         os.path.basename(pszGroupPath),
     )
-    shutil.copy2(pszCompanyPath, pszCompanyTargetPath)
-    shutil.copy2(pszGroupPath, pszGroupTargetPath)
+    copy_output_file(pszCompanyPath, pszCompanyTargetPath)
+    copy_output_file(pszGroupPath, pszGroupTargetPath)
 
 
-def try_create_cp_step0009_vertical(pszDirectory: str) -> Optional[str]:
+def try_create_cp_step0009_vertical(pszDirectory: str) -> Optional[ExcelExportJob]:
     pszRangePath: Optional[str] = find_selected_range_path(pszDirectory)
     if pszRangePath is None:
         return None
@@ -8415,10 +10132,10 @@ def try_create_cp_step0009_vertical(pszDirectory: str) -> Optional[str]:
 
     for objRangeItem in objTargetRanges:
         build_cp_step0009_vertical_for_range(pszDirectory, objRangeItem)
-    return create_cp_company_step0009_excel(os.path.dirname(__file__))
+    return queue_excel_export(create_cp_company_step0009_excel, (os.path.dirname(__file__),), [])
 
 
-def try_create_cp_group_step0009_vertical(pszDirectory: str) -> Optional[str]:
+def try_create_cp_group_step0009_vertical(pszDirectory: str) -> Optional[ExcelExportJob]:
     pszRangePath: Optional[str] = find_selected_range_path(pszDirectory)
     if pszRangePath is None:
         return None
@@ -8434,12 +10151,12 @@ def try_create_cp_group_step0009_vertical(pszDirectory: str) -> Optional[str]:
             objRangeItem,
             "0002",
         )
-        if not os.path.isfile(pszCumulativePath):
+        if not tsv_file_exists(pszCumulativePath):
             return None
 
     for objRangeItem in objTargetRanges:
         build_cp_group_step0009_vertical_for_range(pszDirectory, objRangeItem)
-    return create_cp_group_step0009_excel(os.path.dirname(__file__))
+    return queue_excel_export(create_cp_group_step0009_excel, (os.path.dirname(__file__),), [])
 
 
 def create_cp_step0007_file_company(pszStep0006Path: str, pszPrefix: str) -> None:
@@ -8534,7 +10251,7 @@ def create_cp_step0007_file_company(pszStep0006Path: str, pszPrefix: str) -> Non
     pszTargetDirectory = os.path.join(get_script_base_directory(), f"{pszPrefix}_step0007")
     os.makedirs(pszTargetDirectory, exist_ok=True)
     pszTargetPath = os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath))
-    shutil.copy2(pszOutputPath, pszTargetPath)
+    copy_tsv_file(pszOutputPath, pszTargetPath)
 
 
 def create_cp_step0007_file_0001(pszStep0006Path: str) -> None:
@@ -8543,7 +10260,7 @@ def create_cp_step0007_file_0001(pszStep0006Path: str) -> None:
         get_script_base_directory(),
         os.path.basename(pszStep0006Path).replace("_step0006_", "_step0007_"),
     )
-    if os.path.isfile(pszOutputPath):
+    if tsv_file_exists(pszOutputPath):
         try_create_cp_company_step0008_vertical(pszOutputPath)
 
 
@@ -8555,9 +10272,9 @@ def create_cp_step0007_file_0002(pszStep0006Path: str) -> None:
         os.path.dirname(pszStep0006Path),
         os.path.basename(pszStep0006Path).replace("_step0006_", "_step0007_"),
     )
-    if os.path.isfile(pszOutputPath):
+    if tsv_file_exists(pszOutputPath):
         pszTargetPath = os.path.join(pszTargetDirectory, os.path.basename(pszOutputPath))
-        shutil.copy2(pszOutputPath, pszTargetPath)
+        copy_tsv_file(pszOutputPath, pszTargetPath)
         try_create_cp_group_step0008_vertical(pszOutputPath)
         try_create_cp_group_step0008_vertical(pszTargetPath)
 
@@ -8625,10 +10342,48 @@ def create_empty_previous_fiscal_cp_step0005_vertical(
 
 
 def main(argv: list[str]) -> int:
+    bPersistIntermediates: bool = True
+    bIncremental: bool = False
+    iJobCount: int = 1
+    # --output-manifest は他のスクリプトと同じく Output_Manifest の argparse で解釈する
+    pszOutputManifestPath: Optional[str]
+    pszOutputManifestPath, objOtherArguments = parse_output_manifest_argument(argv[1:])
+    argv = argv[:1] + objOtherArguments
+    objArgvWithoutOptions: list[str] = [argv[0]] if argv else []
+    iArgumentIndex: int = 1
+    while iArgumentIndex < len(argv):
+        pszArgument: str = argv[iArgumentIndex]
+        iArgumentIndex += 1
+        if pszArgument == "--persist-intermediates":
+            bPersistIntermediates = True
+            continue
+        if pszArgument == "--no-persist-intermediates":
+            bPersistIntermediates = False
+            continue
+        if pszArgument == "--incremental":
+            bIncremental = True
+            continue
+        if pszArgument == "--jobs" or pszArgument.startswith("--jobs="):
+            pszJobCount: str = pszArgument[len("--jobs=") :] if pszArgument.startswith("--jobs=") else ""
+            if pszArgument == "--jobs" and iArgumentIndex < len(argv):
+                pszJobCount = argv[iArgumentIndex]
+                iArgumentIndex += 1
+            if not pszJobCount.isdigit() or int(pszJobCount) < 1:
+                print("Error: --jobs には 1 以上の整数を指定してください。")
+                print_usage()
+                return 1
+            iJobCount = int(pszJobCount)
+            continue
+        objArgvWithoutOptions.append(pszArgument)
+    argv = objArgvWithoutOptions
+
     if len(argv) < 3:
         print_usage()
         return 1
 
+    # 以降に作成したファイルを記録し、最後の振り分けはこの記録だけを対象にする
+    begin_run_output_manifest()
+
     objCsvInputs: List[str] = [pszPath for pszPath in argv[1:] if pszPath.lower().endswith(".csv")]
     objTsvInputs: List[str] = [pszPath for pszPath in argv[1:] if pszPath.lower().endswith(".tsv")]
 
@@ -8750,6 +10505,9 @@ def main(argv: list[str]) -> int:
 
     objPairs = objSelectedPairs
 
+    # 全月分の入力を読み込んでから、まとめて処理する (途中で入力が無い場合はその手前の月まで)
+    objJobs: List[PlTsvJob] = []
+    pszMissingInputPath: Optional[str] = None
     for objPair in objPairs:
         pszManhourPath: str = objPair[0]
         pszPlPath: str = objPair[1]
@@ -8758,57 +10516,71 @@ def main(argv: list[str]) -> int:
             pszOutputPath = objPair[2]
         else:
             pszOutputPath = build_default_output_path(pszPlPath)
-        pszOutputFinalPath: str = build_output_path_with_step(pszPlPath, "販管費配賦_")
-        pszOutputStep0001Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0001_")
-        pszOutputStep0002Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0002_")
-        pszOutputStep0003ZeroPath: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0003_")
-        pszOutputStep0003Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0007_")
-        pszOutputStep0004Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0008_")
-        pszOutputStep0009Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0009_")
-        pszOutputStep0005Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0005_")
-        pszOutputStep0006Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0006_")
-        pszOutputStep0010Path: str = build_output_path_with_step(pszPlPath, "販管費配賦_step0010_")
 
         if not os.path.exists(pszManhourPath):
-            print(f"Input file not found: {pszManhourPath}")
-            return 1
+            pszMissingInputPath = pszManhourPath
+            break
         if not os.path.exists(pszPlPath):
-            print(f"Input file not found: {pszPlPath}")
-            return 1
+            pszMissingInputPath = pszPlPath
+            break
 
-        objManhourMap: Dict[str, str] = load_manhour_map(pszManhourPath)
-        objCompanyMap: Dict[str, str] = load_company_map(pszManhourPath)
-        process_pl_tsv(
-            pszPlPath,
-            pszOutputPath,
-            pszOutputStep0001Path,
-            pszOutputStep0002Path,
-            pszOutputStep0003ZeroPath,
-            pszOutputStep0003Path,
-            pszOutputStep0004Path,
-            pszOutputStep0009Path,
-            pszOutputStep0005Path,
-            pszOutputStep0006Path,
-            pszOutputStep0010Path,
-            pszOutputFinalPath,
-            objManhourMap,
-            objCompanyMap,
+        objManhourTable: ManhourTable = load_manhour_table(pszManhourPath)
+        objJobs.append(
+            PlTsvJob(
+                pszPlPath,
+                pszOutputPath,
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0001_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0002_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0003_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0007_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0008_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0009_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0005_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0006_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_step0010_"),
+                build_output_path_with_step(pszPlPath, "販管費配賦_"),
+                objManhourTable.objManhourMap,
+                objManhourTable.objCompanyMap,
+                pszManhourPath,
+            )
         )
 
-        print(f"Output: {pszOutputStep0001Path}")
-        print(f"Output: {pszOutputStep0002Path}")
-        print(f"Output: {pszOutputStep0003ZeroPath}")
-        print(f"Output: {pszOutputStep0003Path}")
-        print(f"Output: {pszOutputStep0004Path}")
-        print(f"Output: {pszOutputStep0009Path}")
-        print(f"Output: {pszOutputStep0005Path}")
-        print(f"Output: {pszOutputStep0006Path}")
-        print(f"Output: {pszOutputStep0010Path}")
-        print(f"Output: {pszOutputFinalPath}")
+    if bIncremental:
+        run_pl_tsv_jobs_incrementally(objJobs, bPersistIntermediates, iJobCount)
+    else:
+        run_pl_tsv_jobs(objJobs, bPersistIntermediates, iJobCount)
+
+    # 出力の表示は並列実行の有無にかかわらず入力の順
+    for objJob in objJobs:
+        if bPersistIntermediates:
+            report_output_file(objJob.pszOutputStep0001Path)
+            report_output_file(objJob.pszOutputStep0002Path)
+            report_output_file(objJob.pszOutputStep0003ZeroPath)
+            report_output_file(objJob.pszOutputStep0007Path)
+            report_output_file(objJob.pszOutputStep0008Path)
+            report_output_file(objJob.pszOutputStep0009Path)
+            report_output_file(objJob.pszOutputStep0005Path)
+            report_output_file(objJob.pszOutputStep0006Path)
+        report_output_file(objJob.pszOutputStep0010Path)
+        report_output_file(objJob.pszOutputFinalPath)
+
+    if pszMissingInputPath is not None:
+        print(f"Input file not found: {pszMissingInputPath}")
+        return 1
 
     if objPairs:
-        create_step0010_pj_income_statement_excels(get_script_base_directory())
-        create_cumulative_reports(objPairs[0][1])
+        create_step0010_pj_income_statement_excels(get_script_base_directory(), iJobCount)
+        create_cumulative_reports(objPairs[0][1], iJobCount)
+    if pszOutputManifestPath is not None:
+        # "Output:" の行のうち、実行後も同じ場所に残っているもの (temp へ振り分けていないもの)
+        write_output_manifest(
+            pszOutputManifestPath,
+            [
+                pszOutputPath
+                for pszOutputPath in REPORTED_OUTPUT_PATHS
+                if RUN_OUTPUT_MANIFEST is None or get_tsv_rows_cache_key(pszOutputPath) in RUN_OUTPUT_MANIFEST
+            ],
+        )
     return 0
 
 
@@ -26,6 +26,13 @@ from typing import Dict, List, Tuple
 import pandas as pd
 from pandas import DataFrame
 
+from OrgTable_Index import OrgTableIndex, get_org_table_index
+from Output_Manifest import (
+    add_output_manifest_argument,
+    validate_output_manifest_argument,
+    write_output_manifest,
+)
+
 
 def write_error_text_utf8(pszErrorFilePath: str, pszText: str) -> None:
     with open(pszErrorFilePath, mode="a", encoding="utf-8") as objFile:
@@ -41,6 +48,19 @@ def write_debug_error(pszMessage: str, objBaseDirectoryPath: Path | None = None)
         objFile.write(pszMessage + "\n")
 
 
+# この実行で作成したファイル (正規化したパス → 絶対パス)。--output-manifest の出力に使う。
+OUTPUT_MANIFEST_PATHS: Dict[str, str] = {}
+
+
+def record_output_file(pszPath: str | Path) -> None:
+    pszAbsolutePath: str = os.path.abspath(str(pszPath))
+    OUTPUT_MANIFEST_PATHS[os.path.normcase(pszAbsolutePath)] = pszAbsolutePath
+
+
+def discard_output_file(pszPath: str | Path) -> None:
+    OUTPUT_MANIFEST_PATHS.pop(os.path.normcase(os.path.abspath(str(pszPath))), None)
+
+
 def get_target_year_month_from_filename(pszInputFilePath: str) -> Tuple[int, int]:
     pszBaseName: str = os.path.basename(pszInputFilePath)
     objMatch: re.Match[str] | None = re.search(r"(\d{2})\.(\d{1,2})\.csv$", pszBaseName)
@@ -171,6 +191,7 @@ def convert_csv_to_tsv_file(pszInputCsvPath: str) -> str:
             objWriter: csv.writer = csv.writer(objOutputFile, delimiter="\t")
             for objRow in objRows:
                 objWriter.writerow(objRow)
+        record_output_file(pszOutputTsvPath)
         return pszOutputTsvPath
 
     iTimeColumnIndexF: int = 5
@@ -212,6 +233,7 @@ def convert_csv_to_tsv_file(pszInputCsvPath: str) -> str:
         objWriter: csv.writer = csv.writer(objOutputFile, delimiter="\t")
         for objRow in objRows:
             objWriter.writerow(objRow)
+    record_output_file(pszOutputTsvPath)
 
     return pszOutputTsvPath
 
@@ -225,6 +247,7 @@ def write_error_tsv(pszOutputFileFullPath: str, pszErrorMessage: str) -> None:
         objFile.write(pszErrorMessage)
         if not pszErrorMessage.endswith("\n"):
             objFile.write("\n")
+    record_output_file(pszOutputFileFullPath)
 
 
 def build_removed_uninput_output_path(pszInputFileFullPath: str) -> str:
@@ -332,6 +355,7 @@ def make_removed_uninput_tsv_from_manhour_tsv(pszInputFileFullPath: str) -> None
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -422,6 +446,7 @@ def make_sorted_staff_code_tsv_from_manhour_tsv(pszInputFileFullPath: str) -> No
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -557,6 +582,7 @@ def write_company_normalized_tsv(pszInputFileFullPath: str, pszOutputFileFullPat
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -688,6 +714,7 @@ def write_project_normalized_tsv(pszInputFileFullPath: str, pszOutputFileFullPat
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -1062,6 +1089,7 @@ def make_step0007_yyyy_mm_dd_tsv(
             index=False,
             encoding="utf-8",
         )
+        record_output_file(pszOutputTsvPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputTsvPath,
@@ -1165,6 +1193,7 @@ def make_step0007_unique_staff_code_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -1319,6 +1348,7 @@ def make_step0007_staff_code_range_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -1496,6 +1526,7 @@ def make_step0008_staff_project_tsv(
                 encoding="utf-8",
                 lineterminator="\n",
             )
+            record_output_file(pszOutputFileFullPath)
         except Exception as objException:
             write_error_tsv(
                 pszErrorFileFullPath,
@@ -1534,6 +1565,7 @@ def make_step0008_staff_project_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszErrorFileFullPath,
@@ -1928,6 +1960,7 @@ def make_step0009_project_task_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszProjectTaskOutputPath)
     except Exception as objException:
         write_error_tsv(
             pszErrorFileFullPath,
@@ -1949,6 +1982,7 @@ def make_step0009_project_task_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszProjectStaffCompanyOutputPath)
     except Exception as objException:
         write_error_tsv(
             pszErrorFileFullPath,
@@ -1996,6 +2030,7 @@ def make_step0009_project_company_task_tsv(
                     if len(objColumns) > 1:
                         objColumns[1] = normalize_step0009_company_name(objColumns[1])
                     objOutputFile.write("\t".join(objColumns) + "\n")
+            record_output_file(pszProjectCompanyPath)
     except Exception as objException:
         write_error_tsv(
             pszProjectCompanyPath,
@@ -2047,6 +2082,7 @@ def make_step0010_project_manhour_tsv(
                     else:
                         pszManhour = ""
                     objOutputFile.write(pszProjectName + "\t" + pszManhour + "\n")
+            record_output_file(pszProjectManhourPath)
     except Exception as objException:
         write_error_tsv(
             pszProjectManhourPath,
@@ -2085,6 +2121,7 @@ def make_step0010_project_manhour_tsv(
                         + pszManhour
                         + "\n"
                     )
+            record_output_file(pszProjectCompanyManhourPath)
     except Exception as objException:
         write_error_tsv(
             pszProjectCompanyManhourPath,
@@ -2095,134 +2132,40 @@ def make_step0010_project_manhour_tsv(
         return
 
 
-def read_org_table_company_mappings(pszOrgTableTsvPath: str) -> List[Tuple[str, str]]:
-    if not os.path.isfile(pszOrgTableTsvPath):
-        raise FileNotFoundError(f"Org table TSV not found: {pszOrgTableTsvPath}")
-
-    objMappings: List[Tuple[str, str]] = []
+def read_org_table_company_prefix_map(pszOrgTableTsvPath: str) -> Dict[str, str]:
     try:
-        objOrgDataFrame: DataFrame = pd.read_csv(
-            pszOrgTableTsvPath,
-            sep="\t",
-            dtype=str,
-            encoding="utf-8",
-            keep_default_na=False,
-            engine="python",
-        )
+        objIndex: OrgTableIndex | None = get_org_table_index(pszOrgTableTsvPath)
     except Exception as objException:
         raise RuntimeError(
             "Error: unexpected exception while reading 管轄PJ表.tsv. Detail = {0}".format(
                 objException
             )
         ) from objException
+    if objIndex is None:
+        raise FileNotFoundError(f"Org table TSV not found: {pszOrgTableTsvPath}")
 
-    if objOrgDataFrame.shape[1] < 3:
+    if objIndex.iCompanyMappingColumnCount == 0:
+        raise RuntimeError(
+            "Error: unexpected exception while reading 管轄PJ表.tsv. Detail = No columns to parse from file"
+        )
+    if objIndex.iCompanyMappingColumnCount < 3:
         raise ValueError("Error: 管轄PJ表.tsv must have at least 3 columns.")
 
-    objColumnNames: List[str] = list(objOrgDataFrame.columns)
-    pszProjectColumn: str = objColumnNames[1]
-    pszCompanyColumn: str = objColumnNames[2]
-
-    for _, objRow in objOrgDataFrame.iterrows():
-        pszProjectCode: str = str(objRow[pszProjectColumn] or "")
-        pszCompanyName: str = str(objRow[pszCompanyColumn] or "")
-        objMappings.append((pszProjectCode, pszCompanyName))
-
-    return objMappings
+    return objIndex.objCompanyPrefixMap
 
 
 def read_org_table_billing_company_map(pszOrgTableTsvPath: str) -> Dict[str, str]:
-    if not os.path.isfile(pszOrgTableTsvPath):
+    objIndex: OrgTableIndex | None = get_org_table_index(pszOrgTableTsvPath)
+    if objIndex is None:
         return {}
-
-    objBillingMap: Dict[str, str] = {}
-    objEncodingCandidateList: List[str] = ["utf-8-sig", "cp932"]
-    objLastDecodeError: Exception | None = None
-    objRows: List[List[str]] = []
-
-    for pszEncoding in objEncodingCandidateList:
-        try:
-            with open(
-                pszOrgTableTsvPath,
-                mode="r",
-                encoding=pszEncoding,
-                newline="",
-            ) as objOrgTableFile:
-                objOrgTableReader = csv.reader(objOrgTableFile, delimiter="\t")
-                for objRow in objOrgTableReader:
-                    objRows.append(list(objRow))
-            objLastDecodeError = None
-            break
-        except UnicodeDecodeError as objError:
-            objLastDecodeError = objError
-            objRows = []
-
-    if objLastDecodeError is not None:
-        raise objLastDecodeError
-
-    for objRow in objRows:
-        if len(objRow) < 3:
-            continue
-        pszProjectCodeOrg: str = str(objRow[1]).strip()
-        pszBillingCompany: str = str(objRow[2]).strip()
-        if not pszProjectCodeOrg or not pszBillingCompany:
-            continue
-        objMatch: re.Match[str] | None = re.match(r"^(P\d{5}|[A-OQ-Z]\d{3})", pszProjectCodeOrg)
-        if objMatch is None:
-            continue
-        pszProjectCodePrefix: str = objMatch.group(1)
-        if pszProjectCodePrefix not in objBillingMap:
-            objBillingMap[pszProjectCodePrefix] = pszBillingCompany
-
-    return objBillingMap
+    return objIndex.objBillingCompanyMap
 
 
 def read_org_table_billing_group_map(pszOrgTableTsvPath: str) -> Dict[str, str]:
-    if not os.path.isfile(pszOrgTableTsvPath):
+    objIndex: OrgTableIndex | None = get_org_table_index(pszOrgTableTsvPath)
+    if objIndex is None:
         return {}
-
-    objGroupMap: Dict[str, str] = {}
-    objEncodingCandidateList: List[str] = ["utf-8-sig", "cp932"]
-    objLastDecodeError: Exception | None = None
-    objRows: List[List[str]] = []
-
-    for pszEncoding in objEncodingCandidateList:
-        try:
-            with open(
-                pszOrgTableTsvPath,
-                mode="r",
-                encoding=pszEncoding,
-                newline="",
-            ) as objOrgTableFile:
-                objOrgTableReader = csv.reader(objOrgTableFile, delimiter="\t")
-                for objRow in objOrgTableReader:
-                    objRows.append(list(objRow))
-            objLastDecodeError = None
-            break
-        except UnicodeDecodeError as objError:
-            objLastDecodeError = objError
-            objRows = []
-
-    if objLastDecodeError is not None:
-        raise objLastDecodeError
-
-    for objRow in objRows:
-        if len(objRow) < 4:
-            continue
-        pszProjectCodeOrg: str = str(objRow[1]).strip()
-        pszBillingGroup: str = str(objRow[3]).strip()
-        if not pszProjectCodeOrg or not pszBillingGroup:
-            continue
-        objMatch: re.Match[str] | None = re.match(
-            r"^(P\d{5}_|[A-OQ-Z]\d{3}_)", pszProjectCodeOrg
-        )
-        if objMatch is None:
-            continue
-        pszProjectCodePrefix: str = objMatch.group(1)
-        if pszProjectCodePrefix not in objGroupMap:
-            objGroupMap[pszProjectCodePrefix] = pszBillingGroup
-
-    return objGroupMap
+    return objIndex.objBillingGroupMap
 
 
 def extract_project_code_prefix_step0012(pszProjectName: str) -> str:
@@ -2310,6 +2253,7 @@ def make_step0012_project_manhour_tsv(
     with open(pszStep0012ProjectManhourPath, "w", encoding="utf-8") as objOutputFile:
         for pszProjectName, pszManhour in objSortedStep0011Rows:
             objOutputFile.write(pszProjectName + "\t" + pszManhour + "\n")
+    record_output_file(pszStep0012ProjectManhourPath)
 
     with open(
         pszStep0012ProjectCompanyManhourPath, "w", encoding="utf-8"
@@ -2323,6 +2267,7 @@ def make_step0012_project_manhour_tsv(
                 + pszManhour
                 + "\n"
             )
+    record_output_file(pszStep0012ProjectCompanyManhourPath)
 
     try:
         objOrgTableGroupMap: Dict[str, str] = read_org_table_billing_group_map(
@@ -2356,6 +2301,7 @@ def make_step0012_project_manhour_tsv(
                 + pszManhour
                 + "\n"
             )
+    record_output_file(pszStep0012ProjectCompanyGroupManhourPath)
 
 
 def make_step0013_project_manhour_tsv(
@@ -2445,6 +2391,7 @@ def make_step0013_project_manhour_tsv(
             if str(pszProjectName).startswith(("A", "H")):
                 continue
             objOutputFile.write(pszProjectName + "\t" + pszManhour + "\n")
+    record_output_file(pszStep0013ProjectManhourPath)
 
     with open(
         pszStep0013ProjectCompanyManhourPath, "w", encoding="utf-8"
@@ -2455,6 +2402,7 @@ def make_step0013_project_manhour_tsv(
             objOutputFile.write(
                 pszProjectName + "\t" + pszCompanyName + "\t" + pszManhour + "\n"
             )
+    record_output_file(pszStep0013ProjectCompanyManhourPath)
 
     with open(
         pszStep0013ProjectCompanyGroupManhourPath, "w", encoding="utf-8"
@@ -2477,6 +2425,7 @@ def make_step0013_project_manhour_tsv(
                 + pszManhour
                 + "\n"
             )
+    record_output_file(pszStep0013ProjectCompanyGroupManhourPath)
 
 
 def make_step14_project_company_manhour_tsv(
@@ -2561,6 +2510,7 @@ def make_step14_project_company_manhour_tsv(
                 + pszBusinessDevelopment
                 + "\n"
             )
+    record_output_file(pszStep14ProjectCompanyManhourPath)
 
 def make_step0011_project_manhour_tsv(
     pszProjectManhourPath: str,
@@ -2617,6 +2567,7 @@ def make_step0011_project_manhour_tsv(
                 objAggregatedSeconds[pszProjectName],
             )
             objOutputFile.write(pszProjectName + "\t" + pszTotalManhour + "\n")
+    record_output_file(pszProjectManhourOutputPath)
 
     objSheet0010CompanyRows: List[Tuple[str, str, str]] = []
     with open(pszProjectCompanyManhourPath, "r", encoding="utf-8") as objInputFile:
@@ -2716,6 +2667,7 @@ def make_step0011_project_manhour_tsv(
                 pszProjectName + "\t" + pszCompanyName + "\t" + pszTotalManhour + "\n",
             )
             objSheet0011CompanyRows.append((pszProjectName, pszCompanyName, pszTotalManhour))
+    record_output_file(pszProjectCompanyManhourOutputPath)
 
     if objHoldProjectLines or objMismatchProjectLines:
         pszCompanyTsvLine: str = f"対象TSV: {pszProjectCompanyManhourPath}"
@@ -2794,6 +2746,7 @@ def make_step0005_remove_ah_project_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -2843,7 +2796,7 @@ def make_step0006_company_replaced_tsv_from_step0005(
         return
 
     try:
-        objMappings: List[Tuple[str, str]] = read_org_table_company_mappings(
+        objCompanyPrefixMap: Dict[str, str] = read_org_table_company_prefix_map(
             pszOrgTableTsvPath
         )
     except Exception as objException:
@@ -2861,15 +2814,15 @@ def make_step0006_company_replaced_tsv_from_step0005(
     objCompanyValues: List[str] = []
     objMissingMask: List[bool] = []
 
-    for _, objRow in objDataFrameInput.iterrows():
-        pszProjectCode: str = str(objRow[pszProjectColumn] or "")
-        pszNewCompany: str | None = None
-        for pszOrgProjectCode, pszOrgCompanyName in objMappings:
-            if pszOrgProjectCode != "" and pszOrgProjectCode.startswith(pszProjectCode):
-                pszNewCompany = pszOrgCompanyName
-                break
+    # 管轄PJ表で PJコードがこの値で始まる最初の行のカンパニー名を、接頭辞の索引から引く
+    for objProjectValue, objCompanyValue in zip(
+        objDataFrameInput[pszProjectColumn].tolist(),
+        objDataFrameInput[pszCompanyColumn].tolist(),
+    ):
+        pszProjectCode: str = str(objProjectValue or "")
+        pszNewCompany: str | None = objCompanyPrefixMap.get(pszProjectCode)
         if pszNewCompany is None:
-            objCompanyValues.append(str(objRow[pszCompanyColumn] or ""))
+            objCompanyValues.append(str(objCompanyValue or ""))
             objMissingMask.append(True)
         else:
             objCompanyValues.append(pszNewCompany)
@@ -2888,6 +2841,7 @@ def make_step0006_company_replaced_tsv_from_step0005(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -2904,6 +2858,7 @@ def make_step0006_company_replaced_tsv_from_step0005(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszMissingOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszMissingOutputFileFullPath,
@@ -2968,6 +2923,7 @@ def make_step0006_unique_missing_project_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -3029,6 +2985,7 @@ def make_step0006_sort_asc_missing_project_tsv(
             encoding="utf-8",
             lineterminator="\n",
         )
+        record_output_file(pszOutputFileFullPath)
     except Exception as objException:
         write_error_tsv(
             pszOutputFileFullPath,
@@ -3091,6 +3048,7 @@ def write_org_table_tsv_from_csv(objBaseDirectoryPath: Path) -> None:
         objWriter: csv.writer = csv.writer(objOutputFile, delimiter="\t")
         for objRow in objRows:
             objWriter.writerow(objRow)
+    record_output_file(objOrgTableTsvPath)
 
 
 def process_single_input(
@@ -3133,6 +3091,8 @@ def process_single_input(
     )
     if pszStep1DefaultTsvPath != pszStep1TsvPath:
         os.replace(pszStep1DefaultTsvPath, pszStep1TsvPath)
+        discard_output_file(pszStep1DefaultTsvPath)
+        record_output_file(pszStep1TsvPath)
 
     make_removed_uninput_tsv_from_manhour_tsv(pszStep1TsvPath)
     pszStep0001TsvPath: str = build_removed_uninput_output_path(pszStep1TsvPath)
@@ -3151,13 +3111,15 @@ def process_single_input(
 
 
 def main() -> int:
-    objParser: argparse.ArgumentParser = argparse.ArgumentParser()
+    objParser: argparse.ArgumentParser = argparse.ArgumentParser(allow_abbrev=False)
     objParser.add_argument(
         "pszInputManhourCsvPaths",
         nargs="+",
         help="Input Jobcan manhour CSV file paths",
     )
+    add_output_manifest_argument(objParser)
     objArgs: argparse.Namespace = objParser.parse_args()
+    validate_output_manifest_argument(objParser, objArgs.pszOutputManifestPath)
 
     objScriptDirectoryPath: Path = Path(__file__).resolve().parent
 
@@ -3401,14 +3363,17 @@ def main() -> int:
                     objStep0013ProjectManhourPath,
                     objStep0014ProjectManhourPath,
                 )
+                record_output_file(objStep0014ProjectManhourPath)
                 shutil.copyfile(
                     objStep0013ProjectCompanyManhourPath,
                     objStep0014ProjectCompanyManhourPath,
                 )
+                record_output_file(objStep0014ProjectCompanyManhourPath)
                 shutil.copyfile(
                     objStep0013ProjectCompanyGroupManhourPath,
                     objStep0014ProjectCompanyGroupManhourPath,
                 )
+                record_output_file(objStep0014ProjectCompanyGroupManhourPath)
             make_step0006_unique_missing_project_tsv(
                 str(objStep0006MissingPath),
                 str(objStep0006UniqueMissingPath),
@@ -3418,6 +3383,8 @@ def main() -> int:
                 str(objStep0006SortAscMissingPath),
             )
 
+    if objArgs.pszOutputManifestPath is not None:
+        write_output_manifest(objArgs.pszOutputManifestPath, OUTPUT_MANIFEST_PATHS.values())
     return iExitCode
 
 